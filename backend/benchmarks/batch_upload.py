@@ -0,0 +1,101 @@
+"""Replaying a checkpoint backlog: one POST /api/events per scan vs one POST /api/events/batch.
+
+  uv run python -m benchmarks.batch_upload --scans 1000
+
+Both run over HTTP against the in-process app (no network), so the numbers
+are a lower bound; on forest Wi-Fi every extra round trip costs far more.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import config
+from app.core.db import get_db
+from app.core.ingest import EventIngestQueue
+from app.routes import events as events_routes
+from app.routes.router import api_router
+
+from benchmarks.common import seed_race, temp_database
+
+
+def backlog(checkpoint_uuids: list[str], rfid_uids: list[int], scans: int) -> list[dict]:
+  start = datetime(2026, 1, 1, 9, 0)
+  return [
+    {
+      "checkpoint_id": checkpoint_uuids[i // len(rfid_uids) % len(checkpoint_uuids)],
+      "rfid_uid": rfid_uids[i % len(rfid_uids)],
+      "timestamp": (start + timedelta(seconds=i)).isoformat(),
+    }
+    for i in range(scans)
+  ]
+
+
+async def run_single(client: httpx.AsyncClient, scans: list[dict]) -> dict:
+  started = time.perf_counter()
+  statuses = [(await client.post(f"{config.API_PREFIX}/events/", json=scan)).status_code for scan in scans]
+  elapsed = time.perf_counter() - started
+  return {
+    "requests": len(scans),
+    "created": statuses.count(201),
+    "seconds": round(elapsed, 3),
+    "scans_per_second": round(len(scans) / elapsed),
+  }
+
+
+async def run_batch(client: httpx.AsyncClient, scans: list[dict]) -> dict:
+  started = time.perf_counter()
+  body = (await client.post(f"{config.API_PREFIX}/events/batch", json=scans)).json()
+  elapsed = time.perf_counter() - started
+  return {
+    "requests": 1,
+    "created": body["created"],
+    "seconds": round(elapsed, 3),
+    "scans_per_second": round(len(scans) / elapsed),
+  }
+
+
+async def _run(scans: int, batch: bool) -> dict:
+  async with temp_database() as db:
+    runners = max(1, scans // 4)
+    race = await seed_race(db, runners, 4)
+    payload = backlog(race.checkpoint_uuids, race.rfid_uids, scans)
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=config.API_PREFIX)
+
+    async def override_get_db():
+      async with db.get_session() as session:
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # POST /api/events writes through the module's ingest queue; point it at the benchmark database
+    queue = EventIngestQueue(db)
+    original_queue, events_routes.ingest_queue = events_routes.ingest_queue, queue
+    await queue.start()
+    try:
+      transport = httpx.ASGITransport(app=app)
+      async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await (run_batch if batch else run_single)(client, payload)
+    finally:
+      await queue.stop()
+      events_routes.ingest_queue = original_queue
+
+
+async def main(scans: int) -> dict:
+  return {
+    "single_posts": await _run(scans, batch=False),
+    "batch": await _run(scans, batch=True),
+  }
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--scans", type=int, default=1000)
+  args = parser.parse_args()
+  print(json.dumps(asyncio.run(main(args.scans)), indent=2))
@@ -0,0 +1,136 @@
+import statistics
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncGenerator, List, Sequence
+
+from sqlalchemy import func, insert, select
+
+from app.core.cache import lookup_cache
+from app.core.db import Base, DatabaseManager
+from app.core.migrations import schema_version
+from app.core.race_index import race_index
+from app.core.results import results_store
+from app.core.roster import roster_store
+from app.models.checkpoint import Checkpoint
+from app.models.event import Event
+from app.models.race import Race, RaceCheckpoint, RaceRunner
+from app.models.runner import Runner
+
+
+# Punch time of the first control in seed_events
+SEED_START = datetime(2026, 1, 1, 9, 0)
+
+
+@dataclass
+class SeededRace:
+  race_id: int
+  checkpoint_uuids: List[str]
+  rfid_uids: List[int]
+
+
+@asynccontextmanager
+async def temp_database(
+  sqlite_profile: str | None = None,
+  database_url: str | None = None,
+) -> AsyncGenerator[DatabaseManager, None]:
+  """Yield a DatabaseManager backed by a throwaway database.
+
+  Without database_url a temporary SQLite file is used. A given database_url
+  (e.g. a local PostgreSQL) is wiped before and after use.
+  """
+  lookup_cache.clear()
+  race_index.invalidate()
+  results_store.clear()
+  roster_store.clear()
+  with tempfile.TemporaryDirectory() as tmp:
+    url = database_url or f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+    db = DatabaseManager(url, sqlite_profile=sqlite_profile)
+    await db.initialize()
+    if database_url:
+      await _drop_all(db)
+    await db.create_tables()
+    try:
+      yield db
+    finally:
+      if database_url:
+        await _drop_all(db)
+      await db.close()
+
+
+async def _drop_all(db: DatabaseManager) -> None:
+  async with db._engine.begin() as conn:
+    await conn.run_sync(Base.metadata.drop_all)
+    await conn.run_sync(schema_version.drop, checkfirst=True)
+
+
+async def seed_race(db: DatabaseManager, runners: int, checkpoints: int, race_name: str = "bench") -> SeededRace:
+  """Insert one active race with its runners and checkpoints using bulk inserts."""
+  async with db.get_session() as session:
+    race_id = (await session.execute(
+      insert(Race).returning(Race.id, sort_by_parameter_order=True),
+      [{"name": race_name, "date": datetime.now(), "location": "bench", "is_active": True}]
+    )).scalar_one()
+
+    last_rfid = (await session.execute(select(func.max(Runner.rfid_uid)))).scalar() or 0
+    rfid_uids = [last_rfid + 1 + i for i in range(runners)]
+    runner_ids = (await session.execute(
+      insert(Runner).returning(Runner.id, sort_by_parameter_order=True),
+      [{"rfid_uid": rfid, "name": f"runner{rfid}", "surname": "bench"} for rfid in rfid_uids]
+    )).scalars().all()
+
+    checkpoint_uuids = [f"{race_name}-{race_id}-cp{i}" for i in range(checkpoints)]
+    checkpoint_ids = (await session.execute(
+      insert(Checkpoint).returning(Checkpoint.id, sort_by_parameter_order=True),
+      [{"uuid": uuid, "name": uuid[-30:]} for uuid in checkpoint_uuids]
+    )).scalars().all()
+
+    await session.execute(insert(RaceRunner), [{"race_id": race_id, "runner_id": i} for i in runner_ids])
+    await session.execute(
+      insert(RaceCheckpoint),
+      [{"race_id": race_id, "checkpoint_id": c, "order": order} for order, c in enumerate(checkpoint_ids, start=1)]
+    )
+    await session.commit()
+
+  return SeededRace(race_id=race_id, checkpoint_uuids=checkpoint_uuids, rfid_uids=rfid_uids)
+
+
+async def seed_events(db: DatabaseManager, race_id: int, controls: int | None = None) -> int:
+  """One scan per runner at each of the first `controls` checkpoints (all by default); returns the highest event ID."""
+  async with db.get_session() as session:
+    runner_ids = (await session.execute(
+      select(RaceRunner.runner_id).where(RaceRunner.race_id == race_id)
+    )).scalars().all()
+    checkpoint_ids = (await session.execute(
+      select(RaceCheckpoint.checkpoint_id).where(RaceCheckpoint.race_id == race_id).order_by(RaceCheckpoint.order)
+    )).scalars().all()[:controls]
+    rows = [
+      {"race_id": race_id, "runner_id": r, "checkpoint_id": c, "timestamp": SEED_START + timedelta(minutes=i)}
+      for r in runner_ids
+      for i, c in enumerate(checkpoint_ids)
+    ]
+    ids = (await session.execute(insert(Event).returning(Event.id, sort_by_parameter_order=True), rows)).scalars().all()
+    await session.commit()
+    return ids[-1] if ids else 0
+
+
+def percentile(samples: Sequence[float], p: float) -> float:
+  """Return the p-th percentile (0-100) of samples."""
+  if not samples:
+    return 0.0
+  if len(samples) == 1:
+    return samples[0]
+  return statistics.quantiles(samples, n=100, method="inclusive")[min(98, max(0, int(p) - 1))]
+
+
+def describe_latencies(samples_s: Sequence[float]) -> dict:
+  """Summarize latencies given in seconds as milliseconds."""
+  ms = sorted(s * 1000 for s in samples_s)
+  return {
+    "count": len(ms),
+    "p50_ms": round(percentile(ms, 50), 3),
+    "p95_ms": round(percentile(ms, 95), 3),
+    "p99_ms": round(percentile(ms, 99), 3),
+  }
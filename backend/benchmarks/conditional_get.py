@@ -0,0 +1,93 @@
+"""Bytes per minute an idle desktop dashboard pulls, with and without If-None-Match.
+
+  uv run python -m benchmarks.conditional_get --runners 300 --checkpoints 20
+
+Replays the list requests the desktop polls once a second (race list, runner,
+checkpoint and event lists, plus an open race detail view) for a minute of
+ticks against an unchanging database. Counted bytes are the status line,
+the application's headers and the body.
+"""
+import argparse
+import asyncio
+import json
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import config
+from app.core.db import get_db
+from app.routes.router import api_router
+
+from benchmarks.common import seed_events, seed_race, temp_database
+
+
+def dashboard_urls(race_id: int, cursor: int) -> list[str]:
+  prefix = config.API_PREFIX
+  return [
+    f"{prefix}/races/",
+    f"{prefix}/runners/",
+    f"{prefix}/checkpoints/",
+    f"{prefix}/events/",
+    f"{prefix}/runners/?race_id={race_id}",
+    f"{prefix}/checkpoints/?race_id={race_id}",
+    f"{prefix}/events/?race_id={race_id}&since_id={cursor}&limit=1000",
+  ]
+
+
+def response_bytes(response: httpx.Response) -> int:
+  status_line = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n")
+  headers = sum(len(k) + len(v) + 4 for k, v in response.headers.raw)
+  return status_line + headers + 2 + len(response.content)
+
+
+async def poll(client: httpx.AsyncClient, urls: list[str], ticks: int, conditional: bool) -> dict:
+  etags: dict[str, str] = {}
+  total = 0
+  not_modified = 0
+  for _ in range(ticks):
+    for url in urls:
+      headers = {"If-None-Match": etags[url]} if conditional and url in etags else {}
+      response = await client.get(url, headers=headers)
+      total += response_bytes(response)
+      if response.status_code == 304:
+        not_modified += 1
+      elif "etag" in response.headers:
+        etags[url] = response.headers["etag"]
+  return {
+    "requests": ticks * len(urls),
+    "not_modified": not_modified,
+    "bytes_per_minute": round(total * 60 / ticks),
+  }
+
+
+async def main(runners: int, checkpoints: int, ticks: int) -> dict:
+  async with temp_database() as db:
+    race = await seed_race(db, runners, checkpoints)
+    cursor = await seed_events(db, race.race_id)
+
+    app = FastAPI()
+    app.include_router(api_router, prefix=config.API_PREFIX)
+
+    async def override_get_db():
+      async with db.get_session() as session:
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # The race detail view has already caught up to the newest event
+    urls = dashboard_urls(race.race_id, cursor)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+      return {
+        "unconditional": await poll(client, urls, ticks, conditional=False),
+        "if_none_match": await poll(client, urls, ticks, conditional=True),
+      }
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runners", type=int, default=300)
+  parser.add_argument("--checkpoints", type=int, default=20)
+  parser.add_argument("--ticks", type=int, default=60, help="Polling rounds, one per simulated second")
+  args = parser.parse_args()
+  print(json.dumps(asyncio.run(main(args.runners, args.checkpoints, args.ticks)), indent=2))
@@ -0,0 +1,95 @@
+"""Sustained scan throughput for a simulated mass-start burst.
+
+Compares one transaction per scan (the old request path) with the batching
+EventIngestQueue used by POST /api/events.
+
+  uv run python -m benchmarks.ingest --runners 300 --rounds 4
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.core.db import DatabaseManager
+from app.core.ingest import EventIngestQueue
+from app.crud.event import create_event
+from app.schemas.event import EventCreate
+
+from benchmarks.common import SeededRace, describe_latencies, seed_race, temp_database
+
+
+def burst(seeded: SeededRace, rounds: int) -> list[list[EventCreate]]:
+  """Every runner punches a control at the same moment, once per round."""
+  start = datetime.now()
+  return [
+    [
+      EventCreate(
+        checkpoint_id=seeded.checkpoint_uuids[r % len(seeded.checkpoint_uuids)],
+        rfid_uid=rfid,
+        timestamp=(start + timedelta(minutes=r)).isoformat(),
+      )
+      for rfid in seeded.rfid_uids
+    ]
+    for r in range(rounds)
+  ]
+
+
+async def _timed(coro, latencies: list[float], errors: list[str]):
+  started = time.perf_counter()
+  try:
+    await coro
+    latencies.append(time.perf_counter() - started)
+  except Exception as e:
+    errors.append(type(e).__name__)
+
+
+async def run_direct(db: DatabaseManager, rounds: list[list[EventCreate]]) -> dict:
+  async def one(event_in: EventCreate):
+    async with db.get_session() as session:
+      await create_event(session, event_in)
+
+  return await _run(rounds, one)
+
+
+async def run_queued(db: DatabaseManager, rounds: list[list[EventCreate]]) -> dict:
+  queue = EventIngestQueue(db)
+  await queue.start()
+  try:
+    return await _run(rounds, queue.submit)
+  finally:
+    await queue.stop()
+
+
+async def _run(rounds: list[list[EventCreate]], submit) -> dict:
+  latencies: list[float] = []
+  errors: list[str] = []
+  started = time.perf_counter()
+  for scans in rounds:
+    await asyncio.gather(*(_timed(submit(e), latencies, errors) for e in scans))
+  elapsed = time.perf_counter() - started
+  return {
+    "scans": sum(len(r) for r in rounds),
+    "errors": len(errors),
+    "seconds": round(elapsed, 3),
+    "scans_per_second": round(len(latencies) / elapsed, 1),
+    **describe_latencies(latencies),
+  }
+
+
+async def main(runners: int, checkpoints: int, rounds: int) -> dict:
+  results = {}
+  for name, runner in (("per_request_commit", run_direct), ("batched_queue", run_queued)):
+    async with temp_database() as db:
+      seeded = await seed_race(db, runners, checkpoints)
+      results[name] = await runner(db, burst(seeded, rounds))
+  return results
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runners", type=int, default=300)
+  parser.add_argument("--checkpoints", type=int, default=2)
+  parser.add_argument("--rounds", type=int, default=4)
+  args = parser.parse_args()
+  print(json.dumps(asyncio.run(main(args.runners, args.checkpoints, args.rounds)), indent=2))
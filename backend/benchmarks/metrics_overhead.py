@@ -0,0 +1,143 @@
+"""Cost of request metrics: the API with and without MetricsMiddleware and the DB listener.
+
+  uv run python -m benchmarks.metrics_overhead --requests 5000
+
+Two apps serve the same routers from one seeded database over ASGI, each
+with its own engine. "off" has no middleware and its engine was created with
+metrics disabled, so it has no statement listener and records no sessions;
+"on" is instrumented like app.main:app. Requests alternate between the two
+(in alternating order) so that drift and GC pauses hit both alike, and the
+overhead is the median of the paired differences. The exit code is 1 if
+any route is slowed down by more than --max-percent.
+
+Also reported: the bookkeeping alone (request_started + request_finished +
+three statements), in microseconds per request.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from contextlib import AsyncExitStack
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.config import config
+from app.core.db import DatabaseManager, get_db
+from app.core.metrics import Metrics, MetricsMiddleware, metrics
+from app.routes.router import api_router
+
+from benchmarks.common import seed_events, seed_race, temp_database
+
+WARMUP = 50
+
+
+async def build_app(database_url: str, instrumented: bool, stack: AsyncExitStack) -> httpx.AsyncClient:
+  """A client for the API served from an engine of its own."""
+  metrics.enabled = instrumented
+  db = DatabaseManager(database_url)
+  await db.initialize()  # attaches the statement listener if metrics are enabled
+  stack.push_async_callback(db.close)
+
+  async def own_db():
+    async with db.get_session() as session:
+      yield session
+
+  app = FastAPI()
+  app.include_router(api_router, prefix=config.API_PREFIX)
+  app.dependency_overrides[get_db] = own_db
+  if instrumented:
+    app.add_middleware(MetricsMiddleware)
+  transport = httpx.ASGITransport(app=app)
+  return await stack.enter_async_context(httpx.AsyncClient(transport=transport, base_url="http://bench"))
+
+
+async def timed_get(client: httpx.AsyncClient, url: str, instrumented: bool) -> float:
+  metrics.enabled = instrumented
+  started = time.perf_counter()
+  response = await client.get(url)
+  elapsed = time.perf_counter() - started
+  response.raise_for_status()
+  return elapsed
+
+
+async def compare(clients: dict, url: str, requests: int) -> dict:
+  for _ in range(WARMUP):
+    for mode, client in clients.items():
+      await timed_get(client, url, mode == "on")
+
+  off, on = [], []
+  for i in range(requests):
+    order = ("off", "on") if i % 2 == 0 else ("on", "off")
+    for mode in order:
+      (on if mode == "on" else off).append(await timed_get(clients[mode], url, mode == "on"))
+
+  off_p50 = statistics.median(off)
+  overhead = statistics.median(b - a for a, b in zip(off, on))
+  return {
+    "off_p50_us": round(off_p50 * 1e6, 1),
+    "on_p50_us": round(statistics.median(on) * 1e6, 1),
+    "overhead_us": round(overhead * 1e6, 1),
+    "overhead_percent": round(overhead / off_p50 * 100, 2),
+  }
+
+
+def hook_cost(iterations: int = 100_000) -> float:
+  """µs of bookkeeping per request, outside any app."""
+  registry = Metrics()
+  started = time.perf_counter()
+  for _ in range(iterations):
+    token = registry.request_started()
+    registry.count_query()
+    registry.count_query()
+    registry.count_query()
+    registry.request_finished("GET", "/api/races/{race_id}/runners", 200, 0.004, token)
+  return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def main(runners: int, checkpoints: int, requests: int) -> dict:
+  report = {"requests": requests, "routes": {}}
+  async with temp_database() as db, AsyncExitStack() as stack:
+    race = await seed_race(db, runners, checkpoints)
+    await seed_events(db, race.race_id)
+    urls = {
+      "health": f"{config.API_PREFIX}/health/",
+      "race_runners": f"{config.API_PREFIX}/races/{race.race_id}/runners",
+      "list_events": f"{config.API_PREFIX}/events/?race_id={race.race_id}&limit=100",
+    }
+
+    clients = {}
+    try:
+      for mode in ("off", "on"):
+        clients[mode] = await build_app(db._get_database_url(), mode == "on", stack)
+      metrics.clear()
+      for name, url in urls.items():
+        report["routes"][name] = await compare(clients, url, requests)
+    finally:
+      metrics.enabled = config.METRICS_ENABLED
+
+  report["hook_us_per_request"] = round(hook_cost(), 2)
+  report["recorded_by_on"] = sum(histogram.count for histogram in metrics.latency.values())
+  return report
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runners", type=int, default=200)
+  parser.add_argument("--checkpoints", type=int, default=10)
+  parser.add_argument("--requests", type=int, default=3000, help="Request pairs per route")
+  parser.add_argument("--max-percent", type=float, default=5.0)
+  args = parser.parse_args()
+
+  # Request logging at DEBUG would dominate the timings
+  logging.getLogger().setLevel(logging.WARNING)
+
+  report = asyncio.run(main(args.runners, args.checkpoints, args.requests))
+  print(json.dumps(report, indent=2))
+  too_slow = [name for name, route in report["routes"].items() if route["overhead_percent"] > args.max_percent]
+  for name in too_slow:
+    print(f"OVERHEAD {name}: {report['routes'][name]['overhead_percent']} % > {args.max_percent} %", file=sys.stderr)
+  sys.exit(1 if too_slow else 0)
@@ -0,0 +1,132 @@
+"""Query-plan regression check for the hot lookup queries.
+
+Fails (exit code 1) if any of them falls back to a full table scan or a sort, if a
+pre-migration database (with duplicate card UIDs) is not upgraded in place,
+or if migrating an empty database does not give the schema of the models.
+
+  uv run python -m benchmarks.query_plans
+"""
+import asyncio
+import sys
+
+from sqlalchemy import Select, inspect, select, text
+from sqlalchemy.dialects import sqlite
+
+from app.core.db import Base
+from app.core.migrations import MIGRATIONS, get_version
+from app.models.checkpoint import Checkpoint
+from app.models.event import Event
+from app.models.race import Race
+from app.models.runner import Runner
+
+from benchmarks.common import temp_database
+
+HOT_QUERIES: dict[str, Select] = {
+  "runner_by_rfid": select(Runner).where(Runner.rfid_uid == 1),
+  "checkpoint_by_uuid": select(Checkpoint).where(Checkpoint.uuid == "x"),
+  "active_races": select(Race.id).where(Race.is_active == True),
+  "events_of_race": select(Event).where(Event.race_id == 1).order_by(Event.id),
+  "events_of_race_since": select(Event).where(Event.race_id == 1, Event.id > 100).order_by(Event.id),
+  "race_runner_events": select(Event).where(Event.race_id == 1, Event.runner_id == 1).order_by(Event.id),
+  "race_runner_checkpoint_events": select(Event).where(
+    Event.race_id == 1, Event.runner_id == 1, Event.checkpoint_id == 1
+  ),
+  "runner_events": select(Event).where(Event.runner_id == 1),
+  "events_by_scan_id": select(Event).where(Event.scan_id.in_(["a", "b"])),
+}
+
+
+def _compile(query: Select) -> str:
+  return str(query.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+async def check_query_plans() -> list[str]:
+  failures = []
+  async with temp_database() as db:
+    async with db.get_session() as session:
+      for name, query in HOT_QUERIES.items():
+        rows = (await session.execute(text(f"EXPLAIN QUERY PLAN {_compile(query)}"))).all()
+        plan = "; ".join(row[-1] for row in rows)
+        # A sort step would make every page cost as much as the whole race
+        ok = "USING" in plan and not any(row[-1].startswith("SCAN") or "TEMP B-TREE" in row[-1] for row in rows)
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {plan}")
+        if not ok:
+          failures.append(name)
+  return failures
+
+
+async def check_in_place_upgrade() -> list[str]:
+  """Strip a fresh database back to the pre-migration schema, with a duplicate card, and upgrade it.
+
+  The upgrade must not fail on the duplicate; the unique index on rfid_uid
+  follows on the first start after the duplicate is gone.
+  """
+  async with temp_database() as db:
+    async with db._engine.begin() as conn:
+      for table in (Runner.__table__, Checkpoint.__table__, Race.__table__, Event.__table__):
+        for index in table.indexes:
+          await conn.execute(text(f"DROP INDEX {index.name}"))
+      await conn.execute(text("ALTER TABLE events DROP COLUMN scan_id"))
+      await conn.execute(text("DROP TABLE schema_version"))
+      await conn.execute(text("INSERT INTO runners (rfid_uid, name, surname) VALUES (7, 'a', 'a'), (7, 'b', 'b')"))
+
+    await db.create_tables()
+    async with db._engine.connect() as conn:
+      version = await conn.run_sync(get_version)
+      unique_with_duplicate = await conn.run_sync(_is_unique, "runners", "ix_runners_rfid_uid")
+    async with db._engine.begin() as conn:
+      await conn.execute(text("DELETE FROM runners WHERE name = 'b'"))
+    await db.create_tables()
+    async with db._engine.connect() as conn:
+      unique_after = await conn.run_sync(_is_unique, "runners", "ix_runners_rfid_uid")
+
+    expected = MIGRATIONS[-1].version
+    ok = version == expected and unique_with_duplicate is False and unique_after is True
+    print(
+      f"{'ok  ' if ok else 'FAIL'} in-place upgrade: schema version {version} (expected {expected}), "
+      f"rfid_uid unique with a duplicate: {unique_with_duplicate}, after removing it: {unique_after}"
+    )
+    return [] if ok else ["in_place_upgrade"]
+
+
+def _is_unique(conn, table: str, name: str) -> bool | None:
+  index = next((i for i in inspect(conn).get_indexes(table) if i["name"] == name), None)
+  return None if index is None else bool(index["unique"])
+
+
+def _schema(conn) -> dict:
+  inspector = inspect(conn)
+  return {
+    table: (
+      sorted(c["name"] for c in inspector.get_columns(table)),
+      sorted((i["name"], tuple(i["column_names"]), bool(i["unique"])) for i in inspector.get_indexes(table)),
+    )
+    for table in Base.metadata.tables
+  }
+
+
+async def check_migrated_schema() -> list[str]:
+  """The migrations, applied to an empty database, must build the schema the models declare."""
+  async with temp_database() as migrated, temp_database() as declared:
+    async with declared._engine.begin() as conn:
+      await conn.run_sync(Base.metadata.drop_all)
+      await conn.run_sync(Base.metadata.create_all)
+    async with migrated._engine.connect() as conn:
+      got = await conn.run_sync(_schema)
+    async with declared._engine.connect() as conn:
+      want = await conn.run_sync(_schema)
+  failures = [table for table in want if got.get(table) != want[table]]
+  for table in failures:
+    print(f"FAIL migrated schema of {table}: {got.get(table)} != models {want[table]}")
+  if not failures:
+    print("ok   migrated schema matches the models")
+  return failures
+
+
+async def main() -> int:
+  failures = await check_in_place_upgrade() + await check_migrated_schema() + await check_query_plans()
+  return 1 if failures else 0
+
+
+if __name__ == "__main__":
+  sys.exit(asyncio.run(main()))
@@ -0,0 +1,54 @@
+"""Scan routing cost: the active-race join vs the in-memory participation index.
+
+  uv run python -m benchmarks.routing --runners 1000 --checkpoints 60
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import select
+
+from app.core.race_index import race_index
+from app.crud.race import get_active_races_with_checkpoint_and_runner
+from app.models.checkpoint import Checkpoint
+from app.models.runner import Runner
+
+from benchmarks.common import describe_latencies, seed_race, temp_database
+
+
+async def main(runners: int, checkpoints: int, races: int, lookups: int) -> dict:
+  async with temp_database() as db:
+    for i in range(races):
+      await seed_race(db, runners, checkpoints, race_name=f"race{i}")
+
+    async with db.get_session() as session:
+      runner_ids = (await session.execute(select(Runner.id))).scalars().all()
+      checkpoint_ids = (await session.execute(select(Checkpoint.id))).scalars().all()
+      rng = random.Random(0)
+      pairs = [(rng.choice(checkpoint_ids), rng.choice(runner_ids)) for _ in range(lookups)]
+
+      results = {}
+      for name, route in (
+        ("join_query", lambda c, r: get_active_races_with_checkpoint_and_runner(session, c, r)),
+        ("race_index", lambda c, r: race_index.races_for(session, c, r)),
+      ):
+        await route(*pairs[0])  # warm up (loads the index)
+        latencies = []
+        for checkpoint_id, runner_id in pairs:
+          started = time.perf_counter()
+          await route(checkpoint_id, runner_id)
+          latencies.append(time.perf_counter() - started)
+        results[name] = describe_latencies(latencies)
+      return results
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runners", type=int, default=1000)
+  parser.add_argument("--checkpoints", type=int, default=60)
+  parser.add_argument("--races", type=int, default=3)
+  parser.add_argument("--lookups", type=int, default=2000)
+  args = parser.parse_args()
+  print(json.dumps(asyncio.run(main(args.runners, args.checkpoints, args.races, args.lookups)), indent=2))
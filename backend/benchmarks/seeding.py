@@ -0,0 +1,100 @@
+"""Rows per second when seeding: CRUD calls per entity (as seed_db_big did) vs the bulk season generator.
+
+  uv run python -m benchmarks.seeding --runners 200 --checkpoints 10 --season-runners 10000
+
+Both build one race with its runners, checkpoints and a punch per runner at
+every control. The CRUD path commits and refreshes every row, like the API
+does. The season line is a full app.core.fixtures season, by default 10k
+runners, 500 checkpoints and about 2M punches.
+"""
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.core.fixtures import SeasonSpec, seed_season
+from app.crud.checkpoint import create_checkpoint
+from app.crud.event import create_event
+from app.crud.race import add_race_checkpoint, add_race_runner, create_race
+from app.crud.runner import create_runner
+from app.schemas.checkpoint import CheckpointCreate
+from app.schemas.event import EventCreate
+from app.schemas.race import RaceCreate
+from app.schemas.runner import RunnerCreate
+
+from benchmarks.common import SEED_START, temp_database
+
+
+async def seed_with_crud(session, runners: int, checkpoints: int) -> int:
+  race = await create_race(session, RaceCreate(name="crud", date=datetime.now(), is_active=True, location="bench"))
+  rows = 1
+  runner_list = []
+  for rfid in range(1, runners + 1):
+    runner = await create_runner(session, RunnerCreate(rfid_uid=rfid))
+    await add_race_runner(session, race.id, runner.id)
+    runner_list.append(runner)
+    rows += 2
+  uuids = []
+  for i in range(checkpoints):
+    checkpoint = await create_checkpoint(session, CheckpointCreate(checkpoint_id=f"crud-cp{i}", timestamp=datetime.now().isoformat()))
+    await add_race_checkpoint(session, race.id, checkpoint.id)
+    uuids.append(checkpoint.uuid)
+    rows += 2
+  for i, uuid in enumerate(uuids):
+    for runner in runner_list:
+      timestamp = (SEED_START + timedelta(minutes=i)).isoformat()
+      rows += len(await create_event(session, EventCreate(checkpoint_id=uuid, rfid_uid=runner.rfid_uid, timestamp=timestamp)))
+  return rows
+
+
+async def measure(seed) -> dict:
+  async with temp_database() as db:
+    async with db.get_session() as session:
+      started = time.perf_counter()
+      rows = await seed(session)
+      elapsed = time.perf_counter() - started
+  return {"rows": rows, "seconds": round(elapsed, 2), "rows_per_second": round(rows / elapsed)}
+
+
+async def main(runners: int, checkpoints: int, season: SeasonSpec) -> dict:
+  same_race = SeasonSpec(
+    runners=runners,
+    checkpoints=checkpoints,
+    races=1,
+    runners_per_race=runners,
+    min_controls=checkpoints,
+    max_controls=checkpoints,
+    dnf_rate=0.0,
+  )
+
+  async def bulk(session):
+    return (await seed_season(session, same_race)).rows
+
+  async def full_season(session):
+    return (await seed_season(session, season)).rows
+
+  return {
+    "crud_per_entity": await measure(lambda session: seed_with_crud(session, runners, checkpoints)),
+    "bulk": await measure(bulk),
+    "season": await measure(full_season),
+  }
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--runners", type=int, default=200)
+  parser.add_argument("--checkpoints", type=int, default=10)
+  parser.add_argument("--season-runners", type=int, default=10_000)
+  parser.add_argument("--season-checkpoints", type=int, default=500)
+  parser.add_argument("--season-races", type=int, default=40)
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+  season = SeasonSpec(
+    seed=args.seed,
+    runners=args.season_runners,
+    checkpoints=args.season_checkpoints,
+    races=args.season_races,
+    runners_per_race=min(SeasonSpec.runners_per_race, args.season_runners),
+  )
+  print(json.dumps(asyncio.run(main(args.runners, args.checkpoints, season)), indent=2))
@@ -0,0 +1,91 @@
+"""Reader/writer latency under each SQLite performance profile.
+
+Writers push scans through the ingest queue while readers poll the lists the
+desktop UI refreshes (races, runners and events of the race).
+
+  uv run python -m benchmarks.sqlite_profiles --seconds 5 --readers 5 --writers 50
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import config
+from app.core.ingest import EventIngestQueue
+from app.crud.event import get_events_of_race
+from app.crud.race import get_races
+from app.crud.runner import get_runners_of_race
+from app.schemas.event import EventCreate
+
+from benchmarks.common import describe_latencies, seed_race, temp_database
+
+
+async def run_profile(profile: str, seconds: float, readers: int, writers: int) -> dict:
+  async with temp_database(sqlite_profile=profile) as db:
+    seeded = await seed_race(db, runners=500, checkpoints=10)
+    queue = EventIngestQueue(db)
+    await queue.start()
+
+    read_latencies: list[float] = []
+    write_latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    scans = itertools.count()
+    start = datetime.now()
+
+    async def reader():
+      nonlocal errors
+      while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+          async with db.get_session() as session:
+            await get_races(session)
+            await get_runners_of_race(session, seeded.race_id)
+            await get_events_of_race(session, seeded.race_id)
+          read_latencies.append(time.perf_counter() - started)
+        except Exception:
+          errors += 1
+        await asyncio.sleep(0.05)
+
+    async def writer():
+      nonlocal errors
+      while time.perf_counter() < deadline:
+        n = next(scans)
+        event_in = EventCreate(
+          checkpoint_id=seeded.checkpoint_uuids[n % len(seeded.checkpoint_uuids)],
+          rfid_uid=seeded.rfid_uids[n % len(seeded.rfid_uids)],
+          timestamp=(start + timedelta(milliseconds=n)).isoformat(),
+        )
+        started = time.perf_counter()
+        try:
+          await queue.submit(event_in)
+          write_latencies.append(time.perf_counter() - started)
+        except Exception:
+          errors += 1
+
+    await asyncio.gather(*(reader() for _ in range(readers)), *(writer() for _ in range(writers)))
+    await queue.stop()
+
+  return {
+    "writes_per_second": round(len(write_latencies) / seconds, 1),
+    "reads_per_second": round(len(read_latencies) / seconds, 1),
+    "errors": errors,
+    "write": describe_latencies(write_latencies),
+    "read": describe_latencies(read_latencies),
+  }
+
+
+async def main(profiles: list[str], seconds: float, readers: int, writers: int) -> dict:
+  return {p: await run_profile(p, seconds, readers, writers) for p in profiles}
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--profiles", nargs="+", default=list(config.SQLITE_PROFILES), choices=list(config.SQLITE_PROFILES))
+  parser.add_argument("--seconds", type=float, default=5)
+  parser.add_argument("--readers", type=int, default=5)
+  parser.add_argument("--writers", type=int, default=50)
+  args = parser.parse_args()
+  print(json.dumps(asyncio.run(main(args.profiles, args.seconds, args.readers, args.writers)), indent=2))
@@ -0,0 +1,225 @@
+"""End-to-end benchmark suite: app.main:app in-process, seeded at several scales.
+
+  uv run python -m benchmarks.suite --scales small medium --output results.json
+  uv run python -m benchmarks.suite --scales small medium --compare results.json
+
+For every scale a throwaway database gets one active race with its runners,
+checkpoints and a scan per runner at the first half of the controls (bulk
+inserts, no ORM round trips). The real application then starts with its
+lifespan (migrations, ingest queue) and is driven over ASGI:
+
+  ingest_single   every runner punches the next control, POST /api/events, --concurrency at once
+  ingest_batch    the remaining controls as checkpoint backlogs, POST /api/events/batch
+  list_events     GET /api/events/?race_id=
+  race_runners    GET /api/races/{id}/runners
+  results_cold    GET /api/races/{id}/results, recomputed from the database every time
+  results_warm    GET /api/races/{id}/results, from the in-memory standings
+
+Results carry the git commit and environment. With --compare, any operation
+whose p95 rose or whose throughput fell by more than --tolerance against the
+given file is listed and the exit code is 1.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.core.config import config
+from app.core.db import db_manager
+from app.core.results import results_store
+from app.main import app
+
+from benchmarks.common import SEED_START, SeededRace, describe_latencies, seed_events, seed_race, temp_database
+
+# (runners, checkpoints)
+SCALES = {
+  "small": (100, 10),
+  "medium": (500, 20),
+  "large": (2000, 40),
+}
+
+
+@asynccontextmanager
+async def running_app(database_url: str):
+  """app.main:app with its lifespan running against database_url."""
+  db_manager._database_url = database_url
+  try:
+    async with app.router.lifespan_context(app):
+      yield app
+  finally:
+    db_manager._database_url = None
+
+
+def git_commit() -> str | None:
+  try:
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+  except (OSError, subprocess.CalledProcessError):
+    return None
+  return f"{commit}-dirty" if dirty.strip() else commit
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int, items: int | None = None) -> dict:
+  summary = {
+    "requests": len(latencies),
+    "errors": errors,
+    "per_second": round(len(latencies) / elapsed, 1),
+    **describe_latencies(latencies),
+  }
+  if items is not None:
+    summary["scans_per_second"] = round(items / elapsed, 1)
+  return summary
+
+
+async def timed_requests(client: httpx.AsyncClient, requests: list[dict], concurrency: int, before=None) -> tuple[list[float], float, int]:
+  """Send `requests` (httpx.request kwargs) `concurrency` at a time; returns latencies, elapsed and errors."""
+  semaphore = asyncio.Semaphore(concurrency)
+  latencies: list[float] = []
+  errors = 0
+
+  async def one(request: dict):
+    nonlocal errors
+    async with semaphore:
+      if before is not None:
+        before()
+      started = time.perf_counter()
+      response = await client.request(**request)
+      latencies.append(time.perf_counter() - started)
+      if response.status_code >= 400:
+        errors += 1
+
+  started = time.perf_counter()
+  await asyncio.gather(*(one(r) for r in requests))
+  return latencies, time.perf_counter() - started, errors
+
+
+def scan(race: SeededRace, control: int, rfid: int) -> dict:
+  return {
+    "checkpoint_id": race.checkpoint_uuids[control],
+    "rfid_uid": rfid,
+    "timestamp": (SEED_START + timedelta(minutes=control)).isoformat(),
+  }
+
+
+async def run_scale(name: str, runners: int, checkpoints: int, reads: int, concurrency: int, batch_size: int) -> dict:
+  prefix = config.API_PREFIX
+  async with temp_database() as db:
+    started = time.perf_counter()
+    race = await seed_race(db, runners, checkpoints, race_name=name)
+    seeded_controls = checkpoints // 2
+    await seed_events(db, race.race_id, seeded_controls)
+    seed_seconds = time.perf_counter() - started
+
+    async with running_app(db._get_database_url()):
+      transport = httpx.ASGITransport(app=app)
+      async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+
+        singles = [
+          {"method": "POST", "url": f"{prefix}/events/", "json": scan(race, seeded_controls, rfid)}
+          for rfid in race.rfid_uids
+        ]
+        latencies, elapsed, errors = await timed_requests(client, singles, concurrency)
+        results["ingest_single"] = summarize(latencies, elapsed, errors, items=len(singles))
+
+        backlog = [scan(race, c, rfid) for c in range(seeded_controls + 1, checkpoints) for rfid in race.rfid_uids]
+        batches = [
+          {"method": "POST", "url": f"{prefix}/events/batch", "json": backlog[i:i + batch_size]}
+          for i in range(0, len(backlog), batch_size)
+        ]
+        latencies, elapsed, errors = await timed_requests(client, batches, 1)
+        results["ingest_batch"] = summarize(latencies, elapsed, errors, items=len(backlog))
+
+        reads_of = {
+          "list_events": f"{prefix}/events/?race_id={race.race_id}&limit=1000",
+          "race_runners": f"{prefix}/races/{race.race_id}/runners",
+          "results_cold": f"{prefix}/races/{race.race_id}/results",
+          "results_warm": f"{prefix}/races/{race.race_id}/results",
+        }
+        for operation, url in reads_of.items():
+          requests = [{"method": "GET", "url": url}] * reads
+          before = results_store.clear if operation == "results_cold" else None
+          latencies, elapsed, errors = await timed_requests(client, requests, 1, before=before)
+          results[operation] = summarize(latencies, elapsed, errors)
+
+  return {
+    "runners": runners,
+    "checkpoints": checkpoints,
+    "seed_seconds": round(seed_seconds, 3),
+    "operations": results,
+  }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+  """Operations that got slower than `baseline` by more than `tolerance` (0.2 = 20 %)."""
+  regressions = []
+  for scale, result in current["scales"].items():
+    previous = baseline.get("scales", {}).get(scale)
+    if previous is None:
+      continue
+    for operation, now in result["operations"].items():
+      before = previous["operations"].get(operation)
+      if before is None:
+        continue
+      if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+        regressions.append(f"{scale}/{operation}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+      if now["per_second"] < before["per_second"] * (1 - tolerance):
+        regressions.append(f"{scale}/{operation}: {before['per_second']} -> {now['per_second']} requests/s")
+  return regressions
+
+
+async def main(scales: list[str], reads: int, concurrency: int, batch_size: int) -> dict:
+  report = {
+    "commit": git_commit(),
+    "created_at": datetime.now().isoformat(timespec="seconds"),
+    "python": platform.python_version(),
+    "sqlite": sqlite3.sqlite_version,
+    "sqlite_profile": config.SQLITE_PROFILE,
+    "platform": platform.platform(),
+    "scales": {},
+  }
+  for name in scales:
+    runners, checkpoints = SCALES[name]
+    report["scales"][name] = await run_scale(name, runners, checkpoints, reads, concurrency, batch_size)
+  return report
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["small", "medium"])
+  parser.add_argument("--reads", type=int, default=100, help="Requests per read operation")
+  parser.add_argument("--concurrency", type=int, default=50, help="Scans in flight during ingest_single")
+  parser.add_argument("--batch-size", type=int, default=200, help="Scans per POST /api/events/batch")
+  parser.add_argument("--output", help="Write the results to this JSON file")
+  parser.add_argument("--compare", help="Results JSON of a previous run to check for regressions")
+  parser.add_argument("--tolerance", type=float, default=0.2)
+  args = parser.parse_args()
+
+  # app.main logs every request at DEBUG, which would dominate the timings
+  logging.getLogger().setLevel(logging.WARNING)
+
+  baseline = None
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+
+  report = asyncio.run(main(args.scales, args.reads, args.concurrency, args.batch_size))
+  print(json.dumps(report, indent=2))
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump(report, f, indent=2)
+
+  if baseline is not None:
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+      print(f"REGRESSION {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,75 @@
+from typing import Dict
+
+
+class LookupCache:
+  """In-memory resolver for checkpoint UUIDs and runner RFID cards.
+
+  Only ids are cached, never ORM objects, so entries can be shared between
+  sessions. The CRUD layer keeps it consistent on create/update/delete.
+  Resolvers that query on a miss read `generation` first and only store the
+  result if no invalidation happened while the query was pending.
+  """
+
+  def __init__(self):
+    self._checkpoints: Dict[str, int] = {}  # uuid -> checkpoint id
+    self._runners: Dict[int, int] = {}  # rfid_uid -> runner id
+    self._generation = 0
+    self.checkpoint_hits = 0
+    self.checkpoint_misses = 0
+    self.runner_hits = 0
+    self.runner_misses = 0
+
+  @property
+  def generation(self) -> int:
+    """Bumped by every invalidation and clear."""
+    return self._generation
+
+  def get_checkpoint_id(self, uuid: str) -> int | None:
+    checkpoint_id = self._checkpoints.get(uuid)
+    if checkpoint_id is None:
+      self.checkpoint_misses += 1
+    else:
+      self.checkpoint_hits += 1
+    return checkpoint_id
+
+  def set_checkpoint(self, uuid: str, checkpoint_id: int) -> None:
+    self._checkpoints[uuid] = checkpoint_id
+
+  def invalidate_checkpoint(self, checkpoint_id: int) -> None:
+    self._generation += 1
+    for uuid in [u for u, i in self._checkpoints.items() if i == checkpoint_id]:
+      del self._checkpoints[uuid]
+
+  def get_runner_id(self, rfid_uid: int) -> int | None:
+    runner_id = self._runners.get(rfid_uid)
+    if runner_id is None:
+      self.runner_misses += 1
+    else:
+      self.runner_hits += 1
+    return runner_id
+
+  def set_runner(self, rfid_uid: int, runner_id: int) -> None:
+    self._runners[rfid_uid] = runner_id
+
+  def invalidate_runner(self, runner_id: int) -> None:
+    self._generation += 1
+    for rfid_uid in [r for r, i in self._runners.items() if i == runner_id]:
+      del self._runners[rfid_uid]
+
+  def clear(self) -> None:
+    self._generation += 1
+    self._checkpoints.clear()
+    self._runners.clear()
+
+  def stats(self) -> dict:
+    return {
+      "checkpoints": len(self._checkpoints),
+      "checkpoint_hits": self.checkpoint_hits,
+      "checkpoint_misses": self.checkpoint_misses,
+      "runners": len(self._runners),
+      "runner_hits": self.runner_hits,
+      "runner_misses": self.runner_misses,
+    }
+
+
+lookup_cache = LookupCache()
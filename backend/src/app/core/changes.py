@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncGenerator, Dict, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Change:
+  entity: str  # "race" | "runner" | "checkpoint" | "event"
+  action: str  # "created" | "updated" | "deleted"
+  id: int | None = None
+  race_id: int | None = None
+
+  def to_dict(self) -> dict:
+    return asdict(self)
+
+
+class ChangeFeed:
+  """In-process fan-out of create/update/delete notifications.
+
+  The CRUD layer publishes after each commit; every subscriber (one per open
+  /api/changes stream) gets its own bounded queue. A subscriber that falls
+  too far behind receives a "resync" change and should reload everything.
+
+  It also keeps a version counter per entity, bumped on every publish, that
+  list endpoints use to build their ETags.
+  """
+
+  def __init__(self, max_pending: int = 1000):
+    self._max_pending = max_pending
+    self._subscribers: Set[asyncio.Queue[Change | None]] = set()
+    self._versions: Dict[str, int] = {}
+
+  def publish(self, entity: str, action: str, id: int | None = None, race_id: int | None = None) -> None:
+    change = Change(entity, action, id, race_id)
+    self._versions[entity] = self._versions.get(entity, 0) + 1
+    for queue in self._subscribers:
+      try:
+        queue.put_nowait(change)
+      except asyncio.QueueFull:
+        logger.warning("Change feed subscriber is lagging, asking it to resync")
+        while not queue.empty():
+          queue.get_nowait()
+        queue.put_nowait(Change("all", "resync"))
+
+  def version(self, entity: str) -> int:
+    """Number of changes published for `entity` since startup."""
+    return self._versions.get(entity, 0)
+
+  @asynccontextmanager
+  async def subscribe(self) -> AsyncGenerator[asyncio.Queue[Change | None], None]:
+    """Register a subscriber queue; None in the queue means the feed closed."""
+    queue: asyncio.Queue[Change | None] = asyncio.Queue(maxsize=self._max_pending)
+    self._subscribers.add(queue)
+    try:
+      yield queue
+    finally:
+      self._subscribers.discard(queue)
+
+  def close(self) -> None:
+    """End all open subscriptions, e.g. on shutdown."""
+    for queue in self._subscribers:
+      while not queue.empty():
+        queue.get_nowait()
+      queue.put_nowait(None)
+
+
+change_feed = ChangeFeed()
@@ -1,12 +1,16 @@
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy import text
+from sqlalchemy import event, make_url, text
 
 from contextlib import asynccontextmanager
 import logging
+import time
 from typing import AsyncGenerator, Optional
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
+from app.core.config import config
+from app.core.metrics import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,12 +30,18 @@ class Base(DeclarativeBase):
 class DatabaseManager:
 	"""Manages database connections and sessions."""
 	
-	def __init__(self):
+	def __init__(self, database_url: Optional[str] = None, sqlite_profile: Optional[str] = None):
+		self._database_url = database_url
+		self._sqlite_profile = sqlite_profile or config.SQLITE_PROFILE
 		self._engine: Optional[AsyncEngine] = None
 		self._session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 	
 	def _get_database_url(self) -> str:
 		"""Construct database URL from settings."""
+		if self._database_url:
+			return self._database_url
+		if config.DATABASE_URL:
+			return config.DATABASE_URL
 		from pathlib import Path
 		# Create db directory if it doesn't exist
 		db_dir = Path(__file__).parent.parent.parent.parent / "db"
@@ -39,23 +49,37 @@ class DatabaseManager:
 		db_path = db_dir / "database.db"
 		return f"sqlite+aiosqlite:///{db_path}"
 
+	@property
+	def is_sqlite(self) -> bool:
+		return make_url(self._get_database_url()).get_backend_name() == "sqlite"
+
 	async def initialize(self) -> None:
 		"""Initialize the database engine and session factory."""
 		if self._engine is not None:
 			logger.debug("Database engine already initialized")
 			return
 		
-		database_url = self._get_database_url()
+		database_url = make_url(self._get_database_url())
 
-		logger.debug("Initializing SQLite in-memory database")
+		logger.debug(f"Initializing database: {database_url.render_as_string(hide_password=True)}")
 
 		engine_kwargs = {
 			"echo": False,
 		}
 		
-		engine_kwargs["connect_args"] = {"check_same_thread": False}
+		if self.is_sqlite:
+			engine_kwargs["connect_args"] = {"check_same_thread": False}
+		else:
+			engine_kwargs["pool_size"] = config.DB_POOL_SIZE
+			engine_kwargs["max_overflow"] = config.DB_MAX_OVERFLOW
+			engine_kwargs["pool_recycle"] = config.DB_POOL_RECYCLE
+			engine_kwargs["pool_pre_ping"] = True
 		
 		self._engine = create_async_engine(database_url, **engine_kwargs)
+		if self.is_sqlite:
+			event.listen(self._engine.sync_engine, "connect", self._apply_sqlite_pragmas)
+		if metrics.enabled:
+			event.listen(self._engine.sync_engine, "before_cursor_execute", metrics.count_query)
 		
 		self._session_factory = async_sessionmaker[AsyncSession](
 			bind=self._engine,
@@ -64,6 +88,14 @@ class DatabaseManager:
 		
 		logger.info("Database engine initialized successfully")
 	
+	def _apply_sqlite_pragmas(self, dbapi_connection, connection_record) -> None:
+		"""Apply the configured SQLite performance profile to a new connection."""
+		pragmas = config.SQLITE_PROFILES[self._sqlite_profile]
+		cursor = dbapi_connection.cursor()
+		for name, value in pragmas.items():
+			cursor.execute(f"PRAGMA {name}={value}")
+		cursor.close()
+	
 	async def close(self) -> None:
 		"""Close the database engine."""
 		if self._engine:
@@ -80,14 +112,18 @@ class DatabaseManager:
 			await self.initialize()
 		
 		logger.debug("Creating new database session")
-		async with self._session_factory() as session:
-			try:
-				yield session
-				logger.debug("Database session completed successfully")
-			except Exception as e:
-				logger.error(f"Database session error: {e}")
-				await session.rollback()
-				raise
+		started = time.perf_counter()
+		try:
+			async with self._session_factory() as session:
+				try:
+					yield session
+					logger.debug("Database session completed successfully")
+				except Exception as e:
+					logger.error(f"Database session error: {e}")
+					await session.rollback()
+					raise
+		finally:
+			metrics.observe_session(time.perf_counter() - started)
 	
 	async def health_check(self) -> bool:
 		"""Check if the database connection is healthy."""
@@ -108,14 +144,16 @@ class DatabaseManager:
 			return False
 	
 	async def create_tables(self) -> None:
-		"""Create all database tables."""
+		"""Create or upgrade all database tables by applying pending migrations."""
+		from app.core.migrations import upgrade
+
 		if not self._engine:
 			await self.initialize()
 		
-		logger.info("Creating database tables...")
+		logger.info("Migrating database schema...")
 		async with self._engine.begin() as conn:
-			await conn.run_sync(Base.metadata.create_all)
-		logger.info("Database tables created successfully")
+			version = await conn.run_sync(upgrade)
+		logger.info(f"Database schema is at version {version}")
 
 
 from app.models import *
@@ -0,0 +1,35 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List
+
+
+class DeviceStatsStore:
+  """Latest self-reported stats of each checkpoint device, kept in memory.
+
+  Devices report periodically, so losing this on restart only costs one
+  report interval. The oldest device is dropped beyond `max_devices`.
+  """
+
+  def __init__(self, max_devices: int = 1000):
+    self._max_devices = max_devices
+    self._reports: "OrderedDict[str, dict]" = OrderedDict()  # checkpoint uuid -> report
+
+  def record(self, checkpoint_id: str, stats: Dict[str, Any]) -> dict:
+    report = {"checkpoint_id": checkpoint_id, "received_at": datetime.now(), "stats": stats}
+    self._reports[checkpoint_id] = report
+    self._reports.move_to_end(checkpoint_id)
+    while len(self._reports) > self._max_devices:
+      self._reports.popitem(last=False)
+    return report
+
+  def get(self, checkpoint_id: str) -> dict | None:
+    return self._reports.get(checkpoint_id)
+
+  def all(self) -> List[dict]:
+    return list(self._reports.values())
+
+  def clear(self) -> None:
+    self._reports.clear()
+
+
+device_stats = DeviceStatsStore()
@@ -0,0 +1,30 @@
+import hashlib
+import secrets
+
+from fastapi import Request, Response, status
+
+from app.core.changes import change_feed
+
+# Collection versions restart at zero with the process, so tags carry a per-process token too.
+_INSTANCE = secrets.token_hex(4)
+
+
+def collection_etag(request: Request, *entities: str) -> str:
+  """Strong ETag of a list response, from the versions of the collections it reads and its query."""
+  versions = ".".join(str(change_feed.version(entity)) for entity in entities)
+  query = hashlib.blake2s(request.url.query.encode(), digest_size=6).hexdigest()
+  return f'"{_INSTANCE}-{versions}-{query}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+  """Whether the request's If-None-Match matches `etag`."""
+  header = request.headers.get("if-none-match")
+  if not header:
+    return False
+  if header.strip() == "*":
+    return True
+  return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+  return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
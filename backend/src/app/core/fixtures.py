@@ -0,0 +1,221 @@
+"""Deterministic synthetic seasons for benchmarks, tests and local development.
+
+  uv run python -m app.core.fixtures --seed 1 --runners 10000 --checkpoints 500 --races 40
+
+seeds the configured database (DATABASE_URL or db/database.db).
+"""
+import argparse
+import asyncio
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import lookup_cache
+from app.core.changes import change_feed
+from app.core.race_index import race_index
+from app.core.results import results_store
+from app.core.roster import roster_store
+from app.models.checkpoint import Checkpoint
+from app.models.event import Event
+from app.models.race import Race, RaceCheckpoint, RaceRunner
+from app.models.runner import Runner
+
+FIRST_NAMES = ["Anna", "Jan", "Maria", "Piotr", "Kasia", "Tomek", "Ola", "Marek", "Ewa", "Adam", "Zofia", "Pawel"]
+SURNAMES = ["Nowak", "Kowalski", "Wisniewski", "Wojcik", "Kaminski", "Lewandowski", "Zielinski", "Szymanski"]
+EVENT_COLUMNS = ("runner_id", "checkpoint_id", "race_id", "timestamp")  # table order, as the driver gets them
+LOCATIONS = ["Kampinos", "Tatry", "Bieszczady", "Mazury", "Beskidy", "Roztocze", "Karkonosze", "Pieniny"]
+
+
+@dataclass(frozen=True)
+class SeasonSpec:
+  """Shape of a generated season; the same spec and seed always give the same data."""
+  seed: int = 0
+  runners: int = 10_000
+  checkpoints: int = 500
+  races: int = 40
+  runners_per_race: int = 2_500
+  min_controls: int = 15
+  max_controls: int = 30
+  first_race: datetime = datetime(2026, 3, 7, 10, 0)
+  days_between_races: int = 7
+  active_races: int = 1  # the latest races are active, the rest finished
+  dnf_rate: float = 0.05  # runners who stop punching somewhere on the course
+
+
+@dataclass
+class SeasonSummary:
+  races: int
+  runners: int
+  checkpoints: int
+  race_runners: int
+  race_checkpoints: int
+  events: int
+  seconds: float
+
+  @property
+  def rows(self) -> int:
+    return self.races + self.runners + self.checkpoints + self.race_runners + self.race_checkpoints + self.events
+
+
+async def seed_season(db: AsyncSession, spec: SeasonSpec = SeasonSpec(), chunk_size: int = 50_000) -> SeasonSummary:
+  """Insert a whole season with bulk INSERTs: races, runners, checkpoints, memberships and punches.
+
+  Rows go straight to the tables, so the in-memory indexes and caches are
+  reset afterwards and list ETags are bumped.
+  """
+  started = time.perf_counter()
+  rng = random.Random(spec.seed)
+
+  checkpoint_ids = await _insert_ids(db, Checkpoint, "uuid", [
+    {"uuid": f"season{spec.seed}-cp{i:05d}", "name": f"control {i}"}
+    for i in range(1, spec.checkpoints + 1)
+  ])
+  rfid_uids = rng.sample(range(1 << 24, 1 << 40), spec.runners)
+  runner_ids = await _insert_ids(db, Runner, "rfid_uid", [
+    {"rfid_uid": rfid, "name": rng.choice(FIRST_NAMES), "surname": rng.choice(SURNAMES)}
+    for rfid in rfid_uids
+  ])
+  race_dates = [spec.first_race + timedelta(days=spec.days_between_races * i) for i in range(spec.races)]
+  race_ids = (await db.execute(insert(Race).returning(Race.id, sort_by_parameter_order=True), [
+    {
+      "name": f"season {spec.seed} race {i + 1}",
+      "date": date,
+      "location": rng.choice(LOCATIONS),
+      "is_active": i >= spec.races - spec.active_races,
+    }
+    for i, date in enumerate(race_dates)
+  ])).scalars().all()
+
+  # Punches go straight to the driver as tuples; building the event indexes
+  # once at the end is several times faster than updating them per row
+  to_db = _bind_processor(db, Event.__table__.c.timestamp)
+  event_indexes = list(Event.__table__.indexes)
+  await db.run_sync(lambda session: [index.drop(session.connection()) for index in event_indexes])
+
+  race_checkpoints = []
+  race_runners = []
+  events = []
+  event_count = 0
+  for race_id, date in zip(race_ids, race_dates):
+    course = rng.sample(checkpoint_ids, rng.randint(spec.min_controls, min(spec.max_controls, len(checkpoint_ids))))
+    legs = [rng.uniform(120, 600) for _ in course]  # sec for a runner of average pace
+    race_checkpoints.extend(
+      {"race_id": race_id, "checkpoint_id": c, "order": order} for order, c in enumerate(course, start=1)
+    )
+
+    for runner_id in rng.sample(runner_ids, min(spec.runners_per_race, len(runner_ids))):
+      race_runners.append({"race_id": race_id, "runner_id": runner_id})
+      controls = len(course)
+      if rng.random() < spec.dnf_rate:
+        controls = rng.randrange(controls)
+      pace = rng.lognormvariate(0, 0.25)
+      elapsed = rng.uniform(0, 3600)  # start window
+      for checkpoint_id, leg in zip(course[:controls], legs):
+        elapsed += leg * pace * rng.uniform(0.9, 1.1)
+        events.append((runner_id, checkpoint_id, race_id, to_db(date + timedelta(seconds=elapsed))))
+
+      if len(events) >= chunk_size:
+        event_count += await _insert_tuples(db, Event.__table__, EVENT_COLUMNS, events)
+        events = []
+
+  event_count += await _insert_tuples(db, Event.__table__, EVENT_COLUMNS, events)
+  await _insert_chunk(db, RaceCheckpoint, race_checkpoints)
+  await _insert_chunk(db, RaceRunner, race_runners)
+  await db.run_sync(lambda session: [index.create(session.connection()) for index in event_indexes])
+  await db.commit()
+
+  lookup_cache.clear()
+  race_index.invalidate()
+  results_store.clear()
+  roster_store.clear()
+  for entity in ("checkpoint", "runner", "race", "event"):
+    change_feed.publish(entity, "created")
+
+  return SeasonSummary(
+    races=len(race_ids),
+    runners=len(runner_ids),
+    checkpoints=len(checkpoint_ids),
+    race_runners=len(race_runners),
+    race_checkpoints=len(race_checkpoints),
+    events=event_count,
+    seconds=round(time.perf_counter() - started, 2),
+  )
+
+
+async def _insert_ids(db: AsyncSession, model, key: str, rows: List[dict]) -> List[int]:
+  """Insert rows and return their IDs in order, looked up by the unique `key` column.
+
+  One SELECT afterwards is much cheaper than INSERT ... RETURNING, which
+  aiosqlite hands back a row at a time.
+  """
+  await _insert_chunk(db, model, rows)
+  column = getattr(model, key)
+  ids = dict((await db.execute(select(column, model.id))).all())
+  return [ids[row[key]] for row in rows]
+
+
+def _bind_processor(db: AsyncSession, column) -> Callable[[Any], Any]:
+  """How the dialect turns a Python value of `column` into a driver value (identity if unchanged)."""
+  dialect = db.get_bind().dialect
+  return column.type.dialect_impl(dialect).bind_processor(dialect) or (lambda value: value)
+
+
+async def _insert_tuples(db: AsyncSession, table, columns: Tuple[str, ...], rows: List[tuple]) -> int:
+  """executemany of driver-ready tuples, skipping SQLAlchemy's per-row parameter processing."""
+  if not rows:
+    return 0
+  connection = await db.connection()
+  statement = insert(table).compile(dialect=connection.dialect, column_keys=list(columns))
+  if statement.positional and tuple(statement.positiontup) == columns:
+    await connection.exec_driver_sql(statement.string, rows)
+  else:
+    # Named paramstyle drivers (e.g. psycopg)
+    await connection.exec_driver_sql(statement.string, [dict(zip(columns, row)) for row in rows])
+  return len(rows)
+
+
+async def _insert_chunk(db: AsyncSession, model, rows: List[dict]) -> int:
+  """Core executemany INSERT; skips the ORM bulk machinery."""
+  if rows:
+    await db.execute(insert(model.__table__), rows)
+  return len(rows)
+
+
+async def _main(spec: SeasonSpec, database_url: str | None) -> SeasonSummary:
+  from app.core.db import DatabaseManager
+
+  db = DatabaseManager(database_url)
+  await db.create_tables()
+  try:
+    async with db.get_session() as session:
+      return await seed_season(session, spec)
+  finally:
+    await db.close()
+
+
+if __name__ == "__main__":
+  defaults = SeasonSpec()
+  parser = argparse.ArgumentParser(description="Seed the database with a synthetic season")
+  parser.add_argument("--seed", type=int, default=defaults.seed)
+  parser.add_argument("--runners", type=int, default=defaults.runners)
+  parser.add_argument("--checkpoints", type=int, default=defaults.checkpoints)
+  parser.add_argument("--races", type=int, default=defaults.races)
+  parser.add_argument("--runners-per-race", type=int, default=defaults.runners_per_race)
+  parser.add_argument("--active-races", type=int, default=defaults.active_races)
+  parser.add_argument("--database-url", help="Defaults to DATABASE_URL or db/database.db")
+  args = parser.parse_args()
+
+  spec = SeasonSpec(
+    seed=args.seed,
+    runners=args.runners,
+    checkpoints=args.checkpoints,
+    races=args.races,
+    runners_per_race=args.runners_per_race,
+    active_races=args.active_races,
+  )
+  print(asdict(asyncio.run(_main(spec, args.database_url))))
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import List, Tuple
+
+from app.core.config import config
+from app.core.db import DatabaseManager, db_manager
+from app.core.metrics import metrics
+from app.crud.event import create_event, create_events
+from app.models.event import Event
+from app.schemas.event import EventCreate
+
+logger = logging.getLogger(__name__)
+
+
+class EventIngestQueue:
+  """Write-behind queue that groups incoming scans into batched transactions.
+
+  Callers await `submit` and are acknowledged once the batch holding their scan
+  is committed, so the response still reflects a durable write. That holds
+  for PostgreSQL and the default "durable" SQLite profile; under "performance"
+  a power loss can drop acknowledged scans.
+  """
+
+  def __init__(
+    self,
+    db: DatabaseManager = db_manager,
+    max_batch_size: int = config.INGEST_MAX_BATCH_SIZE,
+    max_delay_ms: float = config.INGEST_MAX_DELAY_MS,
+  ):
+    self._db = db
+    self._max_batch_size = max_batch_size
+    self._max_delay = max_delay_ms / 1000
+    self._queue: asyncio.Queue[Tuple[EventCreate, asyncio.Future] | None] | None = None
+    self._worker: asyncio.Task | None = None
+
+  @property
+  def depth(self) -> int:
+    """Number of scans waiting to be written."""
+    return self._queue.qsize() if self._queue is not None else 0
+
+  async def start(self) -> None:
+    """Start the background writer."""
+    if self._worker is not None:
+      return
+    self._queue = asyncio.Queue()
+    self._worker = asyncio.create_task(self._run())
+    logger.info("Event ingest queue started")
+
+  async def stop(self) -> None:
+    """Flush pending scans and stop the background writer."""
+    if self._worker is None:
+      return
+    await self._queue.put(None)
+    await self._worker
+    self._worker = None
+    self._queue = None
+    logger.info("Event ingest queue stopped")
+
+  async def submit(self, event_in: EventCreate) -> List[Event]:
+    """Queue a scan and wait until its events are committed."""
+    if self._worker is None:
+      async with self._db.get_session() as db:
+        return await create_event(db, event_in)
+
+    future = asyncio.get_running_loop().create_future()
+    await self._queue.put((event_in, future))
+    return await future
+
+  async def _run(self) -> None:
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+      item = await self._queue.get()
+      if item is None:
+        break
+
+      batch = [item]
+      deadline = loop.time() + self._max_delay
+      while len(batch) < self._max_batch_size:
+        timeout = deadline - loop.time()
+        try:
+          item = self._queue.get_nowait() if timeout <= 0 else await asyncio.wait_for(self._queue.get(), timeout)
+        except (asyncio.QueueEmpty, TimeoutError):
+          break
+        if item is None:
+          stopping = True
+          break
+        batch.append(item)
+
+      await self._flush(batch)
+
+  async def _flush(self, batch: List[Tuple[EventCreate, asyncio.Future]]) -> None:
+    logger.debug(f"Writing batch of {len(batch)} scans")
+    try:
+      async with self._db.get_session() as db:
+        results = await create_events(db, [event_in for event_in, _ in batch])
+    except Exception as e:
+      logger.error(f"Failed to write batch of {len(batch)} scans: {e}")
+      for _, future in batch:
+        if not future.done():
+          future.set_exception(e)
+      return
+
+    for (_, future), result in zip(batch, results):
+      if future.done():
+        continue
+      if isinstance(result, Exception):
+        future.set_exception(result)
+      else:
+        future.set_result(result)
+
+
+ingest_queue = EventIngestQueue()
+metrics.register_gauge("ingest_queue_depth", "Scans waiting to be written.", lambda: ingest_queue.depth)
@@ -0,0 +1,183 @@
+"""Request, database and ingest metrics served as Prometheus text at GET /api/metrics.
+
+Everything is updated from the event loop thread with plain ints and floats,
+so there are no locks; a scrape reads the values as they are at that moment.
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from app.core.config import config
+
+# sec
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+UNMATCHED_ROUTE = "unmatched"  # 404s are not labelled by path, which would be unbounded
+
+
+class Histogram:
+  """Fixed-bucket histogram; `counts[i]` holds observations in (buckets[i-1], buckets[i]], the last one +Inf."""
+
+  def __init__(self, buckets: Sequence[float]):
+    self.buckets = tuple(buckets)
+    self.counts = [0] * (len(self.buckets) + 1)
+    self.sum = 0.0
+
+  def observe(self, value: float) -> None:
+    self.counts[bisect_left(self.buckets, value)] += 1
+    self.sum += value
+
+  @property
+  def count(self) -> int:
+    return sum(self.counts)
+
+
+class Metrics:
+  """Counters and histograms for the API process.
+
+  `MetricsMiddleware` reports every HTTP request, `DatabaseManager` every
+  session and statement. Statements are attributed to the request whose task
+  ran them; the ones the ingest queue's writer runs for batched scans are
+  only counted in the totals.
+  """
+
+  def __init__(self, enabled: bool = True):
+    self.enabled = enabled
+    self.in_flight = 0
+    self.queries_total = 0
+    self.requests: Dict[Tuple[str, str, int], int] = {}  # (method, route, status) -> count
+    self.latency: Dict[Tuple[str, str], Histogram] = {}  # (method, route)
+    self.queries: Dict[Tuple[str, str], Histogram] = {}  # (method, route), statements per request
+    self.sessions = Histogram(LATENCY_BUCKETS)
+    self._gauges: List[Tuple[str, str, Callable[[], float]]] = []
+    self._request_queries: ContextVar[List[int] | None] = ContextVar("request_queries", default=None)
+
+  def register_gauge(self, name: str, help: str, read: Callable[[], float]) -> None:
+    """A value read at scrape time, e.g. a queue depth."""
+    self._gauges.append((name, help, read))
+
+  def request_started(self) -> object:
+    """Count a request in flight and start counting its statements; pass the result to `request_finished`."""
+    self.in_flight += 1
+    return self._request_queries.set([0])
+
+  def request_finished(self, method: str, route: str, status: int, seconds: float, token: object) -> None:
+    self.in_flight -= 1
+    queries = self._request_queries.get()[0]
+    self._request_queries.reset(token)
+
+    key = (method, route, status)
+    self.requests[key] = self.requests.get(key, 0) + 1
+    key = (method, route)
+    latency = self.latency.get(key)
+    if latency is None:
+      latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+      self.queries[key] = Histogram(QUERY_BUCKETS)
+    latency.observe(seconds)
+    self.queries[key].observe(queries)
+
+  def observe_session(self, seconds: float) -> None:
+    if self.enabled:
+      self.sessions.observe(seconds)
+
+  def count_query(self, *args) -> None:
+    """SQLAlchemy before_cursor_execute listener."""
+    self.queries_total += 1
+    counter = self._request_queries.get()
+    if counter is not None:
+      counter[0] += 1
+
+  def clear(self) -> None:
+    self.requests.clear()
+    self.latency.clear()
+    self.queries.clear()
+    self.sessions = Histogram(LATENCY_BUCKETS)
+    self.queries_total = 0
+
+  def render(self) -> str:
+    """Prometheus text exposition format 0.0.4."""
+    lines = [
+      "# HELP http_requests_in_flight Requests being served.",
+      "# TYPE http_requests_in_flight gauge",
+      f"http_requests_in_flight {self.in_flight}",
+      "# HELP http_requests_total Requests served, by route template and status code.",
+      "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), count in sorted(self.requests.items()):
+      lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+    _render_histograms(lines, "http_request_duration_seconds", "Request latency by route template.", self.latency)
+    _render_histograms(lines, "http_request_queries", "SQL statements run per request.", self.queries)
+    _render_histograms(lines, "db_session_duration_seconds", "Time a database session was held.", {(): self.sessions})
+
+    lines += [
+      "# HELP db_queries_total SQL statements executed.",
+      "# TYPE db_queries_total counter",
+      f"db_queries_total {self.queries_total}",
+    ]
+    for name, help, read in self._gauges:
+      lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {read()}"]
+    return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+  return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histograms(lines: List[str], name: str, help: str, histograms: Dict[tuple, Histogram]) -> None:
+  lines += [f"# HELP {name} {help}", f"# TYPE {name} histogram"]
+  for key, histogram in sorted(histograms.items()):
+    labels = f'method="{key[0]}",route="{_escape(key[1])}",' if key else ""
+    cumulative = 0
+    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+      cumulative += count
+      le = "+Inf" if bound == float("inf") else f"{bound:g}"
+      lines.append(f'{name}_bucket{{{labels}le="{le}"}} {cumulative}')
+    labels = "{" + labels.rstrip(",") + "}" if labels else ""
+    lines.append(f"{name}_sum{labels} {histogram.sum:g}")
+    lines.append(f"{name}_count{labels} {cumulative}")
+
+
+class MetricsMiddleware:
+  """Pure ASGI middleware timing every HTTP request, labelled by its route template.
+
+  Unlike BaseHTTPMiddleware it adds no task or stream per request, only a
+  couple of dict updates once the response is sent.
+  """
+
+  def __init__(self, app, registry: Metrics | None = None):
+    self.app = app
+    self.registry = registry or metrics
+
+  async def __call__(self, scope, receive, send):
+    registry = self.registry
+    if scope["type"] != "http" or not registry.enabled:
+      await self.app(scope, receive, send)
+      return
+
+    status = 500
+
+    async def send_with_status(message):
+      nonlocal status
+      if message["type"] == "http.response.start":
+        status = message["status"]
+      await send(message)
+
+    token = registry.request_started()
+    started = time.perf_counter()
+    try:
+      await self.app(scope, receive, send_with_status)
+    finally:
+      registry.request_finished(scope["method"], route_template(scope), status, time.perf_counter() - started, token)
+
+
+def route_template(scope) -> str:
+  """Path template of the route that served the request, e.g. /api/races/{race_id}/runners."""
+  # FastAPI records the route as seen through every include_router prefix;
+  # scope["route"] alone only holds the path within its own router
+  route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+  return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+metrics = Metrics(enabled=config.METRICS_ENABLED)
@@ -0,0 +1,185 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Sequence
+
+from sqlalchemy import (
+  BigInteger, Boolean, Column, Connection, DateTime, ForeignKey, Integer, MetaData, String, Table, inspect, select, text,
+)
+
+logger = logging.getLogger(__name__)
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+  "schema_version",
+  _version_metadata,
+  Column("version", Integer, nullable=False),
+)
+
+# The baseline schema, frozen: migration 1 creates exactly this, whatever the
+# models look like later. rfid_uid is BIGINT, which SQLite stores like the
+# baseline's INTEGER and every PostgreSQL database was created with.
+_baseline_metadata = MetaData()
+
+Table(
+  "runners", _baseline_metadata,
+  Column("id", Integer, primary_key=True),
+  Column("rfid_uid", BigInteger, nullable=False),
+  Column("name", String(30), nullable=False),
+  Column("surname", String(30), nullable=False),
+)
+Table(
+  "checkpoints", _baseline_metadata,
+  Column("id", Integer, primary_key=True),
+  Column("uuid", String(36), nullable=False),
+  Column("name", String(30), nullable=False),
+)
+Table(
+  "races", _baseline_metadata,
+  Column("id", Integer, primary_key=True),
+  Column("name", String(30), nullable=False),
+  Column("date", DateTime, nullable=False),
+  Column("location", String(30), nullable=False),
+  Column("is_active", Boolean, nullable=False),
+)
+Table(
+  "race_checkpoints", _baseline_metadata,
+  Column("race_id", ForeignKey("races.id"), primary_key=True, autoincrement=False),
+  Column("checkpoint_id", ForeignKey("checkpoints.id"), primary_key=True, autoincrement=False),
+  Column("order", Integer, nullable=False),
+)
+Table(
+  "race_runners", _baseline_metadata,
+  Column("race_id", ForeignKey("races.id"), primary_key=True, autoincrement=False),
+  Column("runner_id", ForeignKey("runners.id"), primary_key=True, autoincrement=False),
+)
+Table(
+  "events", _baseline_metadata,
+  Column("id", Integer, primary_key=True),
+  Column("runner_id", ForeignKey("runners.id", ondelete="CASCADE"), nullable=False),
+  Column("checkpoint_id", ForeignKey("checkpoints.id", ondelete="CASCADE"), nullable=False),
+  Column("race_id", ForeignKey("races.id", ondelete="CASCADE"), nullable=False),
+  Column("timestamp", DateTime, nullable=False),
+)
+
+# (index, table, column) of lookups the baseline never kept unique
+UNIQUE_LOOKUPS = [
+  ("ix_runners_rfid_uid", "runners", "rfid_uid"),
+  ("ix_checkpoints_uuid", "checkpoints", "uuid"),
+]
+
+
+@dataclass(frozen=True)
+class Migration:
+  """A single schema upgrade step. `upgrade` must be safe to re-run."""
+  version: int
+  description: str
+  upgrade: Callable[[Connection], None]
+
+
+def _create_index(conn: Connection, name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+  kind = "UNIQUE INDEX" if unique else "INDEX"
+  conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def _duplicates(conn: Connection, table: str, column: str) -> list[tuple]:
+  """(value, count) of every value of `column` held by more than one row."""
+  return conn.execute(text(
+    f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column} HAVING COUNT(*) > 1 ORDER BY {column}"
+  )).all()
+
+
+def _log_duplicates(table: str, column: str, duplicates: list[tuple]) -> None:
+  shown = ", ".join(f"{value!r} ({count} rows)" for value, count in duplicates[:20])
+  more = f" and {len(duplicates) - 20} more" if len(duplicates) > 20 else ""
+  logger.error(
+    f"{table}.{column} is not unique: {shown}{more}. Lookups use a plain index until the duplicates are "
+    f"merged or deleted; the unique index is created on the next start after that."
+  )
+
+
+def _create_unique_lookup(conn: Connection, name: str, table: str, column: str) -> None:
+  """Unique index on a lookup column, or a plain one if existing rows are not unique yet.
+
+  Databases from before migrations may hold duplicates, and CREATE UNIQUE
+  INDEX would then fail and keep the backend from starting.
+  """
+  duplicates = _duplicates(conn, table, column)
+  if duplicates:
+    _log_duplicates(table, column, duplicates)
+  _create_index(conn, name, table, [column], unique=not duplicates)
+
+
+def ensure_unique_lookups(conn: Connection) -> None:
+  """Turn plain lookup indexes left by migration 2 into unique ones once the duplicates are gone."""
+  for name, table, column in UNIQUE_LOOKUPS:
+    index = next((i for i in inspect(conn).get_indexes(table) if i["name"] == name), None)
+    if index is None or index["unique"]:
+      continue
+    duplicates = _duplicates(conn, table, column)
+    if duplicates:
+      _log_duplicates(table, column, duplicates)
+      continue
+    logger.info(f"{table}.{column} is unique now, creating the unique index")
+    conn.execute(text(f"DROP INDEX {name}"))
+    _create_index(conn, name, table, [column], unique=True)
+
+
+def _initial_schema(conn: Connection) -> None:
+  _baseline_metadata.create_all(conn)
+
+
+def _hot_lookup_indexes(conn: Connection) -> None:
+  for name, table, column in UNIQUE_LOOKUPS:
+    _create_unique_lookup(conn, name, table, column)
+  _create_index(conn, "ix_races_is_active", "races", ["is_active"])
+  _create_index(conn, "ix_events_race_runner_checkpoint", "events", ["race_id", "runner_id", "checkpoint_id"])
+  _create_index(conn, "ix_events_runner_id", "events", ["runner_id"])
+
+
+def _scan_ids(conn: Connection) -> None:
+  columns = {c["name"] for c in inspect(conn).get_columns("events")}
+  if "scan_id" not in columns:
+    # Existing events keep a NULL scan_id; NULLs never collide in the unique index
+    conn.execute(text("ALTER TABLE events ADD COLUMN scan_id VARCHAR(32)"))
+  _create_index(conn, "ux_events_scan_race", "events", ["scan_id", "race_id"], unique=True)
+
+
+def _race_event_order(conn: Connection) -> None:
+  _create_index(conn, "ix_events_race_id", "events", ["race_id", "id"])
+
+
+MIGRATIONS: List[Migration] = [
+  Migration(1, "initial schema", _initial_schema),
+  Migration(2, "indexes on hot lookup columns", _hot_lookup_indexes),
+  Migration(3, "scan ids for idempotent event ingestion", _scan_ids),
+  Migration(4, "index for events of a race in id order", _race_event_order),
+]
+
+
+def get_version(conn: Connection) -> int:
+  """Current schema version, 0 for a database that was never migrated."""
+  if not inspect(conn).has_table(schema_version.name):
+    return 0
+  return conn.execute(select(schema_version.c.version)).scalar() or 0
+
+
+def _set_version(conn: Connection, version: int) -> None:
+  conn.execute(schema_version.delete())
+  conn.execute(schema_version.insert().values(version=version))
+
+
+def upgrade(conn: Connection) -> int:
+  """Apply all pending migrations in order and return the resulting version."""
+  _version_metadata.create_all(conn)
+  version = started_at = get_version(conn)
+  for migration in MIGRATIONS:
+    if migration.version <= version:
+      continue
+    logger.info(f"Applying migration {migration.version}: {migration.description}")
+    migration.upgrade(conn)
+    _set_version(conn, migration.version)
+    version = migration.version
+  if started_at >= 2:  # otherwise migration 2 has just checked
+    ensure_unique_lookups(conn)
+  return version
@@ -0,0 +1,194 @@
+from typing import Dict, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.race import Race, RaceCheckpoint, RaceRunner
+
+_EMPTY: frozenset = frozenset()
+
+
+class ActiveRaceIndex:
+  """In-memory participation index of active races.
+
+  Answers "which active races contain this checkpoint and this runner" with
+  two dict lookups and a set intersection over the (few) active races, instead
+  of a races x race_checkpoints x race_runners join per scan. It is loaded
+  lazily and kept up to date by the race, checkpoint and runner CRUD functions.
+  """
+
+  def __init__(self):
+    self._loaded = False
+    self._version = 0
+    self._races: Dict[int, Tuple[Set[int], Set[int]]] = {}  # race_id -> (checkpoint ids, runner ids)
+    self._by_checkpoint: Dict[int, Set[int]] = {}  # checkpoint_id -> active race ids
+    self._by_runner: Dict[int, Set[int]] = {}  # runner_id -> active race ids
+
+  @property
+  def version(self) -> int:
+    """Bumped by every membership or active-flag change."""
+    return self._version
+
+  async def ensure_loaded(self, db: AsyncSession) -> None:
+    """Load all active races on first use."""
+    if self._loaded:
+      return
+
+    version = self._version
+    active = select(Race.id).where(Race.is_active == True)
+    race_ids = (await db.execute(active)).scalars().all()
+    checkpoints = (await db.execute(
+      select(RaceCheckpoint.race_id, RaceCheckpoint.checkpoint_id).where(RaceCheckpoint.race_id.in_(active))
+    )).all()
+    runners = (await db.execute(
+      select(RaceRunner.race_id, RaceRunner.runner_id).where(RaceRunner.race_id.in_(active))
+    )).all()
+
+    self._reset()
+    for race_id in race_ids:
+      self._races[race_id] = (set(), set())
+    for race_id, checkpoint_id in checkpoints:
+      self._add(race_id, checkpoint_id, None)
+    for race_id, runner_id in runners:
+      self._add(race_id, None, runner_id)
+
+    # A mutation raced with the load; keep what we have but reload next time.
+    self._loaded = version == self._version
+
+  async def races_for(self, db: AsyncSession, checkpoint_id: int, runner_id: int) -> Set[int]:
+    """IDs of active races that contain both the checkpoint and the runner."""
+    await self.ensure_loaded(db)
+    return self._by_checkpoint.get(checkpoint_id, _EMPTY) & self._by_runner.get(runner_id, _EMPTY)
+
+  async def refresh_race(self, db: AsyncSession, race_id: int) -> None:
+    """Reload a single race, e.g. after its is_active flag changed.
+
+    The old entry stays in place while the race is queried, so scans keep
+    resolving, and is swapped for the new one without awaiting in between.
+    """
+    self._version += 1
+    if not self._loaded:
+      return
+
+    version = self._version
+    is_active = (await db.execute(select(Race.is_active).where(Race.id == race_id))).scalar()
+    checkpoints = runners = ()
+    if is_active:
+      checkpoints = (await db.execute(
+        select(RaceCheckpoint.checkpoint_id).where(RaceCheckpoint.race_id == race_id)
+      )).scalars().all()
+      runners = (await db.execute(
+        select(RaceRunner.runner_id).where(RaceRunner.race_id == race_id)
+      )).scalars().all()
+
+    if version != self._version:
+      # A membership change raced with the queries and may be missing from
+      # their results; reload everything on next use.
+      self.invalidate()
+      return
+
+    self._remove(race_id)
+    if is_active:
+      self._races[race_id] = (set(), set())
+      for checkpoint_id in checkpoints:
+        self._add(race_id, checkpoint_id, None)
+      for runner_id in runners:
+        self._add(race_id, None, runner_id)
+
+  def add_race(self, race_id: int, is_active: bool) -> None:
+    """Register a newly created race."""
+    self._version += 1
+    if is_active and self._loaded:
+      self._races.setdefault(race_id, (set(), set()))
+
+  def remove_race(self, race_id: int) -> None:
+    self._version += 1
+    self._remove(race_id)
+
+  def add_checkpoint(self, race_id: int, checkpoint_id: int) -> None:
+    self._version += 1
+    self._add(race_id, checkpoint_id, None)
+
+  def remove_checkpoint(self, race_id: int, checkpoint_id: int) -> None:
+    self._version += 1
+    entry = self._races.get(race_id)
+    if entry is not None:
+      entry[0].discard(checkpoint_id)
+      self._discard(self._by_checkpoint, checkpoint_id, race_id)
+
+  def set_checkpoints(self, race_id: int, checkpoint_ids: list[int]) -> None:
+    """Replace the checkpoints of a race."""
+    self._version += 1
+    entry = self._races.get(race_id)
+    if entry is None:
+      return
+    for checkpoint_id in list(entry[0]):
+      self.remove_checkpoint(race_id, checkpoint_id)
+    for checkpoint_id in checkpoint_ids:
+      self._add(race_id, checkpoint_id, None)
+
+  def add_runner(self, race_id: int, runner_id: int) -> None:
+    self._version += 1
+    self._add(race_id, None, runner_id)
+
+  def remove_runner(self, race_id: int, runner_id: int) -> None:
+    self._version += 1
+    entry = self._races.get(race_id)
+    if entry is not None:
+      entry[1].discard(runner_id)
+      self._discard(self._by_runner, runner_id, race_id)
+
+  def discard_checkpoint(self, checkpoint_id: int) -> None:
+    """Forget a deleted checkpoint in every race."""
+    self._version += 1
+    for race_id in self._by_checkpoint.pop(checkpoint_id, ()):
+      self._races[race_id][0].discard(checkpoint_id)
+
+  def discard_runner(self, runner_id: int) -> None:
+    """Forget a deleted runner in every race."""
+    self._version += 1
+    for race_id in self._by_runner.pop(runner_id, ()):
+      self._races[race_id][1].discard(runner_id)
+
+  def invalidate(self) -> None:
+    """Drop everything; the index is reloaded on next use."""
+    self._version += 1
+    self._loaded = False
+    self._reset()
+
+  def _reset(self) -> None:
+    self._races = {}
+    self._by_checkpoint = {}
+    self._by_runner = {}
+
+  def _remove(self, race_id: int) -> None:
+    entry = self._races.pop(race_id, None)
+    if entry is None:
+      return
+    checkpoints, runners = entry
+    for checkpoint_id in checkpoints:
+      self._discard(self._by_checkpoint, checkpoint_id, race_id)
+    for runner_id in runners:
+      self._discard(self._by_runner, runner_id, race_id)
+
+  def _add(self, race_id: int, checkpoint_id: int | None, runner_id: int | None) -> None:
+    entry = self._races.get(race_id)
+    if entry is None:
+      return  # race is inactive (or the index is not loaded yet)
+    if checkpoint_id is not None:
+      entry[0].add(checkpoint_id)
+      self._by_checkpoint.setdefault(checkpoint_id, set()).add(race_id)
+    if runner_id is not None:
+      entry[1].add(runner_id)
+      self._by_runner.setdefault(runner_id, set()).add(race_id)
+
+  @staticmethod
+  def _discard(index: Dict[int, Set[int]], key: int, race_id: int) -> None:
+    races = index.get(key)
+    if races is not None:
+      races.discard(race_id)
+      if not races:
+        del index[key]
+
+
+race_index = ActiveRaceIndex()
@@ -0,0 +1,184 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.event import Event
+from app.models.race import RaceCheckpoint, RaceRunner
+
+
+@dataclass
+class RunnerProgress:
+  runner_id: int
+  punches: Dict[int, datetime] = field(default_factory=dict)  # checkpoint_id -> latest scan
+  last_order: int | None = None  # highest control order reached
+  last_checkpoint_id: int | None = None
+
+
+class RaceResults:
+  """Results of one race, updated one event at a time.
+
+  As in the race detail view, the latest scan of a runner at a control counts.
+  """
+
+  def __init__(self, checkpoint_order: Dict[int, int], runner_ids: Iterable[int]):
+    self.checkpoint_order = checkpoint_order  # checkpoint_id -> RaceCheckpoint.order
+    self._ordered_checkpoints = sorted(checkpoint_order, key=checkpoint_order.get)
+    self.runners: Dict[int, RunnerProgress] = {r: RunnerProgress(r) for r in runner_ids}
+
+  def apply(self, runner_id: int, checkpoint_id: int, timestamp: datetime) -> None:
+    order = self.checkpoint_order.get(checkpoint_id)
+    progress = self.runners.get(runner_id)
+    if order is None or progress is None:
+      return
+    progress.punches[checkpoint_id] = timestamp
+    if progress.last_order is None or order >= progress.last_order:
+      progress.last_order = order
+      progress.last_checkpoint_id = checkpoint_id
+
+  def add_runner(self, runner_id: int) -> None:
+    self.runners.setdefault(runner_id, RunnerProgress(runner_id))
+
+  def remove_runner(self, runner_id: int) -> None:
+    self.runners.pop(runner_id, None)
+
+  def standings(self) -> List[dict]:
+    """Per-runner results, ranked finishers first, then by progress."""
+    total = len(self._ordered_checkpoints)
+    start_id = self._ordered_checkpoints[0] if total else None
+    rows = []
+    for progress in self.runners.values():
+      start = progress.punches.get(start_id)
+      splits = []
+      previous = start
+      for checkpoint_id in self._ordered_checkpoints:
+        ts = progress.punches.get(checkpoint_id)
+        splits.append({
+          "checkpoint_id": checkpoint_id,
+          "order": self.checkpoint_order[checkpoint_id],
+          "timestamp": ts,
+          "split_seconds": (ts - previous).total_seconds() if ts and previous else None,
+          "elapsed_seconds": (ts - start).total_seconds() if ts and start else None,
+        })
+        if ts is not None:
+          previous = ts
+
+      if not progress.punches:
+        status = "not_started"
+      elif total and len(progress.punches) == total:
+        status = "finished"
+      else:
+        status = "running"
+
+      last = progress.punches.get(progress.last_checkpoint_id)
+      rows.append({
+        "runner_id": progress.runner_id,
+        "rank": None,
+        "status": status,
+        "last_checkpoint_id": progress.last_checkpoint_id,
+        "elapsed_seconds": (last - start).total_seconds() if last and start else None,
+        "splits": splits,
+      })
+
+    finished = sorted((r for r in rows if r["status"] == "finished"), key=lambda r: r["elapsed_seconds"] or 0)
+    for i, row in enumerate(finished):
+      tied = i > 0 and row["elapsed_seconds"] == finished[i - 1]["elapsed_seconds"]
+      row["rank"] = finished[i - 1]["rank"] if tied else i + 1
+    others = sorted(
+      (r for r in rows if r["status"] != "finished"),
+      key=lambda r: (-(self.checkpoint_order.get(r["last_checkpoint_id"]) or 0), r["elapsed_seconds"] or 0, r["runner_id"]),
+    )
+    return finished + others
+
+
+class ResultsStore:
+  """Materialized results per race.
+
+  A race is built from its events once, on first request, and then kept up
+  to date by the ingestion path. CRUD functions that change a race's controls,
+  runners or events invalidate or adjust it.
+
+  Like ActiveRaceIndex, a build remembers the race's version when it starts:
+  if the race was invalidated or its roster changed meanwhile, the result is
+  returned to its caller but not cached. The first finished build is kept;
+  later concurrent builds of the same race return it instead.
+  """
+
+  def __init__(self):
+    self._races: Dict[int, RaceResults] = {}
+    self._generation = 0  # bumped by clear
+    self._versions: Dict[int, int] = {}  # race_id -> bumped by every change a build could miss
+    self._building: Dict[int, List[List[Event]]] = {}  # race_id -> events ingested during each build in flight
+
+  def _version(self, race_id: int) -> Tuple[int, int]:
+    return self._generation, self._versions.get(race_id, 0)
+
+  def _bump(self, race_id: int) -> None:
+    self._versions[race_id] = self._versions.get(race_id, 0) + 1
+
+  async def get(self, db: AsyncSession, race_id: int) -> RaceResults:
+    results = self._races.get(race_id)
+    if results is not None:
+      return results
+
+    version = self._version(race_id)
+    late: List[Event] = []
+    self._building.setdefault(race_id, []).append(late)
+    try:
+      checkpoints = (await db.execute(
+        select(RaceCheckpoint.checkpoint_id, RaceCheckpoint.order).where(RaceCheckpoint.race_id == race_id)
+      )).all()
+      runner_ids = (await db.execute(
+        select(RaceRunner.runner_id).where(RaceRunner.race_id == race_id)
+      )).scalars().all()
+      events = (await db.execute(
+        select(Event.runner_id, Event.checkpoint_id, Event.timestamp)
+        .where(Event.race_id == race_id)
+        .order_by(Event.id)
+      )).all()
+
+      results = RaceResults({c: o for c, o in checkpoints}, runner_ids)
+      for runner_id, checkpoint_id, timestamp in events:
+        results.apply(runner_id, checkpoint_id, timestamp)
+    finally:
+      builds = self._building[race_id]
+      builds.remove(late)
+      if not builds:
+        del self._building[race_id]
+
+    for event in late:
+      results.apply(event.runner_id, event.checkpoint_id, event.timestamp)
+    if self._version(race_id) != version:
+      return results
+    return self._races.setdefault(race_id, results)
+
+  def record(self, event: Event) -> None:
+    """Apply a newly committed event."""
+    results = self._races.get(event.race_id)
+    if results is not None:
+      results.apply(event.runner_id, event.checkpoint_id, event.timestamp)
+    for late in self._building.get(event.race_id, ()):
+      late.append(event)
+
+  def add_runner(self, race_id: int, runner_id: int) -> None:
+    self._bump(race_id)
+    if race_id in self._races:
+      self._races[race_id].add_runner(runner_id)
+
+  def remove_runner(self, race_id: int, runner_id: int) -> None:
+    self._bump(race_id)
+    if race_id in self._races:
+      self._races[race_id].remove_runner(runner_id)
+
+  def invalidate(self, race_id: int) -> None:
+    self._bump(race_id)
+    self._races.pop(race_id, None)
+
+  def clear(self) -> None:
+    self._generation += 1
+    self._races.clear()
+
+
+results_store = ResultsStore()
@@ -0,0 +1,87 @@
+import secrets
+from collections import OrderedDict, deque
+from typing import Deque, FrozenSet, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.changes import change_feed
+from app.core.race_index import race_index
+from app.models.race import Race, RaceCheckpoint, RaceRunner
+from app.models.runner import Runner
+
+# Versions restart with the process, so they carry a per-process token too.
+_INSTANCE = secrets.token_hex(4)
+
+
+class RosterStore:
+  """Versioned rosters for checkpoint devices: the RFID cards valid at each checkpoint.
+
+  A roster is every card of a runner in an active race that contains the
+  checkpoint. Its version follows the race index and the runner collection,
+  so it only changes when memberships, active flags or cards do. The last
+  few snapshots of each checkpoint are kept, so a device that sends the
+  version it has gets only the cards added and removed since.
+  """
+
+  def __init__(self, history: int = 8, max_checkpoints: int = 1000):
+    self._history = history
+    self._max_checkpoints = max_checkpoints
+    self._snapshots: "OrderedDict[int, Deque[Tuple[str, FrozenSet[int]]]]" = OrderedDict()
+
+  @staticmethod
+  def version() -> str:
+    return f"{_INSTANCE}.{race_index.version}.{change_feed.version('runner')}"
+
+  async def get(self, db: AsyncSession, checkpoint_id: int, since: str | None = None) -> dict:
+    """The roster of a checkpoint, as a delta from `since` when that version is still known."""
+    version = self.version()
+    history = self._snapshots.get(checkpoint_id)
+    if history and history[-1][0] == version:
+      current = history[-1][1]
+      self._snapshots.move_to_end(checkpoint_id)
+    else:
+      current = await self._load(db, checkpoint_id)
+      if self.version() == version:
+        # Only remember a snapshot no mutation raced with
+        history = self._remember(checkpoint_id, version, current)
+
+    previous = None
+    if since is not None and history:
+      previous = next((uids for v, uids in history if v == since), None)
+    if previous is None:
+      return {"version": version, "full": True, "rfid_uids": sorted(current), "added": [], "removed": []}
+    return {
+      "version": version,
+      "full": False,
+      "rfid_uids": [],
+      "added": sorted(current - previous),
+      "removed": sorted(previous - current),
+    }
+
+  def clear(self) -> None:
+    self._snapshots.clear()
+
+  async def _load(self, db: AsyncSession, checkpoint_id: int) -> FrozenSet[int]:
+    active_races = (
+      select(RaceCheckpoint.race_id)
+      .join(Race, Race.id == RaceCheckpoint.race_id)
+      .where(RaceCheckpoint.checkpoint_id == checkpoint_id, Race.is_active == True)
+    )
+    rows = await db.execute(
+      select(Runner.rfid_uid).join(RaceRunner, RaceRunner.runner_id == Runner.id).where(RaceRunner.race_id.in_(active_races))
+    )
+    return frozenset(rows.scalars())
+
+  def _remember(self, checkpoint_id: int, version: str, uids: FrozenSet[int]) -> Deque[Tuple[str, FrozenSet[int]]]:
+    history = self._snapshots.get(checkpoint_id)
+    if history is None:
+      history = self._snapshots[checkpoint_id] = deque(maxlen=self._history)
+      while len(self._snapshots) > self._max_checkpoints:
+        self._snapshots.popitem(last=False)
+    self._snapshots.move_to_end(checkpoint_id)
+    history.append((version, uids))
+    return history
+
+
+roster_store = RosterStore()
@@ -8,6 +8,7 @@ from app.crud.checkpoint import *
 from app.crud.event import *
 from app.crud.runner import *
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.fixtures import SeasonSpec, seed_season
 from datetime import datetime
 
 def nowString():
@@ -213,125 +214,8 @@ async def seed_db(session: AsyncSession):
 
 
 async def seed_db_big(session: AsyncSession):
-    desired_count = 100
-    i = 1
-    while (i < desired_count):
-        await create_race(
-            session,
-            RaceCreate(
-                name=f"race{i}",
-                date=datetime.now(),
-                is_active=False,
-                location = f"location{i}"
-            )
-        )
-        i+=1
-    
-    races = (await get_races(session))
-
-    i = 1
-    while (i < desired_count):
-        await create_runner(
-            session,
-            RunnerCreate(
-                rfid_uid=i,
-            )
-        )
-        await update_runner(
-            session,
-            i,
-            RunnerUpdate(
-                name = f"runner{i}first",
-                surname = f"runner{i}ur"
-            )
-        )
-        await add_race_runner(
-            session,
-            races[0].id,
-            (await get_runners(session))[i-1].id
-        )
-        i+=1
-        
-
-    i = 1
-    while (i < desired_count):
-        await create_checkpoint(
-            session,
-            CheckpointCreate(
-                checkpoint_id=f"checkpoint{i}_uuid",
-                timestamp=nowString()
-            )   
-        )
-
-        await update_checkpoint(
-            session,
-            i,
-            CheckpointUpdate(
-                name=f"checkpoint{i}name"
-            )
-        )
-
-        await add_race_checkpoint(
-            session,
-            races[0].id,
-            (await get_checkpoints(session))[i-1].id
-        )
-    
-
-        i+=1
-
-
-    # await add_race_checkpoint(
-    #     session,
-    #     races[0].id,
-    #     checkpoints[0].id
-    # )
-    
-    # await add_race_checkpoint(
-    #     session,
-    #     races[0].id,
-    #     checkpoints[1].id
-    # )
-
-    # await add_race_checkpoint(
-    #     session,
-    #     races[0].id,
-    #     checkpoints[2].id
-    # )
-
-
-    # await create_event(
-    #     session,
-    #     EventCreate(
-    #         checkpoint_id = checkpoints[0].uuid,
-    #         rfid_uid = 1,
-    #         timestamp = nowString()
-    #     )
-    # )
-
-    # await create_event(
-    #     session,
-    #     EventCreate(
-    #         checkpoint_id = checkpoints[1].uuid,
-    #         rfid_uid = 1,
-    #         timestamp = nowString()
-    #     )
-    # )
-
-    # await create_event(
-    #     session,
-    #     EventCreate(
-    #         checkpoint_id = checkpoints[2].uuid,
-    #         rfid_uid = 1,
-    #         timestamp = nowString()
-    #     )
-    # )
-
-    # await create_event(
-    #         session,
-    #         EventCreate(
-    #             checkpoint_id = checkpoints[0].uuid,
-    #             rfid_uid = 2,
-    #             timestamp = nowString()
-    #         )
-    #     )
+    # Bulk inserts; see app.core.fixtures for larger seasons
+    await seed_season(
+        session,
+        SeasonSpec(runners=100, checkpoints=100, races=100, runners_per_race=100, active_races=0)
+    )
@@ -1,7 +1,13 @@
-from typing import Sequence
-from sqlalchemy import select, delete
+from typing import Dict, Iterable, Sequence
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
 
+from app.core.cache import lookup_cache
+from app.core.changes import change_feed
+from app.core.results import results_store
+from app.core.race_index import race_index
+from app.core.roster import roster_store
 from app.models.checkpoint import Checkpoint
 from app.models.race import RaceCheckpoint
 from app.schemas.checkpoint import CheckpointCreate, CheckpointUpdate
@@ -18,16 +24,25 @@ async def get_checkpoints_of_race(db: AsyncSession, race_id: int) ->  Sequence[C
 
 async def get_checkpoints(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[Checkpoint]:
   """Get all checkpoints with pagination."""
-  result = await db.execute(select(Checkpoint).offset(skip).limit(limit))
+  result = await db.execute(select(Checkpoint).order_by(Checkpoint.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 
 async def create_checkpoint(db: AsyncSession, checkpoint_in: CheckpointCreate) -> Checkpoint:
   """Create a new checkpoint."""
+  checkpoint_with_uuid = await get_checkpoint_by_uuid(db, checkpoint_in.checkpoint_id)
+  if checkpoint_with_uuid:
+    raise HTTPException(
+      status_code=status.HTTP_409_CONFLICT,
+      detail=f"Checkpoint with uuid: {checkpoint_in.checkpoint_id} already exists",
+    )
+
   checkpoint = Checkpoint(name="", uuid=checkpoint_in.checkpoint_id)
   db.add(checkpoint)
   await db.commit()
   await db.refresh(checkpoint)
+  lookup_cache.set_checkpoint(checkpoint.uuid, checkpoint.id)
+  change_feed.publish("checkpoint", "created", checkpoint.id)
   return checkpoint
 
 
@@ -43,6 +58,8 @@ async def update_checkpoint(db: AsyncSession, checkpoint_id: int, checkpoint_in:
   
   await db.commit()
   await db.refresh(checkpoint)
+  lookup_cache.invalidate_checkpoint(checkpoint_id)
+  change_feed.publish("checkpoint", "updated", checkpoint_id)
   return checkpoint
 
 
@@ -52,11 +69,60 @@ async def delete_checkpoint(db: AsyncSession, checkpoint_id: int) -> bool:
   if not checkpoint:
     return False
   
-  await db.execute(delete(Checkpoint).where(Checkpoint.id == checkpoint_id))
+  # ORM delete so race_checkpoints rows go too (enforced foreign keys on PostgreSQL)
+  await db.delete(checkpoint)
   await db.commit()
+  lookup_cache.invalidate_checkpoint(checkpoint_id)
+  race_index.discard_checkpoint(checkpoint_id)
+  results_store.clear()
+  change_feed.publish("checkpoint", "deleted", checkpoint_id)
   return True
 
+async def get_checkpoint_roster(db: AsyncSession, uuid: str, since: str | None = None) -> dict | None:
+  """RFID cards valid at a checkpoint (by UUID), as a delta from version `since` when possible."""
+  checkpoint_id = await resolve_checkpoint_id(db, uuid)
+  if checkpoint_id is None:
+    return None
+  return await roster_store.get(db, checkpoint_id, since)
+
+
 async def get_checkpoint_by_uuid(db: AsyncSession, uuid: str) -> Checkpoint | None:
   """Get a single checkpoint by UUID."""
   result = await db.execute(select(Checkpoint).where(Checkpoint.uuid == uuid))
   return result.scalar_one_or_none()
+
+
+async def resolve_checkpoint_id(db: AsyncSession, uuid: str) -> int | None:
+  """Resolve a checkpoint UUID to its ID, using the lookup cache."""
+  checkpoint_id = lookup_cache.get_checkpoint_id(uuid)
+  if checkpoint_id is None:
+    generation = lookup_cache.generation
+    checkpoint = await get_checkpoint_by_uuid(db, uuid)
+    if checkpoint is None:
+      return None
+    checkpoint_id = checkpoint.id
+    # An update committed meanwhile may have reassigned it; don't cache the old mapping
+    if lookup_cache.generation == generation:
+      lookup_cache.set_checkpoint(uuid, checkpoint_id)
+  return checkpoint_id
+
+
+async def resolve_checkpoint_ids(db: AsyncSession, uuids: Iterable[str]) -> Dict[str, int]:
+  """Resolve many checkpoint UUIDs with at most one query; unknown UUIDs are left out."""
+  resolved: Dict[str, int] = {}
+  missing = []
+  for uuid in set(uuids):
+    checkpoint_id = lookup_cache.get_checkpoint_id(uuid)
+    if checkpoint_id is None:
+      missing.append(uuid)
+    else:
+      resolved[uuid] = checkpoint_id
+  if missing:
+    generation = lookup_cache.generation
+    rows = await db.execute(select(Checkpoint.uuid, Checkpoint.id).where(Checkpoint.uuid.in_(missing)))
+    cacheable = lookup_cache.generation == generation
+    for uuid, checkpoint_id in rows:
+      if cacheable:
+        lookup_cache.set_checkpoint(uuid, checkpoint_id)
+      resolved[uuid] = checkpoint_id
+  return resolved
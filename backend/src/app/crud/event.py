@@ -1,16 +1,19 @@
+import hashlib
 from datetime import datetime
-from time import strftime
-from typing import Sequence, List
+from typing import Dict, Iterable, List, Literal, Sequence, Tuple
 from fastapi import HTTPException, status
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.event import Event
 from app.schemas.event import EventCreate
 
-from app.crud.checkpoint import get_checkpoint_by_uuid
-from app.crud.runner import get_runner_by_rfid
-from app.crud.race import get_active_races_with_checkpoint_and_runner
+from app.crud.checkpoint import resolve_checkpoint_id, resolve_checkpoint_ids
+from app.crud.runner import resolve_runner_id, resolve_runner_ids
+from app.core.changes import change_feed
+from app.core.results import results_store
+from app.core.race_index import race_index
 
 async def get_event(db: AsyncSession, event_id: int) -> Event | None:
   """Get a single event by ID."""
@@ -18,15 +21,26 @@ async def get_event(db: AsyncSession, event_id: int) -> Event | None:
   return result.scalar_one_or_none()
 
 
-async def get_events(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[Event]:
-  """Get all events with pagination."""
-  result = await db.execute(select(Event).offset(skip).limit(limit))
+async def get_events(db: AsyncSession, skip: int = 0, limit: int = 100, since_id: int | None = None) -> Sequence[Event]:
+  """Get all events with pagination, optionally only those newer than since_id."""
+  query = select(Event)
+  if since_id is not None:
+    query = query.where(Event.id > since_id)
+  result = await db.execute(query.order_by(Event.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 
-async def get_events_of_race(db: AsyncSession, race_id: int, skip: int = 0, limit: int = 100) -> Sequence[Event]:
-  """Get all events with pagination."""
-  result = await db.execute(select(Event).where(Event.race_id == race_id).offset(skip).limit(limit))
+async def get_events_of_race(db: AsyncSession, race_id: int, skip: int = 0, limit: int = 100, since_id: int | None = None) -> Sequence[Event]:
+  """Get all events of a race with pagination, optionally only those newer than since_id.
+
+  Ids are handed out before commit, so on PostgreSQL, where scans are written
+  concurrently, an event may become visible after one with a greater id.
+  Pollers should re-read a window of ids below their cursor and merge by id.
+  """
+  query = select(Event).where(Event.race_id == race_id)
+  if since_id is not None:
+    query = query.where(Event.id > since_id)
+  result = await db.execute(query.order_by(Event.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 
@@ -36,48 +50,170 @@ async def get_race_runner_events(db: AsyncSession, race_id: int, runner_id: int)
     select(Event).where(
       Event.race_id == race_id,
       Event.runner_id == runner_id
-    )
+    ).order_by(Event.id)
   )
   return result.scalars().all()
 
 
-async def create_event(db: AsyncSession, event_in: EventCreate) -> List[Event]:
-  """Create a new event."""
-  checkpoint = await get_checkpoint_by_uuid(db, event_in.checkpoint_id)
-  if not checkpoint:
+def _parse_timestamp(value: str) -> datetime:
+  try:
+    timestamp = datetime.fromisoformat(value)
+  except ValueError:
+    raise HTTPException(
+      status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+      detail=f"Invalid timestamp: {value}"
+    )
+  if timestamp.tzinfo is not None:
+    # Event.timestamp is naive local time, as sent by the checkpoints
+    timestamp = timestamp.astimezone().replace(tzinfo=None)
+  return timestamp
+
+
+async def _build_resolved(
+  db: AsyncSession,
+  event_in: EventCreate,
+  checkpoint_id: int | None,
+  runner_id: int | None,
+) -> List[Event]:
+  timestamp = _parse_timestamp(event_in.timestamp)
+
+  if checkpoint_id is None:
     raise HTTPException(
       status_code=status.HTTP_404_NOT_FOUND,
       detail=f"Checkpoint with id {event_in.checkpoint_id} not found"
     )
 
-  runner = await get_runner_by_rfid(db, event_in.rfid_uid)
-  if not runner:
+  if runner_id is None:
     raise HTTPException(
       status_code=status.HTTP_404_NOT_FOUND,
       detail=f"Runner with rfid_uid: {event_in.rfid_uid} not found"
     )
 
-  races = await get_active_races_with_checkpoint_and_runner(db, checkpoint.id, runner.id)
-  if len(races) == 0:
+  race_ids = await race_index.races_for(db, checkpoint_id, runner_id)
+  if len(race_ids) == 0:
     raise HTTPException(
       status_code=status.HTTP_404_NOT_FOUND,
-      detail=f"Runner with id: {runner.id} does not take part in any active races with checkpoint with id: {checkpoint.id}"
+      detail=f"Runner with id: {runner_id} does not take part in any active races with checkpoint with id: {checkpoint_id}"
     )
 
+  scan_id = scan_id_for(event_in, timestamp)
+  return [
+    Event(runner_id=runner_id, checkpoint_id=checkpoint_id, race_id=race_id, timestamp=timestamp, scan_id=scan_id)
+    for race_id in sorted(race_ids)
+  ]
 
-  events = [
-      Event(runner_id=runner.id, checkpoint_id=checkpoint.id, race_id=race.id,
-            timestamp=datetime.fromisoformat(event_in.timestamp))
-      for race in races
-    ]
 
-  db.add_all(events)
-  await db.commit()
+async def build_events(db: AsyncSession, event_in: EventCreate) -> List[Event]:
+  """Validate a scan and build unsaved events for every active race it belongs to."""
+  checkpoint_id = await resolve_checkpoint_id(db, event_in.checkpoint_id)
+  runner_id = await resolve_runner_id(db, event_in.rfid_uid)
+  return await _build_resolved(db, event_in, checkpoint_id, runner_id)
 
-  for event in events:
-    await db.refresh(event)
 
-  return events
+async def create_event(db: AsyncSession, event_in: EventCreate) -> List[Event]:
+  """Create the events of one scan; a replayed scan returns the stored events."""
+  [(_, result)] = await create_event_batch(db, [event_in])
+  if isinstance(result, HTTPException):
+    raise result
+  return result
+
+
+async def create_events(db: AsyncSession, events_in: Sequence[EventCreate]) -> List[List[Event] | HTTPException]:
+  """Create events for many scans in a single transaction.
+
+  Returns one entry per scan: its events (created or already stored), or the HTTPException that rejected it.
+  """
+  return [result for _, result in await create_event_batch(db, events_in)]
+
+
+BatchStatus = Literal["created", "duplicate", "rejected"]
+
+_SCAN_ID_CHUNK = 500
+
+
+def scan_id_for(event_in: EventCreate, timestamp: datetime) -> str:
+  """Identity of a scan: the client's scan_id, or else its card and time, scoped to the checkpoint."""
+  if event_in.scan_id:
+    raw = f"id|{event_in.checkpoint_id}|{event_in.scan_id}"
+  else:
+    raw = f"scan|{event_in.checkpoint_id}|{event_in.rfid_uid}|{timestamp.isoformat()}"
+  return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+async def _find_by_scan_id(db: AsyncSession, scan_ids: Iterable[str]) -> Dict[Tuple[str, int], Event]:
+  scan_ids = list(scan_ids)
+  found: Dict[Tuple[str, int], Event] = {}
+  for i in range(0, len(scan_ids), _SCAN_ID_CHUNK):
+    rows = await db.execute(select(Event).where(Event.scan_id.in_(scan_ids[i:i + _SCAN_ID_CHUNK])))
+    for event in rows.scalars():
+      found[(event.scan_id, event.race_id)] = event
+  return found
+
+
+async def create_event_batch(
+  db: AsyncSession,
+  events_in: Sequence[EventCreate],
+  retry: bool = True,
+) -> List[Tuple[BatchStatus, List[Event] | HTTPException]]:
+  """Create events for a batch of scans in a single transaction.
+
+  Checkpoints and runners are resolved once for the whole batch. Events are
+  unique per (scan_id, race_id): a replayed scan is not written again and is
+  reported as a duplicate together with the stored events, so clients can
+  retry freely.
+  """
+  checkpoint_ids = await resolve_checkpoint_ids(db, (e.checkpoint_id for e in events_in))
+  runner_ids = await resolve_runner_ids(db, (e.rfid_uid for e in events_in))
+
+  built: List[List[Event] | HTTPException] = []
+  for event_in in events_in:
+    try:
+      built.append(await _build_resolved(
+        db, event_in, checkpoint_ids.get(event_in.checkpoint_id), runner_ids.get(event_in.rfid_uid)
+      ))
+    except HTTPException as e:
+      built.append(e)
+
+  stored = await _find_by_scan_id(
+    db, {e.scan_id for events in built if not isinstance(events, HTTPException) for e in events}
+  )
+
+  results: List[Tuple[BatchStatus, List[Event] | HTTPException]] = []
+  created: List[Event] = []
+  for events in built:
+    if isinstance(events, HTTPException):
+      results.append(("rejected", events))
+      continue
+    item_events = []
+    item_status: BatchStatus = "duplicate"
+    for event in events:
+      key = (event.scan_id, event.race_id)
+      if key in stored:
+        item_events.append(stored[key])
+        continue
+      stored[key] = event  # later copies in the same batch are duplicates
+      db.add(event)
+      created.append(event)
+      item_events.append(event)
+      item_status = "created"
+    results.append((item_status, item_events))
+
+  try:
+    await db.commit()
+  except IntegrityError:
+    # A concurrent request stored one of these scans first; on retry it is a duplicate
+    await db.rollback()
+    if not retry:
+      raise
+    return await create_event_batch(db, events_in, retry=False)
+  _publish_created(created)
+  return results
+
+
+def _publish_created(events: List[Event]) -> None:
+  for event in events:
+    results_store.record(event)
+    change_feed.publish("event", "created", event.id, event.race_id)
 
 
 async def delete_event(db: AsyncSession, event_id: int) -> bool:
@@ -88,4 +224,6 @@ async def delete_event(db: AsyncSession, event_id: int) -> bool:
 
   await db.delete(event)
   await db.commit()
+  results_store.invalidate(event.race_id)
+  change_feed.publish("event", "deleted", event_id, event.race_id)
   return True
@@ -3,6 +3,9 @@ from sqlalchemy import select, delete, func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
+from app.core.changes import change_feed
+from app.core.race_index import race_index
+from app.core.results import results_store
 from app.models.race import Race, RaceCheckpoint, RaceRunner
 from app.models.checkpoint import Checkpoint
 from app.models.runner import Runner
@@ -20,7 +23,7 @@ async def get_race(db: AsyncSession, race_id: int) -> Race | None:
 
 async def get_races(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[Race]:
   """Get all races with pagination."""
-  result = await db.execute(select(Race).offset(skip).limit(limit))
+  result = await db.execute(select(Race).order_by(Race.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 
@@ -30,6 +33,8 @@ async def create_race(db: AsyncSession, race_in: RaceCreate) -> Race:
   db.add(race)
   await db.commit()
   await db.refresh(race)
+  race_index.add_race(race.id, race.is_active)
+  change_feed.publish("race", "created", race.id)
   return race
 
 
@@ -45,6 +50,9 @@ async def update_race(db: AsyncSession, race_id: int, race_in: RaceUpdate) -> Ra
 
   await db.commit()
   await db.refresh(race)
+  if "is_active" in update_data:
+    await race_index.refresh_race(db, race_id)
+  change_feed.publish("race", "updated", race_id)
   return race
 
 
@@ -56,6 +64,9 @@ async def delete_race(db: AsyncSession, race_id: int) -> bool:
 
   await db.delete(race)
   await db.commit()
+  race_index.remove_race(race_id)
+  results_store.invalidate(race_id)
+  change_feed.publish("race", "deleted", race_id)
   return True
 
 
@@ -86,6 +97,9 @@ async def add_race_checkpoint(db: AsyncSession, race_id: int, checkpoint_id: int
   db.add(race_checkpoint)
   await db.commit()
   await db.refresh(race_checkpoint)
+  race_index.add_checkpoint(race_id, checkpoint_id)
+  results_store.invalidate(race_id)
+  change_feed.publish("race", "updated", race_id)
   return race_checkpoint
 
 
@@ -98,6 +112,9 @@ async def remove_race_checkpoint(db: AsyncSession, race_id: int, checkpoint_id:
     )
   )
   await db.commit()
+  race_index.remove_checkpoint(race_id, checkpoint_id)
+  results_store.invalidate(race_id)
+  change_feed.publish("race", "updated", race_id)
   return result.rowcount > 0
 
 
@@ -108,6 +125,7 @@ async def get_race_runners(db: AsyncSession, race_id: int) -> Sequence[Runner]:
     select(Runner)
     .join(RaceRunner)
     .where(RaceRunner.race_id == race_id)
+    .order_by(Runner.id)
   )
   return result.scalars().all()
 
@@ -119,6 +137,9 @@ async def delete_race_checkpoints(db: AsyncSession, race_id: int):
     )
   )
   await db.commit()
+  race_index.set_checkpoints(race_id, [])
+  results_store.invalidate(race_id)
+  change_feed.publish("race", "updated", race_id)
   return True
 
 
@@ -134,6 +155,9 @@ async def replace_race_checkpoints(db: AsyncSession, race_id: int, new_checkpoin
     db.add(RaceCheckpoint(race_id=race_id, checkpoint_id=c, order=i))
     i += 1
   await db.commit()
+  race_index.set_checkpoints(race_id, new_checkpoints)
+  results_store.invalidate(race_id)
+  change_feed.publish("race", "updated", race_id)
 
 
 async def add_race_runner(db: AsyncSession, race_id: int, runner_id: int) -> RaceRunner:
@@ -142,6 +166,9 @@ async def add_race_runner(db: AsyncSession, race_id: int, runner_id: int) -> Rac
   db.add(race_runner)
   await db.commit()
   await db.refresh(race_runner)
+  race_index.add_runner(race_id, runner_id)
+  results_store.add_runner(race_id, runner_id)
+  change_feed.publish("race", "updated", race_id)
   return race_runner
 
 
@@ -161,9 +188,20 @@ async def remove_race_runner(db: AsyncSession, race_id: int, runner_id: int) ->
   )
 
   await db.commit()
+  race_index.remove_runner(race_id, runner_id)
+  results_store.remove_runner(race_id, runner_id)
+  change_feed.publish("race", "updated", race_id)
+  if result2.rowcount > 0:
+    change_feed.publish("event", "deleted", race_id=race_id)
   return result.rowcount > 0 or result2.rowcount > 0
 
 
+async def get_race_results(db: AsyncSession, race_id: int) -> List[dict]:
+  """Get the current results of a race from the materialized results store."""
+  results = await results_store.get(db, race_id)
+  return results.standings()
+
+
 async def get_active_races_with_checkpoint_and_runner(db: AsyncSession, checkpoint_id: int, runner_id: int) -> Sequence[
   Race]:
   result = await db.execute(
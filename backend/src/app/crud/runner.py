@@ -1,8 +1,12 @@
-from typing import Sequence
+from typing import Dict, Iterable, Sequence
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.cache import lookup_cache
+from app.core.changes import change_feed
+from app.core.results import results_store
+from app.core.race_index import race_index
 from app.models.runner import Runner
 from app.models.race import RaceRunner
 from app.schemas.runner import RunnerCreate, RunnerUpdate
@@ -18,12 +22,12 @@ async def get_runner(db: AsyncSession, runner_id: int) -> Runner | None:
 
 async def get_runners(db: AsyncSession, skip: int = 0, limit: int = 100) -> Sequence[Runner]:
   """Get all runners with pagination."""
-  result = await db.execute(select(Runner).offset(skip).limit(limit))
+  result = await db.execute(select(Runner).order_by(Runner.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 async def get_runners_of_race(db: AsyncSession, race_id: int, skip: int = 0, limit: int = 100) -> Sequence[Runner]:
   """Get all runners with pagination."""
-  result = await db.execute(select(Runner).join(RaceRunner).where(RaceRunner.race_id == race_id).offset(skip).limit(limit))
+  result = await db.execute(select(Runner).join(RaceRunner).where(RaceRunner.race_id == race_id).order_by(Runner.id).offset(skip).limit(limit))
   return result.scalars().all()
 
 async def create_runner(db: AsyncSession, runner_in: RunnerCreate) -> Runner:
@@ -39,6 +43,8 @@ async def create_runner(db: AsyncSession, runner_in: RunnerCreate) -> Runner:
   db.add(runner)
   await db.commit()
   await db.refresh(runner)
+  lookup_cache.set_runner(runner.rfid_uid, runner.id)
+  change_feed.publish("runner", "created", runner.id)
   return runner
 
 
@@ -49,11 +55,21 @@ async def update_runner(db: AsyncSession, runner_id: int, runner_in: RunnerUpdat
     return None
   
   update_data = runner_in.model_dump(exclude_unset=True)
+  if update_data.get("rfid_uid") not in (None, runner.rfid_uid):
+    runner_with_rfid_uid = await get_runner_by_rfid(db, update_data["rfid_uid"])
+    if runner_with_rfid_uid:
+      raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Runner with rfid_uid: {str(update_data['rfid_uid'])} already exists",
+      )
+
   for field, value in update_data.items():
     setattr(runner, field, value)
   
   await db.commit()
   await db.refresh(runner)
+  lookup_cache.invalidate_runner(runner_id)
+  change_feed.publish("runner", "updated", runner_id)
   return runner
 
 
@@ -65,11 +81,51 @@ async def delete_runner(db: AsyncSession, runner_id: int) -> bool:
   
   await db.delete(runner)
   await db.commit()
+  lookup_cache.invalidate_runner(runner_id)
+  race_index.discard_runner(runner_id)
+  results_store.clear()
+  change_feed.publish("runner", "deleted", runner_id)
   return True
 
-async def get_runner_by_rfid(db: AsyncSession, rfid: str, ) -> Runner | None:
+async def get_runner_by_rfid(db: AsyncSession, rfid: int) -> Runner | None:
   """Get a runner by rfid."""
   result = await db.execute(
     select(Runner).where(Runner.rfid_uid == rfid)
   )
   return result.scalar_one_or_none()
+
+
+async def resolve_runner_id(db: AsyncSession, rfid_uid: int) -> int | None:
+  """Resolve an RFID card to its runner ID, using the lookup cache."""
+  runner_id = lookup_cache.get_runner_id(rfid_uid)
+  if runner_id is None:
+    generation = lookup_cache.generation
+    runner = await get_runner_by_rfid(db, rfid_uid)
+    if runner is None:
+      return None
+    runner_id = runner.id
+    # An update committed meanwhile may have reassigned it; don't cache the old mapping
+    if lookup_cache.generation == generation:
+      lookup_cache.set_runner(rfid_uid, runner_id)
+  return runner_id
+
+
+async def resolve_runner_ids(db: AsyncSession, rfid_uids: Iterable[int]) -> Dict[int, int]:
+  """Resolve many RFID cards with at most one query; unknown cards are left out."""
+  resolved: Dict[int, int] = {}
+  missing = []
+  for rfid_uid in set(rfid_uids):
+    runner_id = lookup_cache.get_runner_id(rfid_uid)
+    if runner_id is None:
+      missing.append(rfid_uid)
+    else:
+      resolved[rfid_uid] = runner_id
+  if missing:
+    generation = lookup_cache.generation
+    rows = await db.execute(select(Runner.rfid_uid, Runner.id).where(Runner.rfid_uid.in_(missing)))
+    cacheable = lookup_cache.generation == generation
+    for rfid_uid, runner_id in rows:
+      if cacheable:
+        lookup_cache.set_runner(rfid_uid, runner_id)
+      resolved[rfid_uid] = runner_id
+  return resolved
@@ -8,6 +8,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import config
 from app.routes.router import api_router
 from app.core.db import db_lifespan_context
+from app.core.ingest import ingest_queue
+from app.core.changes import change_feed
+from app.core.metrics import MetricsMiddleware
 
 logging.basicConfig(
 	level=logging.DEBUG,
@@ -29,10 +32,13 @@ async def lifespan(app: FastAPI):
 	logger.info("Starting application lifespan")
 	async with db_lifespan_context():
 		logger.info("Database context initialized")
+		await ingest_queue.start()
 		try:
 			yield
 		finally:
 			logger.info("Stopping application lifespan")
+			await ingest_queue.stop()
+			change_feed.close()
 
 
 app = FastAPI(
@@ -49,6 +55,10 @@ app.add_middleware(
 	allow_methods=["*"],
 	allow_headers=["*"],
 )
+# Added last, so it wraps CORS and the routes. Starlette's ServerErrorMiddleware
+# still sits outside it: an unhandled exception is recorded as a 500 without the
+# time spent rendering the error response.
+app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 async def root():
@@ -65,4 +75,5 @@ logger.info(f"FastAPI application configured.")
 
 
 def main():
-	uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+	# Open /api/changes streams never finish on their own; don't let them block shutdown
+	uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, timeout_graceful_shutdown=3)
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
 class Checkpoint(Base):
   __tablename__ = "checkpoints"
   id: Mapped[int] = mapped_column( primary_key=True)
-  uuid: Mapped[str] = mapped_column(String(36))
+  uuid: Mapped[str] = mapped_column(String(36), unique=True, index=True)
   name: Mapped[str] = mapped_column(String(30))
 
   race_checkpoints: Mapped[List["RaceCheckpoint"]] = relationship(
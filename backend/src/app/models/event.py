@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
-from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from app.core.db import Base
@@ -13,11 +13,19 @@ if TYPE_CHECKING:
 
 class Event(Base):
   __tablename__ = "events"
+  __table_args__ = (
+    Index("ix_events_race_runner_checkpoint", "race_id", "runner_id", "checkpoint_id"),
+    # Events of a race in id order, for since_id polling
+    Index("ix_events_race_id", "race_id", "id"),
+    # A scan yields at most one event per race; NULL for events stored before scan ids
+    Index("ux_events_scan_race", "scan_id", "race_id", unique=True),
+  )
   id: Mapped[int] = mapped_column(primary_key=True)
-  runner_id: Mapped[int] = mapped_column(ForeignKey("runners.id", ondelete="CASCADE"))
+  runner_id: Mapped[int] = mapped_column(ForeignKey("runners.id", ondelete="CASCADE"), index=True)
   checkpoint_id: Mapped[int] = mapped_column(ForeignKey("checkpoints.id", ondelete="CASCADE"))
   race_id: Mapped[int] = mapped_column(ForeignKey("races.id", ondelete="CASCADE"))
   timestamp: Mapped[datetime] = mapped_column(DateTime)
+  scan_id: Mapped[str | None] = mapped_column(String(32), nullable=True)
 
   runner: Mapped["Runner"] = relationship("Runner")
   checkpoint: Mapped["Checkpoint"] = relationship("Checkpoint")
@@ -18,7 +18,7 @@ class Race(Base):
   name: Mapped[str] = mapped_column(String(30))
   date: Mapped[datetime] = mapped_column(DateTime)
   location: Mapped[str] = mapped_column(String(30))
-  is_active: Mapped[bool] = mapped_column(Boolean)
+  is_active: Mapped[bool] = mapped_column(Boolean, index=True)
 
   race_runners: Mapped[List["RaceRunner"]] = relationship(
     "RaceRunner",
@@ -0,0 +1,39 @@
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.changes import change_feed
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+KEEP_ALIVE_INTERVAL = 15  # sec
+
+
+@router.get("/")
+async def stream_changes(request: Request):
+  """Server-Sent Events stream of create/update/delete notifications."""
+  logger.debug("Change feed client connected")
+
+  async def stream():
+    async with change_feed.subscribe() as queue:
+      yield "retry: 3000\n\n"
+      while not await request.is_disconnected():
+        try:
+          change = await asyncio.wait_for(queue.get(), timeout=KEEP_ALIVE_INTERVAL)
+        except TimeoutError:
+          yield ": keep-alive\n\n"
+          continue
+        if change is None:
+          break
+        yield f"event: {change.entity}\ndata: {json.dumps(change.to_dict())}\n\n"
+    logger.debug("Change feed client disconnected")
+
+  return StreamingResponse(
+    stream(),
+    media_type="text/event-stream",
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+  )
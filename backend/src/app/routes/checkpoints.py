@@ -1,9 +1,10 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
-from app.schemas.checkpoint import CheckpointCreate, CheckpointUpdate, CheckpointResponse
+from app.core.etag import collection_etag, is_not_modified, not_modified
+from app.schemas.checkpoint import CheckpointCreate, CheckpointUpdate, CheckpointResponse, CheckpointRosterResponse
 from app.crud import checkpoint as checkpoint_crud
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,8 @@ async def create_checkpoint(
 
 @router.get("/", response_model=list[CheckpointResponse])
 async def list_checkpoints(
+  request: Request,
+  response: Response,
   skip: int = 0,
   limit: int = 100,
   db: AsyncSession = Depends(get_db),
@@ -30,12 +33,34 @@ async def list_checkpoints(
 ):
   """Get all checkpoints with pagination."""
   logger.debug(f"Listing checkpoints (skip={skip}, limit={limit})")
+  # Race membership changes are published as race updates
+  etag = collection_etag(request, "checkpoint", "race")
+  if is_not_modified(request, etag):
+    return not_modified(etag)
+  response.headers["ETag"] = etag
   if race_id is not None:
     return await checkpoint_crud.get_checkpoints_of_race(db, race_id)
 
   return await checkpoint_crud.get_checkpoints(db, skip, limit)
 
 
+@router.get("/roster/{checkpoint_uuid}", response_model=CheckpointRosterResponse)
+async def get_checkpoint_roster(
+  checkpoint_uuid: str,
+  since: str | None = Query(None),
+  db: AsyncSession = Depends(get_db)
+):
+  """Get the RFID cards of runners in active races at a checkpoint, for validating scans on the device."""
+  logger.debug(f"Getting roster of checkpoint {checkpoint_uuid} (since={since})")
+  roster = await checkpoint_crud.get_checkpoint_roster(db, checkpoint_uuid, since)
+  if roster is None:
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"Checkpoint with uuid {checkpoint_uuid} not found"
+    )
+  return roster
+
+
 @router.get("/{checkpoint_id}", response_model=CheckpointResponse)
 async def get_checkpoint(
   checkpoint_id: int,
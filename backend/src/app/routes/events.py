@@ -2,11 +2,14 @@ from datetime import datetime
 import logging
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import config
 from app.core.db import get_db
-from app.schemas.event import EventCreate, EventResponse
+from app.core.etag import collection_etag, is_not_modified, not_modified
+from app.core.ingest import ingest_queue
+from app.schemas.event import EventBatchItem, EventBatchResponse, EventCreate, EventResponse
 from app.crud import event as event_crud
 
 from app.models.event import Event
@@ -18,26 +21,74 @@ router = APIRouter(prefix="/events", tags=["events"])
 
 @router.post("/", response_model=List[EventResponse], status_code=status.HTTP_201_CREATED)
 async def create_event(
-  event_in: EventCreate,
-  db: AsyncSession = Depends(get_db)
+  event_in: EventCreate
 ):
   """Create a new event (runner checkpoint scan)."""
   logger.debug(f"Creating event: runner={event_in.rfid_uid}, checkpoint={event_in.checkpoint_id}")
-  return await event_crud.create_event(db, event_in)
+  return await ingest_queue.submit(event_in)
+
+
+@router.post("/batch", response_model=EventBatchResponse)
+async def create_event_batch(
+  events_in: List[EventCreate],
+  db: AsyncSession = Depends(get_db)
+):
+  """Create events for a backlog of scans, e.g. from a checkpoint that was offline.
+
+  Scans are stored in one transaction and each one gets its own status.
+  Already stored scans are reported as duplicates, so retrying a batch is safe.
+  """
+  logger.debug(f"Creating batch of {len(events_in)} events")
+  if len(events_in) > config.EVENT_BATCH_MAX_SIZE:
+    raise HTTPException(
+      status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+      detail=f"At most {config.EVENT_BATCH_MAX_SIZE} scans per batch"
+    )
+
+  results = await event_crud.create_event_batch(db, events_in)
+  items = []
+  for index, (item_status, result) in enumerate(results):
+    if isinstance(result, HTTPException):
+      items.append(EventBatchItem(index=index, status=item_status, status_code=result.status_code, detail=result.detail))
+    else:
+      status_code = status.HTTP_201_CREATED if item_status == "created" else status.HTTP_200_OK
+      items.append(EventBatchItem(index=index, status=item_status, status_code=status_code, events=result))
+  return EventBatchResponse(
+    created=sum(1 for item in items if item.status == "created"),
+    duplicates=sum(1 for item in items if item.status == "duplicate"),
+    rejected=sum(1 for item in items if item.status == "rejected"),
+    items=items,
+  )
 
 
 @router.get("/", response_model=list[EventResponse])
 async def list_events(
+  request: Request,
+  response: Response,
   skip: int = 0,
   limit: int = 100,
   db: AsyncSession = Depends(get_db),
-  race_id: int | None = Query(None)
+  race_id: int | None = Query(None),
+  since_id: int | None = Query(None, description="Only return events with a greater ID")
 ):
-  """Get all events with pagination."""
-  logger.debug(f"Listing events (skip={skip}, limit={limit})")
+  """Get all events with pagination.
+
+  The X-Next-Cursor header holds the ID to pass as since_id to fetch only newer events.
+  Events committed concurrently can show up below a cursor already handed out,
+  so a poller should pass a since_id somewhat below it and merge by ID.
+  """
+  logger.debug(f"Listing events (skip={skip}, limit={limit}, since_id={since_id})")
+  # Deleting a race or removing a runner from it also deletes events
+  etag = collection_etag(request, "event", "race")
+  if is_not_modified(request, etag):
+    return not_modified(etag)
+  response.headers["ETag"] = etag
   if race_id is not None:
-    return await event_crud.get_events_of_race(db, race_id ,skip, limit)
-  return await event_crud.get_events(db, skip, limit)
+    events = await event_crud.get_events_of_race(db, race_id, skip, limit, since_id)
+  else:
+    events = await event_crud.get_events(db, skip, limit, since_id)
+  response.headers["X-Next-Cursor"] = str(events[-1].id if events else since_id or 0)
+  return events
 
 
 @router.get("/{event_id}", response_model=EventResponse)
@@ -1,9 +1,17 @@
 import logging
-from fastapi import APIRouter
+from fastapi import APIRouter, status
 
+from app.core.cache import lookup_cache
 from app.core.db import db_manager
+from app.core.device_stats import device_stats
 from app.core.config import config
-from app.schemas.health import HealthResponse, DatabaseHealthResponse
+from app.schemas.health import (
+  HealthResponse,
+  DatabaseHealthResponse,
+  CacheStatsResponse,
+  DeviceStatsReport,
+  DeviceStatsResponse,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,3 +34,22 @@ async def database_health():
   return {
     "status": "healthy" if is_healthy else "unhealthy"
   }
+
+
+@router.get("/cache", response_model=CacheStatsResponse)
+async def cache_stats():
+  logger.debug("Cache stats endpoint accessed")
+  return lookup_cache.stats()
+
+
+@router.post("/devices", response_model=DeviceStatsResponse, status_code=status.HTTP_202_ACCEPTED)
+async def report_device_stats(report: DeviceStatsReport):
+  """Store the latest stats a checkpoint device reports about itself (HTTP latency, reader, journal)."""
+  logger.debug(f"Stats reported by checkpoint {report.checkpoint_id}")
+  return device_stats.record(report.checkpoint_id, report.stats)
+
+
+@router.get("/devices", response_model=list[DeviceStatsResponse])
+async def list_device_stats():
+  logger.debug("Device stats endpoint accessed")
+  return device_stats.all()
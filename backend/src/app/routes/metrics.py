@@ -0,0 +1,17 @@
+import logging
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("", response_class=PlainTextResponse)
+async def metrics_text():
+  """Request latency, in-flight requests, DB sessions and queries, and ingest queue depth in Prometheus text format."""
+  return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,10 +1,11 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.core.db import get_db
-from app.schemas.race import RaceCreate, RaceUpdate, RaceResponse
+from app.core.etag import collection_etag, is_not_modified, not_modified
+from app.schemas.race import RaceCreate, RaceUpdate, RaceResponse, RunnerResultResponse
 from app.schemas.checkpoint import CheckpointResponse
 from app.schemas.runner import RunnerResponse
 from app.crud import race as race_crud
@@ -26,12 +27,18 @@ async def create_race(
 
 @router.get("/", response_model=list[RaceResponse])
 async def list_races(
+  request: Request,
+  response: Response,
   skip: int = 0,
   limit: int = 100,
   db: AsyncSession = Depends(get_db)
 ):
   """Get all races with pagination."""
   logger.debug(f"Listing races (skip={skip}, limit={limit})")
+  etag = collection_etag(request, "race")
+  if is_not_modified(request, etag):
+    return not_modified(etag)
+  response.headers["ETag"] = etag
   return await race_crud.get_races(db, skip, limit)
 
 
@@ -139,6 +146,22 @@ async def remove_checkpoint_from_race(
     )
 
 
+@router.get("/{race_id}/results", response_model=list[RunnerResultResponse])
+async def get_race_results(
+  race_id: int,
+  db: AsyncSession = Depends(get_db)
+):
+  """Get per-runner split times, status and rank for a race."""
+  logger.debug(f"Getting results for race ID: {race_id}")
+  race = await race_crud.get_race(db, race_id)
+  if not race:
+    raise HTTPException(
+      status_code=status.HTTP_404_NOT_FOUND,
+      detail=f"Race with ID {race_id} not found"
+    )
+  return await race_crud.get_race_results(db, race_id)
+
+
 # Race-Runner association endpoints
 @router.get("/{race_id}/runners", response_model=list[RunnerResponse])
 async def get_race_runners(
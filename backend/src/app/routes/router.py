@@ -1,11 +1,15 @@
 import logging
 from fastapi import APIRouter
 
+from app.core.config import config
+
 from app.routes.health import router as health_router
 from app.routes.runners import router as runners_router
 from app.routes.checkpoints import router as checkpoints_router
 from app.routes.races import router as races_router
 from app.routes.events import router as events_router
+from app.routes.changes import router as changes_router
+from app.routes.metrics import router as metrics_router
 
 
 logger = logging.getLogger(__name__)
@@ -17,5 +21,8 @@ api_router.include_router(runners_router)
 api_router.include_router(checkpoints_router)
 api_router.include_router(races_router)
 api_router.include_router(events_router)
+api_router.include_router(changes_router)
+if config.METRICS_ENABLED:
+  api_router.include_router(metrics_router)
 
 logger.debug("API router initialized with all endpoints")
@@ -1,8 +1,9 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
+from app.core.etag import collection_etag, is_not_modified, not_modified
 from app.schemas.runner import RunnerCreate, RunnerUpdate, RunnerResponse
 from app.crud import runner as runner_crud
 
@@ -23,6 +24,8 @@ async def create_runner(
 
 @router.get("/", response_model=list[RunnerResponse])
 async def list_runners(
+  request: Request,
+  response: Response,
   skip: int = 0,
   limit: int = 100,
   db: AsyncSession = Depends(get_db),
@@ -30,6 +33,11 @@ async def list_runners(
 ):
   """Get all runners with pagination."""
   logger.debug(f"Listing runners (skip={skip}, limit={limit})")
+  # Race membership changes are published as race updates
+  etag = collection_etag(request, "runner", "race")
+  if is_not_modified(request, etag):
+    return not_modified(etag)
+  response.headers["ETag"] = etag
   if race_id is not None:
       return await runner_crud.get_runners_of_race(db, race_id, skip, limit)
   return await runner_crud.get_runners(db, skip, limit)
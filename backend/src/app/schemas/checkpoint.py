@@ -20,3 +20,11 @@ class CheckpointResponse(CheckpointBase):
   id: int
 
   model_config = ConfigDict(from_attributes=True)
+
+
+class CheckpointRosterResponse(BaseModel):
+  version: str
+  full: bool  # True: rfid_uids is the whole roster; False: apply added/removed to version `since`
+  rfid_uids: list[int]
+  added: list[int]
+  removed: list[int]
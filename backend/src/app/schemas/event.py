@@ -1,5 +1,6 @@
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from typing import Literal
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class EventBase(BaseModel):
@@ -13,9 +14,27 @@ class EventCreate(BaseModel):
   checkpoint_id: str
   rfid_uid: int
   timestamp: str
+  # Client-generated id, unique per checkpoint; without it the scan is identified by card and timestamp
+  scan_id: str | None = Field(None, max_length=64)
 
 
 class EventResponse(EventBase):
   id: int
+  scan_id: str | None = None
 
   model_config = ConfigDict(from_attributes=True)
+
+
+class EventBatchItem(BaseModel):
+  index: int  # position in the request
+  status: Literal["created", "duplicate", "rejected"]
+  status_code: int  # what POST /events would have answered for this scan
+  events: list[EventResponse] = []
+  detail: str | None = None
+
+
+class EventBatchResponse(BaseModel):
+  created: int
+  duplicates: int
+  rejected: int
+  items: list[EventBatchItem]
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict
+
+from pydantic import BaseModel, Field
 
 
 class HealthResponse(BaseModel):
@@ -8,3 +11,21 @@ class HealthResponse(BaseModel):
 
 class DatabaseHealthResponse(BaseModel):
   status: str
+
+
+class CacheStatsResponse(BaseModel):
+  checkpoints: int
+  checkpoint_hits: int
+  checkpoint_misses: int
+  runners: int
+  runner_hits: int
+  runner_misses: int
+
+
+class DeviceStatsReport(BaseModel):
+  checkpoint_id: str = Field(..., max_length=64)
+  stats: Dict[str, Any]
+
+
+class DeviceStatsResponse(DeviceStatsReport):
+  received_at: datetime
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, ConfigDict
 
 
@@ -35,3 +36,21 @@ class RaceCheckpointCreate(BaseModel):
 class RaceRunnerCreate(BaseModel):
   race_id: int
   runner_id: int
+
+
+# Results schemas
+class SplitResponse(BaseModel):
+  checkpoint_id: int
+  order: int
+  timestamp: datetime | None
+  split_seconds: float | None  # since the previous control the runner punched
+  elapsed_seconds: float | None  # since the first control
+
+
+class RunnerResultResponse(BaseModel):
+  runner_id: int
+  rank: int | None  # only finished runners are ranked
+  status: Literal["not_started", "running", "finished"]
+  last_checkpoint_id: int | None
+  elapsed_seconds: float | None
+  splits: list[SplitResponse]
@@ -12,6 +12,11 @@ from desktop_ui.services.checkpoint_service import CheckpointService, Checkpoint
 from desktop_ui.services.runner_service import RunnerService, RunnerModel
 from desktop_ui.services.event_service import EventService
 
+EVENTS_PAGE_SIZE = 1000
+# Ids below the cursor to fetch again: on PostgreSQL an event can be committed
+# after one with a greater id, and would otherwise be skipped for good
+EVENTS_CURSOR_OVERLAP = 200
+
 
 class AddRunnerToRaceDialog(QDialog):
     def __init__(self, all_runners: list[RunnerModel], race_runners: list[RunnerModel], parent=None):
@@ -69,8 +74,13 @@ class RaceDetailViewModel(QObject):
         self.runners: list[RunnerModel] = []
         self.checkpoints: list[CheckpointModel] = []
         self.events_map: dict[tuple[int, int], datetime] = {}  # (runner_id, checkpoint_id) -> timestamp
+        self._events_cursor = 0  # highest event id merged into events_map
+        self._events_generation = 0  # bumped by _reset_events to discard in-flight deltas
+        self._events_loading = False
+        self._events_pending = False
 
         self.event_service.eventsLoaded.connect(self._load_events)
+        self.event_service.eventsRemoved.connect(self._on_events_removed)
 
         self._load_race()
         self._load_checkpoints()
@@ -98,8 +108,21 @@ class RaceDetailViewModel(QObject):
         self.runner_service.get_runners_of_race(self.race_id, handle_callback)
 
     def _load_events(self):
-        def handle_callback(events):
-            self.events_map = {}
+        """Fetch events newer than the cursor and merge them into events_map."""
+        if self._events_loading:
+            self._events_pending = True
+            return
+        self._events_loading = True
+        generation = self._events_generation
+
+        def handle_callback(events, next_cursor):
+            if generation != self._events_generation:
+                self._events_loading = False
+                self._events_pending = False
+                self._load_events()
+                return
+
+            merged = {}
             for e in events:
                 ts = (
                     datetime.fromisoformat(e.timestamp)
@@ -108,11 +131,37 @@ class RaceDetailViewModel(QObject):
                 )
 
                 key = (e.runner_id, e.checkpoint_id)
-                self.events_map[key] = ts
-
-            self.data_updated.emit()
-
-        self.event_service.get_events_of_race(self.race_id, handle_callback)
+                merged[key] = ts
+
+            # The overlap window returns events already merged
+            changed = any(self.events_map.get(key) != ts for key, ts in merged.items())
+            self.events_map.update(merged)
+
+            advanced = next_cursor > self._events_cursor
+            self._events_cursor = max(self._events_cursor, next_cursor)
+            self._events_loading = False
+            if changed:
+                self.data_updated.emit()
+
+            if (len(events) == EVENTS_PAGE_SIZE and advanced) or self._events_pending:
+                self._events_pending = False
+                self._load_events()
+
+        since_id = max(0, self._events_cursor - EVENTS_CURSOR_OVERLAP)
+        self.event_service.get_events_of_race(self.race_id, handle_callback, since_id, EVENTS_PAGE_SIZE)
+
+    def _on_events_removed(self, race_id: int | None):
+        # The delta merge only adds events, so deletions need a full reload
+        if race_id is None or race_id == self.race_id:
+            self._reset_events()
+
+    def _reset_events(self):
+        """Drop merged events and reload them all, e.g. after events were deleted."""
+        self.events_map = {}
+        self._events_cursor = 0
+        self._events_generation += 1
+        self.data_updated.emit()
+        self._load_events()
 
     def refresh(self):
         self._load_race()
@@ -269,5 +318,6 @@ class RaceDetailFrame(QFrame):
     def on_runner_removed(self, success: bool):
         if success:
             self.view_model._load_runners()
+            self.view_model._reset_events()
         else:
             QMessageBox.warning(self, "Error", "Failed to remove runner from race.")
\ No newline at end of file
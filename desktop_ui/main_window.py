@@ -10,6 +10,7 @@ from desktop_ui.frames.header_menu_frame import HeaderMenuFrame
 from desktop_ui.content_controller import ContentController
 
 from desktop_ui.config import WINDOW_TITLE, WINDOW_WIDTH, WINDOW_HEIGHT
+from desktop_ui.services.change_feed_service import ChangeFeedService
 from desktop_ui.services.checkpoint_service import CheckpointService
 from desktop_ui.services.race_service import RaceService
 from desktop_ui.services.event_service import EventService
@@ -19,10 +20,12 @@ class MainWindow(QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
 
-        self.race_service = RaceService()
-        self.checkpoint_service = CheckpointService()
-        self.event_service = EventService()
-        self.runner_service = RunnerService()
+        self.change_feed = ChangeFeedService(self)
+        self.race_service = RaceService(change_feed=self.change_feed)
+        self.checkpoint_service = CheckpointService(change_feed=self.change_feed)
+        self.event_service = EventService(change_feed=self.change_feed)
+        self.runner_service = RunnerService(change_feed=self.change_feed)
+        self.change_feed.start()
 
         self.content_area = QStackedLayout()
         self.content_widget = QWidget()
@@ -0,0 +1,114 @@
+import json
+from typing import Callable
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QUrl
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
+
+CHANGES_URL = "http://127.0.0.1:8000/api/changes/"
+
+POLL_INTERVAL_MS = 1000  # fallback polling while the stream is down
+RECONNECT_INTERVAL_MS = 3000
+STALE_STREAM_MS = 45000  # backend sends a keep-alive every 15 s
+REFRESH_THROTTLE_MS = 200  # at most one refresh per entity in this window
+
+
+class ChangeFeedService(QObject):
+    """Listens to the backend Server-Sent Events change feed.
+
+    Services register with `watch` to refresh when their entity changes and
+    only fall back to polling while the stream is disconnected.
+    """
+    changed = pyqtSignal(str, str, dict)  # entity, action, change
+    connectionChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.manager = QNetworkAccessManager(self)
+        self.reply = None
+        self.connected = False
+        self._buffer = b""
+
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self.start)
+
+        self.watchdog = QTimer(self)
+        self.watchdog.setSingleShot(True)
+        self.watchdog.timeout.connect(self._on_stale)
+
+    def start(self):
+        if self.reply is not None:
+            return
+        request = QNetworkRequest(QUrl(CHANGES_URL))
+        request.setRawHeader(b"Accept", b"text/event-stream")
+        request.setTransferTimeout(0)
+        self._buffer = b""
+        self.reply = self.manager.get(request)
+        self.reply.readyRead.connect(self._on_ready_read)
+        self.reply.finished.connect(self._on_finished)
+        self.watchdog.start(STALE_STREAM_MS)
+
+    def watch(self, entity: str, poll_timer: QTimer, refresh: Callable[[], None]):
+        """Call `refresh` when `entity` changes; run `poll_timer` only while disconnected."""
+        throttle = QTimer(poll_timer.parent())
+        throttle.setSingleShot(True)
+        throttle.setInterval(REFRESH_THROTTLE_MS)
+        throttle.timeout.connect(refresh)
+
+        def on_change(changed_entity, action, change):
+            if changed_entity in (entity, "all") and not throttle.isActive():
+                throttle.start()
+
+        def on_connection_changed(connected):
+            if connected:
+                poll_timer.stop()
+                refresh()
+            else:
+                poll_timer.start(POLL_INTERVAL_MS)
+
+        self.changed.connect(on_change)
+        self.connectionChanged.connect(on_connection_changed)
+        if self.connected:
+            poll_timer.stop()
+
+    def _on_ready_read(self):
+        self.watchdog.start(STALE_STREAM_MS)
+        if not self.connected:
+            self._set_connected(True)
+
+        self._buffer += self.reply.readAll().data()
+        while b"\n\n" in self._buffer:
+            block, self._buffer = self._buffer.split(b"\n\n", 1)
+            self._dispatch(block.decode("utf-8"))
+
+    def _dispatch(self, block: str):
+        entity = None
+        data = []
+        for line in block.splitlines():
+            if line.startswith("event:"):
+                entity = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].strip())
+        if entity is None or not data:
+            return  # comment, keep-alive or retry hint
+        try:
+            change = json.loads("\n".join(data))
+        except ValueError as e:
+            print("Malformed change feed message:", e)
+            return
+        self.changed.emit(entity, change.get("action", ""), change)
+
+    def _on_stale(self):
+        if self.reply is not None:
+            self.reply.abort()
+
+    def _on_finished(self):
+        self.watchdog.stop()
+        self.reply.deleteLater()
+        self.reply = None
+        if self.connected:
+            self._set_connected(False)
+        self.reconnect_timer.start(RECONNECT_INTERVAL_MS)
+
+    def _set_connected(self, connected: bool):
+        self.connected = connected
+        self.connectionChanged.emit(connected)
@@ -7,6 +7,9 @@ from typing import List
 import asyncio
 import aiohttp
 
+from desktop_ui.services.change_feed_service import ChangeFeedService
+from desktop_ui.services.conditional_cache import ConditionalCache
+
 @dataclass
 class CheckpointModel:
     id: int
@@ -25,20 +28,24 @@ class CheckpointModel:
 class CheckpointService(QObject):
     checkpointsLoaded = pyqtSignal(list)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, change_feed: ChangeFeedService | None = None):
         super().__init__(parent)
         self.manager = QNetworkAccessManager(self)
+        self.cache = ConditionalCache()
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.get_checkpoints)
         self.timer.start(1000)
 
+        if change_feed is not None:
+            change_feed.watch("checkpoint", self.timer, self.get_checkpoints)
+
     def get_checkpoints(self):
         request = QNetworkRequest(
-            QUrl("http://127.0.0.1:8000/api/checkpoints")
+            QUrl("http://127.0.0.1:8000/api/checkpoints/")
         )
         request.setTransferTimeout(10000)
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(
             lambda r=reply: self._on_get_checkpoints(r)
         )
@@ -46,14 +53,17 @@ class CheckpointService(QObject):
 
     def _on_get_checkpoints(self, reply):
         try:
-            data = reply.readAll().data()
-            checkpoints_json = json.loads(data.decode("utf-8"))
-            self.checkpointsLoaded.emit([CheckpointModel.from_dict(r) for r in checkpoints_json])
+            checkpoints = self.cache.load(reply, self._parse_checkpoints)
+            self.checkpointsLoaded.emit(checkpoints)
             reply.deleteLater()
         except Exception as e:
             pass
             # print(e)
 
+    @staticmethod
+    def _parse_checkpoints(data: bytes) -> list:
+        return [CheckpointModel.from_dict(r) for r in json.loads(data.decode("utf-8"))]
+
     def delete_checkpoint(self, checkpoint_id):
         request = QNetworkRequest(
             QUrl("http://127.0.0.1:8000/api/checkpoints/{}".format(checkpoint_id))
@@ -92,18 +102,15 @@ class CheckpointService(QObject):
 
 
     def get_checkpoints_of_race(self, race_id: int, callback: Callable[[list], None]):
-        url = f"http://127.0.0.1:8000/api/checkpoints?race_id={race_id}"
+        url = f"http://127.0.0.1:8000/api/checkpoints/?race_id={race_id}"
         request = QNetworkRequest(QUrl(url))
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(lambda r=reply: self._on_get_checkpoints_of_race(r, callback))
 
 
     def _on_get_checkpoints_of_race(self, reply, callback: Callable[[list], None]):
         try:
-            data = reply.readAll().data()
-            checkpoints_json = json.loads(data.decode("utf-8"))
-            checkpoints = [CheckpointModel.from_dict(r) for r in checkpoints_json]
-            callback(checkpoints)
+            callback(self.cache.load(reply, self._parse_checkpoints))
         finally:
             reply.deleteLater()
 
@@ -0,0 +1,54 @@
+from collections import OrderedDict
+from typing import Callable, TypeVar
+from PyQt6.QtNetwork import QNetworkReply, QNetworkRequest
+
+T = TypeVar("T")
+
+MAX_ENTRIES = 64
+CACHED_ENTRY = QNetworkRequest.Attribute.User  # (etag, value) the If-None-Match was sent for
+
+
+class ConditionalCache:
+    """Remembers the ETag and parsed body of GET responses by URL.
+
+    `prepare` adds If-None-Match to a request; `load` parses a fresh reply or,
+    on 304 Not Modified, returns the value parsed from the earlier response
+    without touching the (empty) body.
+
+    The value is attached to the request together with its ETag, so a 304 can
+    still be served when the entry was evicted while the request was in flight.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, object]] = OrderedDict()
+
+    def prepare(self, request: QNetworkRequest) -> QNetworkRequest:
+        entry = self._entries.get(request.url().toString())
+        if entry is not None:
+            request.setRawHeader(b"If-None-Match", entry[0])
+            request.setAttribute(CACHED_ENTRY, entry)
+        return request
+
+    def load(self, reply: QNetworkReply, parse: Callable[[bytes], T]) -> T:
+        key = reply.request().url().toString()
+        status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        if status == 304:
+            entry = reply.request().attribute(CACHED_ENTRY)
+            if entry is None:
+                raise ValueError(f"304 Not Modified without a cached body for {key}")
+            # A response that arrived meanwhile may have stored a newer entry
+            self._store(key, self._entries.get(key, entry))
+            return entry[1]
+
+        value = parse(reply.readAll().data())
+        etag = reply.rawHeader(b"ETag").data()
+        if etag:
+            self._store(key, (etag, value))
+        return value
+
+    def _store(self, key: str, entry: tuple[bytes, object]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 import json
 from typing import Callable
 
+from desktop_ui.services.change_feed_service import ChangeFeedService
+from desktop_ui.services.conditional_cache import ConditionalCache
+
 @dataclass
 class EventModel:
     id: int
@@ -26,32 +29,61 @@ class EventService(QObject):
     eventsLoaded = pyqtSignal(list)
     eventLoaded = pyqtSignal(object)  # For single event
     raceRunnerEventsLoaded = pyqtSignal(list)  # Events for a specific runner in a race
+    eventsRemoved = pyqtSignal(object)  # race_id, or None when any race may have lost events
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, change_feed: ChangeFeedService | None = None):
         super().__init__(parent)
         self.manager = QNetworkAccessManager(self)
+        self.cache = ConditionalCache()
         self.base_url = "http://127.0.0.1:8000/api/events"
+        self.list_url = f"{self.base_url}/"
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.get_events)
         self.timer.start(1000)
 
+        self._feed_was_connected = False
+        if change_feed is not None:
+            change_feed.watch("event", self.timer, self.get_events)
+            change_feed.changed.connect(self._on_change)
+            change_feed.connectionChanged.connect(self._on_feed_connection_changed)
+
+    def _on_change(self, entity: str, action: str, change: dict):
+        """Tell views merging event deltas when events may have been deleted."""
+        if entity == "event" and action == "deleted":
+            self.eventsRemoved.emit(change.get("race_id"))
+        elif entity == "race" and action == "deleted":
+            self.eventsRemoved.emit(change.get("id"))
+        elif entity in ("runner", "checkpoint") and action == "deleted":
+            self.eventsRemoved.emit(None)
+        elif entity == "all" and action == "resync":
+            self.eventsRemoved.emit(None)
+
+    def _on_feed_connection_changed(self, connected: bool):
+        # Deletions published while the stream was down were missed
+        if connected and self._feed_was_connected:
+            self.eventsRemoved.emit(None)
+        self._feed_was_connected = self._feed_was_connected or connected
+
     def get_events(self):
-        request = QNetworkRequest(QUrl(self.base_url))
+        request = QNetworkRequest(QUrl(self.list_url))
         request.setTransferTimeout(10000)
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(lambda r=reply: self._on_get_events(r))
 
     def _on_get_events(self, reply):
         try:
-            data = reply.readAll().data()
-            events_json = json.loads(data.decode("utf-8"))
-            self.eventsLoaded.emit([EventModel.from_dict(e) for e in events_json])
+            events = self.cache.load(reply, self._parse_events)
+            self.eventsLoaded.emit(events)
         except Exception as e:
             print("Failed to load events:", e)
         finally:
             reply.deleteLater()
 
+    @staticmethod
+    def _parse_events(data: bytes) -> list:
+        return [EventModel.from_dict(e) for e in json.loads(data.decode("utf-8"))]
+
     def delete_event(self, event_id: int):
         request = QNetworkRequest(QUrl(f"{self.base_url}/{event_id}"))
         reply = self.manager.deleteResource(request)
@@ -59,6 +91,7 @@ class EventService(QObject):
 
     def _on_delete_event(self, reply):
         reply.deleteLater()
+        self.eventsRemoved.emit(None)
         self.get_events()
 
     def create_event(self, checkpoint_id: str, rfid_uid: int, timestamp: str):
@@ -112,19 +145,24 @@ class EventService(QObject):
 
 
 
-    def get_events_of_race(self, race_id: int, callback: Callable[[list], None]):
-        url = f"http://127.0.0.1:8000/api/events/?race_id={race_id}"
+    def get_events_of_race(self, race_id: int, callback: Callable[[list, int], None], since_id: int = 0, limit: int = 1000):
+        """Fetch events of a race newer than `since_id`; callback gets (events, next cursor)."""
+        url = f"http://127.0.0.1:8000/api/events/?race_id={race_id}&since_id={since_id}&limit={limit}"
         request = QNetworkRequest(QUrl(url))
-        reply = self.manager.get(request)
-        reply.finished.connect(lambda r=reply: self._on_get_events_of_race(r, callback))
+        reply = self.manager.get(self.cache.prepare(request))
+        reply.finished.connect(lambda r=reply: self._on_get_events_of_race(r, callback, since_id))
 
 
-    def _on_get_events_of_race(self, reply, callback: Callable[[list], None]):
+    def _on_get_events_of_race(self, reply, callback: Callable[[list, int], None], since_id: int):
         try:
-            data = reply.readAll().data()
-            j = json.loads(data.decode("utf-8"))
-            items = [EventModel.from_dict(x) for x in j]
-            callback(items)
+            items = self.cache.load(reply, self._parse_events)
+            cursor = reply.rawHeader(b"X-Next-Cursor").data()
+            next_cursor = int(cursor) if cursor else max((e.id for e in items), default=since_id)
+        except Exception as e:
+            print("Failed to load race events:", e)
+            items, next_cursor = [], since_id
+        try:
+            callback(items, next_cursor)
         finally:
             reply.deleteLater()
 
@@ -5,6 +5,9 @@ from typing import Callable
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QTimer
 from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkRequest
 
+from desktop_ui.services.change_feed_service import ChangeFeedService
+from desktop_ui.services.conditional_cache import ConditionalCache
+
 
 @dataclass
 class RaceModel:
@@ -29,19 +32,23 @@ class RaceService(QObject):
     racesLoaded = pyqtSignal(list)
     raceCreated = pyqtSignal(dict)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, change_feed: ChangeFeedService | None = None):
         super().__init__(parent)
         self.manager = QNetworkAccessManager(self)
+        self.cache = ConditionalCache()
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.get_races)
         self.timer.start(1000)
 
+        if change_feed is not None:
+            change_feed.watch("race", self.timer, self.get_races)
+
     def get_races(self):
         request = QNetworkRequest(
-            QUrl("http://127.0.0.1:8000/api/races")
+            QUrl("http://127.0.0.1:8000/api/races/")
         )
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(
             lambda r=reply: self._on_get_races(r)
         )
@@ -63,9 +70,11 @@ class RaceService(QObject):
 
     def _on_get_races(self, reply):
         try:
-            data = reply.readAll().data()
-            races_json = json.loads(data.decode("utf-8"))
-            self.racesLoaded.emit([RaceModel.from_dict(r) for r in races_json])
+            races = self.cache.load(
+                reply,
+                lambda data: [RaceModel.from_dict(r) for r in json.loads(data.decode("utf-8"))],
+            )
+            self.racesLoaded.emit(races)
             reply.deleteLater()
         except Exception as e:
             return []
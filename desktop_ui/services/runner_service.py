@@ -4,6 +4,9 @@ import json
 from dataclasses import dataclass
 from typing import Callable
 
+from desktop_ui.services.change_feed_service import ChangeFeedService
+from desktop_ui.services.conditional_cache import ConditionalCache
+
 @dataclass
 class RunnerModel:
     id: int
@@ -24,31 +27,39 @@ class RunnerModel:
 class RunnerService(QObject):
     runnersLoaded = pyqtSignal(list)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, change_feed: ChangeFeedService | None = None):
         super().__init__(parent)
         self.manager = QNetworkAccessManager(self)
+        self.cache = ConditionalCache()
         self.base_url = "http://127.0.0.1:8000/api/runners"
+        self.list_url = f"{self.base_url}/"
 
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.get_runners)
-        self.timer.start(1000)  # Poll every 1 second
+        self.timer.start(1000)  # Poll every 1 second until the change feed connects
+
+        if change_feed is not None:
+            change_feed.watch("runner", self.timer, self.get_runners)
 
     def get_runners(self):
-        request = QNetworkRequest(QUrl(self.base_url))
+        request = QNetworkRequest(QUrl(self.list_url))
         request.setTransferTimeout(10000)
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(lambda r=reply: self._on_get_runners(r))
 
     def _on_get_runners(self, reply):
         try:
-            data = reply.readAll().data()
-            runners_json = json.loads(data.decode("utf-8"))
-            self.runnersLoaded.emit([RunnerModel.from_dict(r) for r in runners_json])
+            runners = self.cache.load(reply, self._parse_runners)
+            self.runnersLoaded.emit(runners)
         except Exception as e:
             print("Failed to load runners:", e)
         finally:
             reply.deleteLater()
 
+    @staticmethod
+    def _parse_runners(data: bytes) -> list:
+        return [RunnerModel.from_dict(r) for r in json.loads(data.decode("utf-8"))]
+
     def delete_runner(self, runner_id: int):
         request = QNetworkRequest(QUrl(f"{self.base_url}/{runner_id}"))
         reply = self.manager.deleteResource(request)
@@ -76,15 +87,12 @@ class RunnerService(QObject):
     def get_runners_of_race(self, race_id: int, callback: Callable[[list], None]):
         url = f"http://127.0.0.1:8000/api/runners/?race_id={race_id}"
         request = QNetworkRequest(QUrl(url))
-        reply = self.manager.get(request)
+        reply = self.manager.get(self.cache.prepare(request))
         reply.finished.connect(lambda r=reply: self._on_get_runners_of_race(r, callback))
 
     def _on_get_runners_of_race(self, reply, callback: Callable[[list], None]):
         try:
-            data = reply.readAll().data()
-            j = json.loads(data.decode("utf-8"))
-            items = [RunnerModel.from_dict(x) for x in j]
-            callback(items)
+            callback(self.cache.load(reply, self._parse_runners))
         finally:
             reply.deleteLater()
 
@@ -3,11 +3,38 @@ CHECKPOINT_ID_FILE = "/home/pi/checkpoint_id.conf"
 BACKEND_IP = "10.193.181.108:8000"
 
 BACKEND_CHECKPOINT_URL = f"http://{BACKEND_IP}/api/events" 
+BACKEND_CHECKPOINT_BATCH_URL = f"http://{BACKEND_IP}/api/events/batch"
 BACKEND_REGISTER_CP_URL = f"http://{BACKEND_IP}/api/checkpoints" 
 BACKEND_CREATE_RUNNER_URL = f"http://{BACKEND_IP}/api/runners"
+BACKEND_DEVICE_STATS_URL = f"http://{BACKEND_IP}/api/health/devices"
+BACKEND_ROSTER_URL = f"http://{BACKEND_IP}/api/checkpoints/roster"
 
 
 BACKEND_TIMEOUT = 5  # sec
 BACKEND_REGISTER_TIMEOUT = 10  # sec
+BACKEND_POOL_SIZE = 3  # keep-alive connections; the uploader, roster sync and scan loop may use it at once
+BACKEND_CONNECT_RETRIES = 2  # retries of a failed connect, before anything was sent
+STATS_REPORT_INTERVAL = 600  # sec between device stats reports to the backend
 
-COOLDOWN_TIME = 3  # sec
\ No newline at end of file
+COOLDOWN_TIME = 3  # sec
+COOLDOWN_CAPACITY = 4096  # cards remembered at once; far more than can tap within COOLDOWN_TIME
+
+# Offline scan journal, drained to the backend in the background
+SCAN_JOURNAL_FILE = "/home/pi/scan_journal.db"
+UPLOAD_BACKOFF_INITIAL = 1  # sec
+UPLOAD_BACKOFF_MAX = 60  # sec
+UPLOAD_IDLE_INTERVAL = 5  # sec, how often the uploader looks for due retries
+UPLOAD_BATCH_SIZE = 200  # scans per POST /api/events/batch
+UPLOAD_MAX_REFUSALS = 60  # 4xx answers before a scan is parked; about an hour at UPLOAD_BACKOFF_MAX
+
+DISPLAY_MAX_FPS = 10  # OLED status refreshes per second
+
+# Card detection; the probe interval backs off from MIN to MAX while no card comes
+RFID_POLL_MIN_INTERVAL = 0.02  # sec
+RFID_POLL_MAX_INTERVAL = 0.1  # sec
+RFID_POLL_IDLE_AFTER = 5  # sec without a card before backing off
+RFID_METRICS_INTERVAL = 600  # sec between reader metrics log lines
+
+# Cards of runners in active races at this checkpoint, for validating scans offline
+ROSTER_FILE = "/home/pi/roster.json"
+ROSTER_SYNC_INTERVAL = 30  # sec
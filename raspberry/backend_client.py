@@ -1,56 +1,224 @@
+import threading
+import time
+from collections import deque
+
 import requests
-from app_config import BACKEND_CHECKPOINT_URL, BACKEND_CREATE_RUNNER_URL, BACKEND_TIMEOUT
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app_config import (
+    BACKEND_CHECKPOINT_URL,
+    BACKEND_CHECKPOINT_BATCH_URL,
+    BACKEND_CREATE_RUNNER_URL,
+    BACKEND_DEVICE_STATS_URL,
+    BACKEND_REGISTER_CP_URL,
+    BACKEND_ROSTER_URL,
+    BACKEND_CONNECT_RETRIES,
+    BACKEND_POOL_SIZE,
+    BACKEND_TIMEOUT,
+)
+
+
+def create_session():
+    """A keep-alive session: one TCP connection per pool slot, reused across requests.
+
+    Only failures to connect are retried here (nothing was sent, so a POST is
+    safe to repeat); everything else is left to the caller, e.g. the journal
+    uploader's backoff.
+    """
+    retry = Retry(
+        total=BACKEND_CONNECT_RETRIES,
+        connect=BACKEND_CONNECT_RETRIES,
+        read=0,
+        status=0,
+        backoff_factor=0.2,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BACKEND_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+class LatencyStats:
+    """Per-endpoint request latency kept on the device; `snapshot` is what gets reported."""
+
+    def __init__(self, window=256):
+        self.lock = threading.Lock()
+        self.window = window
+        self.endpoints = {}
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            entry = self.endpoints.get(endpoint)
+            if entry is None:
+                entry = self.endpoints[endpoint] = {
+                    "count": 0,
+                    "errors": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                    "recent": deque(maxlen=self.window),
+                }
+            entry["count"] += 1
+            if not ok:
+                entry["errors"] += 1
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["recent"].append(seconds)
+
+    def snapshot(self):
+        with self.lock:
+            snapshot = {}
+            for endpoint, entry in self.endpoints.items():
+                recent = sorted(entry["recent"])
+                snapshot[endpoint] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "avg_ms": round(entry["total"] / entry["count"] * 1000, 1),
+                    "max_ms": round(entry["max"] * 1000, 1),
+                    "p50_ms": round(recent[len(recent) // 2] * 1000, 1),
+                    "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1),
+                }
+            return snapshot
+
+
+# Shared by every BackendClient and by checkpoint registration
+session = create_session()
+latency_stats = LatencyStats()
 
 
 class BackendClient:
-    def __init__(self):
+    def __init__(self, session=session, stats=latency_stats):
         self.checkpoint_url = BACKEND_CHECKPOINT_URL
+        self.checkpoint_batch_url = BACKEND_CHECKPOINT_BATCH_URL
         self.runner_url = BACKEND_CREATE_RUNNER_URL
-    
+        self.register_url = BACKEND_REGISTER_CP_URL
+        self.device_stats_url = BACKEND_DEVICE_STATS_URL
+        self.roster_url = BACKEND_ROSTER_URL
+        self.session = session
+        self.stats = stats
+
+    def _request(self, method, endpoint, url, timeout=BACKEND_TIMEOUT, **kwargs):
+        """Send a request over the shared session and record how long it took."""
+        started = time.monotonic()
+        ok = False
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+            ok = response.status_code < 500
+            return response
+        finally:
+            self.stats.record(endpoint, time.monotonic() - started, ok)
+
+    def _post(self, endpoint, url, data, timeout=BACKEND_TIMEOUT):
+        return self._request("POST", endpoint, url, timeout=timeout, json=data)
+
     def send_checkpoint_data(self, checkpoint_id, rfid_uid, timestamp):
+        status = self.post_checkpoint_data(checkpoint_id, rfid_uid, timestamp)
+        if status == 200 or status == 201:
+            return True
+        if status is not None:
+            print("wrong response status code")
+        return False
+
+    def post_checkpoint_data(self, checkpoint_id, rfid_uid, timestamp):
+        """POST one scan; returns the HTTP status code, or None if the backend was unreachable."""
         data = {
             "checkpoint_id": checkpoint_id,
             "rfid_uid": rfid_uid,
             "timestamp": timestamp
         }
-        
+
         try:
-            response = requests.post(
-                self.checkpoint_url,
-                json=data,
-                headers={'Content-Type': 'application/json'},
-                timeout=BACKEND_TIMEOUT
-            )
-            
-            if response.status_code == 200 or response.status_code == 201:
-                return True
-            else:
-                print("wrong response status code")
-                return False
-                
+            response = self._post("event", self.checkpoint_url, data)
+            return response.status_code
+
         except requests.exceptions.RequestException as e:
             print(f"excepion occurred while sending request: {e}")
-            return False
-        
+            return None
+
+    def post_checkpoint_batch(self, scans):
+        """POST many (checkpoint_id, rfid_uid, timestamp) scans at once.
+
+        Returns one HTTP status code per scan, or None if the batch as a whole
+        did not go through.
+        """
+        data = [
+            {"checkpoint_id": checkpoint_id, "rfid_uid": rfid_uid, "timestamp": timestamp}
+            for checkpoint_id, rfid_uid, timestamp in scans
+        ]
+
+        try:
+            response = self._post("event_batch", self.checkpoint_batch_url, data)
+            if response.status_code != 200:
+                print(f"batch upload failed with status code {response.status_code}")
+                return None
+            return [item["status_code"] for item in response.json()["items"]]
+
+        except (requests.exceptions.RequestException, ValueError, KeyError) as e:
+            print(f"excepion occurred while sending batch: {e}")
+            return None
+
     def create_runner(self, rfid_uid):
         data = {
             "rfid_uid": rfid_uid
         }
-        
+
         try:
-            response = requests.post(
-                self.runner_url,
-                json=data,
-                headers={'Content-Type': 'application/json'},
-                timeout=BACKEND_TIMEOUT
-            )
-            
+            response = self._post("runner", self.runner_url, data)
+
             if response.status_code == 200 or response.status_code == 201:
                 return True
             else:
                 print("wrong response status code")
                 return False
-                
+
+        except requests.exceptions.RequestException as e:
+            print(f"excepion occurred while sending request: {e}")
+            return False
+
+    def register_checkpoint(self, checkpoint_id, timestamp, timeout=BACKEND_TIMEOUT):
+        """POST a new checkpoint; returns the HTTP status code, or None if the backend was unreachable."""
+        data = {
+            "checkpoint_id": checkpoint_id,
+            "timestamp": timestamp
+        }
+
+        try:
+            response = self._post("register_checkpoint", self.register_url, data, timeout=timeout)
+            return response.status_code
+
         except requests.exceptions.RequestException as e:
             print(f"excepion occurred while sending request: {e}")
+            return None
+
+    def report_stats(self, checkpoint_id, stats):
+        """Send this device's stats to the backend; returns True if they were accepted."""
+        try:
+            response = self._post("device_stats", self.device_stats_url, {"checkpoint_id": checkpoint_id, "stats": stats})
+            return response.status_code == 202
+
+        except requests.exceptions.RequestException as e:
+            print(f"excepion occurred while reporting stats: {e}")
             return False
+
+    def get_roster(self, checkpoint_id, since=None):
+        """Cards valid at this checkpoint, as a delta from version `since` when the backend still has it.
+
+        Returns the roster response, or None if it could not be fetched.
+        """
+        try:
+            response = self._request(
+                "GET",
+                "roster",
+                f"{self.roster_url}/{checkpoint_id}",
+                params={"since": since} if since else None,
+            )
+            if response.status_code != 200:
+                print(f"roster request failed with status code {response.status_code}")
+                return None
+            return response.json()
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"excepion occurred while fetching roster: {e}")
+            return None
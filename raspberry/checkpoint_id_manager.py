@@ -1,13 +1,13 @@
 import os
 from uuid import uuid4
-import requests
 from datetime import datetime
-from app_config import CHECKPOINT_ID_FILE, BACKEND_REGISTER_CP_URL, BACKEND_REGISTER_TIMEOUT
+from app_config import CHECKPOINT_ID_FILE, BACKEND_REGISTER_TIMEOUT
+from backend_client import BackendClient
 
-def load_checkpoint_id():
-    if os.path.exists(CHECKPOINT_ID_FILE):
+def load_checkpoint_id(path=CHECKPOINT_ID_FILE):
+    if os.path.exists(path):
         try:
-            with open(CHECKPOINT_ID_FILE, 'r') as f:
+            with open(path, 'r') as f:
                 checkpoint_id = f.read().strip()
                 if checkpoint_id:
                     return checkpoint_id
@@ -16,9 +16,9 @@ def load_checkpoint_id():
     return None
 
 
-def save_checkpoint_id(checkpoint_id):
+def save_checkpoint_id(checkpoint_id, path=CHECKPOINT_ID_FILE):
     try:
-        with open(CHECKPOINT_ID_FILE, 'w') as f:
+        with open(path, 'w') as f:
             f.write(checkpoint_id)
         return True
     except Exception as e:
@@ -26,54 +26,36 @@ def save_checkpoint_id(checkpoint_id):
         return False
 
 
-def register_with_backend():
+def register_with_backend(path=CHECKPOINT_ID_FILE, backend=None):
     checkpoint_id = str(uuid4())
     
-    data = {
-        "checkpoint_id": checkpoint_id,
-        "timestamp": datetime.now().isoformat()
-    }
+    status = (backend or BackendClient()).register_checkpoint(
+        checkpoint_id,
+        datetime.now().isoformat(),
+        timeout=BACKEND_REGISTER_TIMEOUT
+    )
     
-    try:
-        response = requests.post(
-            BACKEND_REGISTER_CP_URL,
-            json=data,
-            headers={'Content-Type': 'application/json'},
-            timeout=BACKEND_REGISTER_TIMEOUT
-        )
-        
-        if response.status_code == 200 or response.status_code == 201:
-            save_checkpoint_id(checkpoint_id)
-            return checkpoint_id
-        else:
-            """
-            case when post request with checkpoint id failed:
-            
-            checkpoint still can send standard event reqest using generated uuid
-            but backend doesnt have checkpoint id in the db
-            """
-            print("wrong response status code")
-            save_checkpoint_id(checkpoint_id)
-            return checkpoint_id
-            
-    except requests.exceptions.RequestException as e:
+    if status != 200 and status != 201:
         """
-            case when post request with checkpoint id failed:
-            
-            checkpoint still can send standard event reqest using generated uuid
-            but backend doesnt have checkpoint id in the db
+        case when post request with checkpoint id failed:
+        
+        checkpoint still can send standard event reqest using generated uuid
+        but backend doesnt have checkpoint id in the db
         """
-        print(f"excepion occurred while sending request: {e}")
-        save_checkpoint_id(checkpoint_id)
-        return checkpoint_id
+        if status is not None:
+            print("wrong response status code")
+    
+    save_checkpoint_id(checkpoint_id, path)
+    return checkpoint_id
 
 
-def get_or_create_checkpoint_id():
-    checkpoint_id = load_checkpoint_id()
+def get_or_create_checkpoint_id(path=CHECKPOINT_ID_FILE, backend=None):
+    # path and backend can be replaced, e.g. by the fleet simulator in sim/
+    checkpoint_id = load_checkpoint_id(path)
     
     if checkpoint_id:
         return checkpoint_id
     
-    checkpoint_id = register_with_backend()
+    checkpoint_id = register_with_backend(path, backend)
     
     return checkpoint_id
\ No newline at end of file
@@ -0,0 +1,46 @@
+import time
+from collections import OrderedDict
+
+
+class CooldownCache:
+    """Cards scanned within the last `cooldown` seconds, at most `capacity` of them.
+
+    Entries are kept in scan order, so the oldest is always first and expired
+    ones are dropped from the front as new scans come in: checks and inserts
+    are O(1) amortized and memory stays bounded however many cards an event
+    sees. When full, the oldest card is evicted early; it may then be
+    accepted again before its cooldown ends.
+    """
+
+    def __init__(self, cooldown, capacity=4096, clock=time.monotonic):
+        self.cooldown = cooldown
+        self.capacity = capacity
+        self.clock = clock
+        self.entries = OrderedDict()  # uid -> time of last scan
+        self.evicted_early = 0
+
+    def __contains__(self, uid):
+        scanned_at = self.entries.get(uid)
+        return scanned_at is not None and self.clock() - scanned_at < self.cooldown
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, uid):
+        now = self.clock()
+        entries = self.entries
+        entries[uid] = now
+        entries.move_to_end(uid)
+        self.prune(now)
+
+    def prune(self, now=None):
+        now = self.clock() if now is None else now
+        entries = self.entries
+        cutoff = now - self.cooldown
+        while entries:
+            scanned_at = entries[next(iter(entries))]
+            if scanned_at > cutoff and len(entries) <= self.capacity:
+                break
+            if scanned_at > cutoff:
+                self.evicted_early += 1
+            entries.popitem(last=False)
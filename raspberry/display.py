@@ -0,0 +1,139 @@
+import threading
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+FONT_FILE = "./lib/oled/Font.ttf"
+
+# Layout of the 96x64 screen: static checkpoint header, status area below it
+STATUS_Y = 44
+STATUS_ROW_HEIGHT = 10
+STATUS_FONT_SIZE = 9
+
+ONLINE_COLOR = (0, 255, 0)
+OFFLINE_COLOR = (255, 0, 0)
+UNKNOWN_COLOR = (90, 90, 90)
+
+
+@lru_cache(maxsize=None)
+def font(size):
+    """Load the display font once per size."""
+    try:
+        return ImageFont.truetype(FONT_FILE, size)
+    except OSError as e:
+        print(f"exception occurred while loading font: {e}")
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def text_tile(text, color, size):
+    """Render `text` once; status fields repeat the same few strings."""
+    face = font(size)
+    left, top, right, bottom = face.getbbox(text)
+    tile = Image.new("RGB", (max(1, right), max(1, bottom)), "BLACK")
+    ImageDraw.Draw(tile).text((0, 0), text, font=face, fill=color)
+    return tile
+
+
+class DisplayCompositor(threading.Thread):
+    """Owns the OLED and redraws it on its own thread.
+
+    The checkpoint header is rendered once into a background layer; status
+    changes only recompose the status area from cached text tiles and send
+    it with ShowRegion, so `update` is a dict update the scan loop can call
+    as often as it likes. Redraws are capped at `max_fps`; updates arriving
+    in between are merged into the next one.
+    """
+
+    def __init__(self, oled, max_fps=10):
+        super().__init__(daemon=True, name="display")
+        self.oled = oled
+        self.min_interval = 1.0 / max_fps
+        self.lock = threading.Lock()
+        self.dirty = threading.Event()
+        self.stopped = threading.Event()
+        self.checkpoint_id = None
+        self.status = {
+            "mode": "CP",
+            "queue": 0,
+            "last_scan": None,
+            "last_ok": True,
+            "online": None,
+        }
+        self.background = None  # header layer of self.checkpoint_id
+        self.background_shown = False
+        self.frames = 0
+
+    def show_checkpoint(self, checkpoint_id):
+        with self.lock:
+            if checkpoint_id == self.checkpoint_id:
+                return
+            self.checkpoint_id = checkpoint_id
+            self.background = None
+        self.dirty.set()
+
+    def update(self, **fields):
+        """Change status fields (mode, queue, last_scan, last_ok, online)."""
+        with self.lock:
+            if all(self.status.get(key) == value for key, value in fields.items()):
+                return
+            self.status.update(fields)
+        self.dirty.set()
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.dirty.set()
+        self.join(timeout)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.dirty.wait()
+            self.dirty.clear()
+            if self.stopped.is_set():
+                break
+            try:
+                self.render()
+            except Exception as e:
+                print(f"exception occurred while oled display: {e}")
+            self.stopped.wait(self.min_interval)
+
+    def render(self):
+        with self.lock:
+            checkpoint_id = self.checkpoint_id
+            status = dict(self.status)
+            if self.background is None:
+                self.background = self.render_background(checkpoint_id)
+                self.background_shown = False
+            background = self.background
+
+        strip = self.render_status(status)
+        if not self.background_shown:
+            frame = background.copy()
+            frame.paste(strip, (0, STATUS_Y))
+            self.oled.ShowImage(frame, 0, 0)
+            self.background_shown = True
+        else:
+            self.oled.ShowRegion(strip, 0, STATUS_Y)
+        self.frames += 1
+
+    def render_background(self, checkpoint_id):
+        image = Image.new("RGB", (self.oled.width, self.oled.height), "BLACK")
+        if checkpoint_id is not None:
+            draw = ImageDraw.Draw(image)
+            draw.text((8, 3), "Checkpoint:", font=font(13), fill="WHITE")
+            draw.text((8, 18), checkpoint_id[:8], font=font(20), fill="GREEN")
+        return image
+
+    def render_status(self, status):
+        strip = Image.new("RGB", (self.oled.width, self.oled.height - STATUS_Y), "BLACK")
+
+        strip.paste(text_tile(status["mode"], (255, 255, 255), STATUS_FONT_SIZE), (8, 0))
+        strip.paste(text_tile(f"Q:{status['queue']}", (255, 255, 255), STATUS_FONT_SIZE), (36, 0))
+        online = status["online"]
+        dot = UNKNOWN_COLOR if online is None else ONLINE_COLOR if online else OFFLINE_COLOR
+        ImageDraw.Draw(strip).ellipse((80, 1, 86, 7), fill=dot)
+
+        if status["last_scan"] is not None:
+            color = (0, 255, 0) if status["last_ok"] else (255, 0, 0)
+            strip.paste(text_tile(status["last_scan"], color, STATUS_FONT_SIZE), (8, STATUS_ROW_HEIGHT))
+        return strip
@@ -0,0 +1,53 @@
+import queue
+import threading
+
+
+class FeedbackWorker(threading.Thread):
+    """Plays buzzer/LED/OLED feedback patterns off the card scanning thread.
+
+    `submit` only enqueues a pattern and returns. Overlapping signals are
+    coalesced: the worker skips to the newest queued pattern, and a new signal
+    cuts the one that is playing short, so every runner in a queue at the
+    control gets immediate feedback and card polling never waits.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True, name="feedback")
+        self.commands = queue.Queue()
+        self.interrupt = threading.Event()
+        self.played = 0
+        self.coalesced = 0
+
+    def submit(self, pattern):
+        """Queue `pattern`, a callable taking no arguments, to be played next."""
+        self.commands.put(pattern)
+        self.interrupt.set()
+
+    def sleep(self, seconds):
+        """Wait inside a pattern; returns False if a newer pattern cut it short."""
+        return not self.interrupt.wait(seconds)
+
+    def stop(self, timeout=None):
+        self.commands.put(None)
+        self.interrupt.set()
+        self.join(timeout)
+
+    def run(self):
+        while True:
+            pattern = self.commands.get()
+            self.interrupt.clear()
+            while pattern is not None:
+                try:
+                    newer = self.commands.get_nowait()
+                except queue.Empty:
+                    break
+                self.coalesced += 1
+                pattern = newer
+            if pattern is None:
+                return
+
+            try:
+                pattern()
+                self.played += 1
+            except Exception as e:
+                print(f"exception occurred while playing feedback: {e}")
@@ -1,28 +1,26 @@
-import time
 import board
 import os
-import neopixel
 from hardware_config import buzzerPin, GPIO
-from PIL import Image, ImageDraw, ImageFont
 import lib.oled.SSD1331 as SSD1331
+from app_config import DISPLAY_MAX_FPS
+from display import DisplayCompositor
+from feedback import FeedbackWorker
+from led_strip import PATTERNS, LedStrip, create_pixels, mode_pattern
 
 
 class HardwareController:
     
     def __init__(self):
-        self.pixels = None    
+        self.feedback = FeedbackWorker()
+        self.feedback.start()
+
+        self.leds = None
         try:
-            self.pixels = neopixel.NeoPixel(
-                board.D18,
-                8, 
-                brightness=1.0/32, 
-                auto_write=False
-            )
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
+            self.leds = LedStrip(create_pixels(board.D18), sleep=self.feedback.sleep)
+            self.leds.off()
         except Exception as e:
             print(f"exception occurred while led init: {e}")
-            self.pixels = None
+            self.leds = None
         
         self.oled = None
         try:
@@ -33,77 +31,70 @@ class HardwareController:
         except Exception as e:
             print(f"exception occurred while oled init: {e}")
             self.oled = None
+
+        self.display = None
+        if self.oled is not None:
+            self.display = DisplayCompositor(self.oled, max_fps=DISPLAY_MAX_FPS)
+            self.display.start()
     
+    # Blocking patterns, played on the feedback thread. They return False
+    # as soon as a newer signal interrupts them.
+
     def buzzer_beep(self, count, duration, pause):
         for _ in range(count):
             GPIO.output(buzzerPin, GPIO.LOW) #on   
-            time.sleep(duration) #beep time
+            completed = self.feedback.sleep(duration) #beep time
             GPIO.output(buzzerPin, GPIO.HIGH) #of
-            if count > 1:
-                time.sleep(pause) #pause time
+            if not completed:
+                return False
+            if count > 1 and not self.feedback.sleep(pause): #pause time
+                return False
+        return True
     
-    def led_animation(self, color, blinks=2, duration=0.3, pause=0.1):
-        if self.pixels is None:
-            return
+    def led_animation(self, frames):
+        if self.leds is None:
+            return True
         
         try:
-            self.pixels = neopixel.NeoPixel(
-                board.D18,
-                8, 
-                brightness=1.0/32, 
-                auto_write=False
-            )
-
-            for _ in range(blinks):
-                self.pixels.fill(color)
-                self.pixels.show()
-                time.sleep(duration)
-                
-                self.pixels.fill((0, 0, 0))
-                self.pixels.show()
-                if blinks > 1:
-                    time.sleep(pause)
+            return self.leds.play(frames)
         except Exception as e:
             print(f"exception occurred while led animation: {e}")
+        return True
+
+    def _play(self, beeps, beep_duration, frames):
+        if self.buzzer_beep(count=beeps, duration=beep_duration, pause=0.1):
+            self.led_animation(frames)
+
+    # Signals return immediately; the feedback thread plays them
     
     def signal_success_checkpoint(self):
-        self.buzzer_beep(count=1, duration=0.15, pause=0.1)
-        self.led_animation(color=(0, 255, 0), blinks=2, duration=0.3, pause=0.1)
+        self.feedback.submit(lambda: self._play(1, 0.15, PATTERNS["success"]))
     
     def signal_success_register_runner(self):
-        self.buzzer_beep(count=1, duration=0.15, pause=0.1)
-        self.led_animation(color=(0, 0, 255), blinks=2, duration=0.3, pause=0.1)
+        self.feedback.submit(lambda: self._play(1, 0.15, PATTERNS["register"]))
     
     def signal_error(self):
-        self.buzzer_beep(count=2, duration=0.1, pause=0.1)
-        self.led_animation(color=(255, 0, 0), blinks=2, duration=0.2, pause=0.1)
+        self.feedback.submit(lambda: self._play(2, 0.1, PATTERNS["error"]))
+
+    def signal_mode(self, color):
+        self.feedback.submit(lambda: self.led_animation(mode_pattern(color)))
     
     def cleanup(self):
-        if self.pixels is not None:
-            self.pixels.fill((0, 0, 0))
-            self.pixels.show()
+        self.feedback.stop(timeout=1)
+        if self.leds is not None:
+            self.leds.deinit()
+        if self.display is not None:
+            self.display.stop(timeout=1)
         if self.oled is not None:
             self.oled.clear()
         GPIO.output(buzzerPin, GPIO.HIGH) #of
         GPIO.cleanup()
 
     def display_checkpoint_id(self, checkpoint_id):
-        if self.oled is None:
-            return
-        
-        try:
-            short_id = checkpoint_id[:8]
-            
-            image = Image.new("RGB", (self.oled.width, self.oled.height), "BLACK")
-            draw = ImageDraw.Draw(image)
-            
-            fontSmall = ImageFont.truetype('./lib/oled/Font.ttf', 13)
-            fontLarge = ImageFont.truetype('./lib/oled/Font.ttf', 20)
-            
-            draw.text((8, 5), "Checkpoint:", font=fontSmall, fill="WHITE")
-            draw.text((8, 30), short_id, font=fontLarge, fill="GREEN")
-            
-            self.oled.ShowImage(image, 0, 0)
-            
-        except Exception as e:
-            print(f"exception occurred while oled display: {e}")
\ No newline at end of file
+        if self.display is not None:
+            self.display.show_checkpoint(checkpoint_id)
+
+    def display_status(self, **fields):
+        """Refresh the OLED status area; returns immediately."""
+        if self.display is not None:
+            self.display.update(**fields)
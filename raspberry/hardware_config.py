@@ -28,6 +28,8 @@ GPIO.output(buzzerPin, 1)
 
 ws2812pin = 8
 
+rfidIrqPin = None  # MFRC522 IRQ output; None while it is not wired, then the reader is polled
+
 
 def configInfo():
     print("this is hardware configuration file\n")
@@ -0,0 +1,95 @@
+import time
+from functools import lru_cache
+
+import neopixel
+
+LED_COUNT = 8
+LED_BRIGHTNESS = 1.0 / 32
+
+OFF = (0, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+RED = (255, 0, 0)
+
+
+def solid(color, count=LED_COUNT):
+    return (tuple(color),) * count
+
+
+def blink(color, blinks, on, off, count=LED_COUNT):
+    """Frames of `blinks` flashes of the whole strip: a list of (frame, hold seconds)."""
+    frames = []
+    for i in range(blinks):
+        frames.append((solid(color, count), on))
+        frames.append((solid(OFF, count), off if i < blinks - 1 else 0))
+    return frames
+
+
+# Precomputed frame sequences, played by LedStrip.play
+PATTERNS = {
+    "success": blink(GREEN, 2, 0.3, 0.1),
+    "register": blink(BLUE, 2, 0.3, 0.1),
+    "error": blink(RED, 2, 0.2, 0.1),
+}
+
+
+@lru_cache(maxsize=16)
+def mode_pattern(color):
+    return blink(color, 1, 0.1, 0)
+
+
+def create_pixels(pin, count=LED_COUNT, brightness=LED_BRIGHTNESS):
+    """Open the WS2812 strip once; the DMA/PWM channel stays set up until deinit."""
+    return neopixel.NeoPixel(pin, count, brightness=brightness, auto_write=False)
+
+
+class LedStrip:
+    """Plays frame sequences on one long-lived NeoPixel driver.
+
+    `pixels` is anything with slice assignment and `show()` — the real
+    neopixel.NeoPixel or sim.fakes.FakeNeoPixel. A frame identical to the one
+    already on the strip is not pushed again.
+    """
+
+    def __init__(self, pixels, sleep=None):
+        self.pixels = pixels
+        self.sleep = sleep if sleep is not None else self._sleep
+        self.count = len(pixels)
+        self.current = None
+        self.pushed = 0
+        self.skipped = 0
+
+    @staticmethod
+    def _sleep(seconds):
+        time.sleep(seconds)
+        return True
+
+    def show(self, frame):
+        if frame == self.current:
+            self.skipped += 1
+            return
+        self.pixels[:] = frame
+        self.pixels.show()
+        self.current = frame
+        self.pushed += 1
+
+    def off(self):
+        self.show(solid(OFF, self.count))
+
+    def play(self, frames):
+        """Show each frame for its hold time; returns False if `sleep` was cut short.
+
+        An interrupted pattern leaves the strip dark.
+        """
+        for frame, hold in frames:
+            self.show(frame)
+            if hold and not self.sleep(hold):
+                self.off()
+                return False
+        return True
+
+    def deinit(self):
+        self.off()
+        deinit = getattr(self.pixels, "deinit", None)
+        if deinit is not None:
+            deinit()
@@ -61,7 +61,8 @@ class SSD1331(object):
         self._dc = config.DC_PIN
         self._rst = config.RST_PIN
         self._bl = config.BL_PIN
-
+        # What the display currently shows, as RGB565 bytes; None when unknown
+        self._frame = None
 
 
     """    Write register address and data     """
@@ -78,6 +79,7 @@ class SSD1331(object):
             return -1
         """Initialize dispaly"""    
         self.reset()
+        self.invalidate()
 
         self.command(DISPLAY_OFF)           #Display Off
         self.command(SET_CONTRAST_A)        #Set contrast for color A
@@ -128,35 +130,85 @@ class SSD1331(object):
         time.sleep(0.1)
         
     def SetWindows(self, Xstart, Ystart, Xend, Yend):
-        self.command(SET_COLUMN_ADDRESS) 
-        self.command(0)          #cloumn start address
-        self.command(OLED_WIDTH - 1)  #cloumn end address
-        self.command(SET_ROW_ADDRESS) 
-        self.command(0)          #page atart address
-        self.command(OLED_HEIGHT - 1)  #page end address
-    
+        """Address the window [Xstart, Xend) x [Ystart, Yend) for the next data write."""
+        GPIO.output(self._dc, GPIO.LOW)  # pylint: disable=no-member
+        config.spi_writebytes(bytes([
+            SET_COLUMN_ADDRESS, Xstart, Xend - 1,
+            SET_ROW_ADDRESS, Ystart, Yend - 1,
+        ]))
+
+    def invalidate(self):
+        """Forget the last frame, e.g. after a reset; the next update is sent in full."""
+        self._frame = None
+
+    @staticmethod
+    def to_rgb565(Image):
+        """Convert a PIL RGB image to the display's big-endian RGB565 bytes, shape (h, w, 2)."""
+        img = np.asarray(Image.convert("RGB"), dtype=np.uint8)
+        pix = np.empty(img.shape[:2] + (2,), dtype=np.uint8)
+        pix[..., 0] = (img[..., 0] & 0xF8) | (img[..., 1] >> 5)
+        pix[..., 1] = ((img[..., 1] << 3) & 0xE0) | (img[..., 2] >> 3)
+        return pix
+
+    def _write_window(self, pix, Xstart, Ystart):
+        height, width = pix.shape[:2]
+        self.SetWindows(Xstart, Ystart, Xstart + width, Ystart + height)
+        GPIO.output(self._dc, GPIO.HIGH)  # pylint: disable=no-member
+        # Full-width row ranges are already contiguous: no copy
+        config.spi_writebytes(np.ascontiguousarray(pix).reshape(-1))
+
+    def _update(self, pix, Xstart, Ystart, force=False):
+        """Send the parts of `pix` that differ from what the display shows.
+
+        Each run of consecutive changed rows goes out as one window, narrowed
+        to its changed columns. Returns the number of bytes sent.
+        """
+        height, width = pix.shape[:2]
+        if Xstart < 0 or Ystart < 0 or Xstart + width > self.width or Ystart + height > self.height:
+            raise ValueError('Region ({0}, {1}) {2}x{3} is outside the display ({4}x{5}).'
+                .format(Xstart, Ystart, width, height, self.width, self.height))
+
+        if force or self._frame is None:
+            changed = np.ones((height, width), dtype=bool)
+        else:
+            changed = np.any(pix != self._frame[Ystart:Ystart + height, Xstart:Xstart + width], axis=2)
+
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            return 0
+
+        sent = 0
+        # Split the changed rows into runs of consecutive rows
+        breaks = np.flatnonzero(np.diff(rows) > 1)
+        for run in np.split(rows, breaks + 1):
+            top, bottom = run[0], run[-1] + 1
+            columns = np.flatnonzero(changed[top:bottom].any(axis=0))
+            left, right = columns[0], columns[-1] + 1
+            self._write_window(pix[top:bottom, left:right], Xstart + left, Ystart + top)
+            sent += int((bottom - top) * (right - left) * 2)
+
+        if self._frame is not None:
+            self._frame[Ystart:Ystart + height, Xstart:Xstart + width] = pix
+        elif (width, height) == (self.width, self.height):
+            self._frame = pix.copy()
+        return sent
+
     def ShowImage(self,Image,Xstart,Ystart):
-        """Set buffer to value of Python Imaging Library image."""
-        """Write display buffer to physical display"""
+        """Write a full-screen PIL image, sending only what changed since the last frame."""
         imwidth, imheight = Image.size
         if imwidth != self.width or imheight != self.height:
             raise ValueError('Image must be same dimensions as display \
                 ({0}x{1}).' .format(self.width, self.height))
-        img = np.asarray(Image)
-        pix = np.zeros((self.height,self.width,2), dtype = np.uint8)
-        pix[...,[0]] = np.add(np.bitwise_and(img[...,[0]],0xF8),np.right_shift(img[...,[1]],5))
-        pix[...,[1]] = np.add(np.bitwise_and(np.left_shift(img[...,[1]],3),0xE0),np.right_shift(img[...,[2]],3))
-        pix = pix.flatten().tolist()
-        self.SetWindows ( 0, 0, self.width, self.height)
-        GPIO.output(self._dc, GPIO.HIGH)  # pylint: disable=no-member
-        for i in range(0,len(pix),1):
-            config.spi_writebyte(pix[i:i+1])		
+        return self._update(self.to_rgb565(Image), 0, 0)
+
+    def ShowRegion(self, Image, Xstart, Ystart):
+        """Write a PIL image smaller than the screen with its top-left corner at (Xstart, Ystart).
+
+        The rest of the display is left as it is.
+        """
+        return self._update(self.to_rgb565(Image), Xstart, Ystart)
 
     def clear(self):
         """Clear contents of image buffer"""
-        _buffer = [0xff]*(self.width * self.height * 2)
-        self.SetWindows ( 0, 0, self.width, self.height)
-        GPIO.output(self._dc, GPIO.HIGH)  # pylint: disable=no-member
-        for i in range(0,len(_buffer),1):
-            config.spi_writebyte(_buffer[i:i+1])		
-            #print "%d",_buffer[i:i+4096]
+        _buffer = np.full((self.height, self.width, 2), 0xff, dtype=np.uint8)
+        self._update(_buffer, 0, 0, force=True)
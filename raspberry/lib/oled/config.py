@@ -63,6 +63,20 @@ def spi_writebyte(data):
     spi.writebytes([data[0]])
 
 
+SPI_CHUNK = 4096  # spidev.writebytes limit
+
+
+def spi_writebytes(data):
+    """Send a whole buffer (bytes or a C-contiguous uint8 NumPy array)."""
+    if hasattr(spi, "writebytes2"):
+        # spidev >= 3.4 reads buffer objects directly and splits them itself
+        spi.writebytes2(data)
+        return
+    data = bytes(data)
+    for i in range(0, len(data), SPI_CHUNK):
+        spi.writebytes(list(data[i:i + SPI_CHUNK]))
+
+
 def module_init():
     # print("module_init")
     GPIO.setmode(GPIO.BCM)
@@ -1,12 +1,33 @@
 from enum import Enum
+import queue
+import threading
 import time
 from datetime import datetime
-from app_config import COOLDOWN_TIME
+from app_config import (
+    COOLDOWN_CAPACITY,
+    COOLDOWN_TIME,
+    RFID_METRICS_INTERVAL,
+    RFID_POLL_IDLE_AFTER,
+    RFID_POLL_MAX_INTERVAL,
+    RFID_POLL_MIN_INTERVAL,
+    ROSTER_FILE,
+    ROSTER_SYNC_INTERVAL,
+    SCAN_JOURNAL_FILE,
+    STATS_REPORT_INTERVAL,
+    UPLOAD_BACKOFF_INITIAL,
+    UPLOAD_BACKOFF_MAX,
+    UPLOAD_BATCH_SIZE,
+    UPLOAD_IDLE_INTERVAL,
+    UPLOAD_MAX_REFUSALS,
+)
 from checkpoint_id_manager import get_or_create_checkpoint_id
+from cooldown import CooldownCache
 from hardware import HardwareController
-from rfid_reader import RFIDReader
+from rfid_reader import CardWatcher, RFIDReader
+from roster import RosterCache, RosterSync
 from backend_client import BackendClient
-from hardware_config import buttonGreen, GPIO
+from scan_journal import JournalUploader, ScanJournal
+from hardware_config import buttonGreen, GPIO, rfidIrqPin
 
 class Mode(Enum):
     CHECKPOINT = "checkpoint"
@@ -14,13 +35,39 @@ class Mode(Enum):
 
 class CheckpointScanner:
 
-    def __init__(self, checkpoint_id):
+    def __init__(self, checkpoint_id, hardware=None, rfid=None, backend=None, journal_path=SCAN_JOURNAL_FILE, roster_path=ROSTER_FILE, rfid_irq_pin=rfidIrqPin):
+        # hardware, rfid and backend can be replaced, e.g. by the simulator in sim/
         self.checkpoint_id = checkpoint_id
-        self.hardware = HardwareController()
-        self.rfid = RFIDReader()
-        self.backend = BackendClient()
-        self.last_scanned_cards = {}  # uid -> timestamp of last scan
+        self.hardware = hardware or HardwareController()
+        self.rfid = rfid or RFIDReader()
+        self.cards = queue.Queue()
+        self.watcher = CardWatcher(
+            self.rfid,
+            self.cards,
+            irq_pin=rfid_irq_pin,
+            min_interval=RFID_POLL_MIN_INTERVAL,
+            max_interval=RFID_POLL_MAX_INTERVAL,
+            idle_after=RFID_POLL_IDLE_AFTER,
+        )
+        self.backend = backend or BackendClient()
+        self.journal = ScanJournal(journal_path)
+        self.uploader = JournalUploader(
+            self.journal,
+            self.backend,
+            backoff_initial=UPLOAD_BACKOFF_INITIAL,
+            backoff_max=UPLOAD_BACKOFF_MAX,
+            idle_interval=UPLOAD_IDLE_INTERVAL,
+            batch_size=UPLOAD_BATCH_SIZE,
+            max_refusals=UPLOAD_MAX_REFUSALS,
+            on_status=lambda pending, online: self.hardware.display_status(queue=pending, online=online),
+            report_stats=self.report_stats,
+            report_interval=STATS_REPORT_INTERVAL,
+        )
+        self.roster = RosterCache(roster_path)
+        self.roster_sync = RosterSync(self.roster, self.backend, checkpoint_id, ROSTER_SYNC_INTERVAL)
+        self.last_scanned_cards = CooldownCache(COOLDOWN_TIME, COOLDOWN_CAPACITY)
         self.current_mode = Mode.CHECKPOINT
+        self.stopped = threading.Event()
 
         self.hardware.display_checkpoint_id(checkpoint_id)
 
@@ -31,38 +78,55 @@ class CheckpointScanner:
             bouncetime=300
         )
     
+    def report_stats(self):
+        """Send HTTP latency, reader and journal stats to the backend (runs on the uploader thread)."""
+        self.backend.report_stats(self.checkpoint_id, {
+            "http": self.backend.stats.snapshot(),
+            "rfid": self.watcher.snapshot(),
+            "journal": self.journal.counts(),
+        })
+
     def _toggle_mode_callback(self, channel):
         if self.current_mode == Mode.CHECKPOINT:
             self.current_mode = Mode.REGISTER_RUNNER
-            self.hardware.led_animation(color=(125, 125, 125), blinks=1, duration=0.1, pause=0.3)
+            self.hardware.signal_mode(color=(125, 125, 125))
+            self.hardware.display_status(mode="REG")
         else:
             self.current_mode = Mode.CHECKPOINT
-            self.hardware.led_animation(color=(0, 0, 255), blinks=1, duration=0.1, pause=0.3)
+            self.hardware.signal_mode(color=(0, 0, 255))
+            self.hardware.display_status(mode="CP")
         print(f"Mode: {self.current_mode}")
 
     def is_card_in_cooldown(self, uid):
-        if uid in self.last_scanned_cards:
-            time_since_last_scan = time.time() - self.last_scanned_cards[uid] 
-            return time_since_last_scan < COOLDOWN_TIME
-        return False
+        return uid in self.last_scanned_cards
     
-    def process_card_checkpoint(self, uid):
-        timestamp = datetime.now().isoformat()
-        
-        success = self.backend.send_checkpoint_data(
-            self.checkpoint_id, 
-            uid, 
-            timestamp
-        )
-        
+    def process_card_checkpoint(self, uid, scanned_at=None):
+        # A card may wait in the queue for a moment; the punch time is when it was read
+        timestamp = (scanned_at or datetime.now()).isoformat()
+
+        # The punch counts once it is journaled; the uploader delivers it
+        try:
+            self.journal.append(self.checkpoint_id, uid, timestamp)
+            success = True
+        except Exception as e:
+            print(f"failed to journal scan: {e}")
+            success = False
+
         if success:
+            self.uploader.notify()
+
+        # Unknown cards are still journaled (the backend has the last word), but the runner sees red
+        accepted = success and self.roster.check(uid) is not False
+
+        if accepted:
             self.hardware.signal_success_checkpoint()
         else:
             self.hardware.signal_error()
+        self.hardware.display_status(last_scan=f"{uid:X}", last_ok=accepted)
         
-        self.last_scanned_cards[uid] = time.time() #dict[uid] is always up to date
+        self.last_scanned_cards.add(uid)
         
-        return success
+        return accepted
     
     def process_card_register_runner(self, uid):
         success = self.backend.create_runner(uid)
@@ -71,34 +135,53 @@ class CheckpointScanner:
             self.hardware.signal_success_register_runner()
         else:
             self.hardware.signal_error()
+        self.hardware.display_status(last_scan=f"{uid:X}", last_ok=success)
         
-        self.last_scanned_cards[uid] = time.time()  #dict[uid] is always up to date
+        self.last_scanned_cards.add(uid)
 
         return success
     
-    def process_card(self, uid):
+    def process_card(self, uid, scanned_at=None):
         if self.current_mode == Mode.CHECKPOINT:
-            return self.process_card_checkpoint(uid)
+            return self.process_card_checkpoint(uid, scanned_at)
         elif self.current_mode == Mode.REGISTER_RUNNER:
             return self.process_card_register_runner(uid)
 
     def run(self):
+        self.uploader.start()
+        self.roster_sync.start()
+        self.watcher.start()
+        metrics_logged_at = time.monotonic()
         try:
-            while True:
-                uid = self.rfid.read_card_uid()
+            while not self.stopped.is_set():
+                try:
+                    card = self.cards.get(timeout=0.5)
+                except queue.Empty:
+                    card = None
                 
-                if uid is not None:
-                    if not self.is_card_in_cooldown(uid):
-                        self.process_card(uid)
+                if card is not None:
+                    if not self.is_card_in_cooldown(card.uid):
+                        self.process_card(card.uid, card.scanned_at)
                 
-                time.sleep(0.1)
+                if time.monotonic() - metrics_logged_at >= RFID_METRICS_INTERVAL:
+                    print(f"rfid reader: {self.watcher.snapshot()}")
+                    metrics_logged_at = time.monotonic()
                 
         except KeyboardInterrupt:
             print("\n\nkeyboard interrupt")
         finally:
+            self.watcher.stop(timeout=1)
+            print(f"rfid reader: {self.watcher.snapshot()}")
+            self.roster_sync.stop(timeout=1)
+            self.uploader.stop(timeout=2)
+            self.journal.close()
             self.hardware.cleanup()
             print("good bye :)")
 
+    def stop(self):
+        """Make `run` return after the current poll."""
+        self.stopped.set()
+
 
 def main():
     checkpoint_id = get_or_create_checkpoint_id()
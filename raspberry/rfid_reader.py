@@ -1,5 +1,16 @@
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import RPi.GPIO as GPIO
 from mfrc522 import MFRC522
 
+# MFRC522 register values for arming a receive interrupt
+IRQ_ACTIVE_LOW_RX = 0xA0  # CommIEnReg: IRqInv | RxIEn, the IRQ pin falls when a card answers
+IRQ_CLEAR_ALL = 0x7F  # CommIrqReg: clear every pending interrupt bit
+START_SEND_SHORT_FRAME = 0x87  # BitFramingReg: StartSend, 7-bit REQA frame
+
 
 class RFIDReader:
 
@@ -18,3 +29,170 @@ class RFIDReader:
                 return uid_number
         return None
 
+    def arm_irq(self):
+        """Send a REQA without waiting for the answer; the IRQ pin falls if a card replies.
+
+        This replaces the busy-wait on CommIrqReg that MFRC522_Request does,
+        which is where an idle reader spends its CPU.
+        """
+        r = self.reader
+        r.Write_MFRC522(r.CommIEnReg, IRQ_ACTIVE_LOW_RX)
+        r.Write_MFRC522(r.CommIrqReg, IRQ_CLEAR_ALL)
+        r.Write_MFRC522(r.FIFODataReg, r.PICC_REQIDL)
+        r.Write_MFRC522(r.CommandReg, r.PCD_TRANSCEIVE)
+        r.Write_MFRC522(r.BitFramingReg, START_SEND_SHORT_FRAME)
+
+
+# detected_at/read_at are time.monotonic(); scanned_at is the wall clock time of the punch
+CardEvent = namedtuple("CardEvent", ["uid", "detected_at", "read_at", "scanned_at"])
+
+
+class ReaderMetrics:
+    """Counters of the card watcher; times are time.monotonic() seconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.probes = 0  # blocking requests (polling) or REQA arms (IRQ)
+        self.irq_wakeups = 0
+        self.cards = 0
+        self.errors = 0  # reader exceptions the watcher recovered from
+        self.read_latency_total = 0.0  # detection to UID in the queue
+        self.read_latency_max = 0.0
+        self.cpu_seconds = 0.0  # watcher thread CPU time
+
+    def record_card(self, event):
+        latency = event.read_at - event.detected_at
+        with self.lock:
+            self.cards += 1
+            self.read_latency_total += latency
+            self.read_latency_max = max(self.read_latency_max, latency)
+
+    def snapshot(self):
+        with self.lock:
+            hours = max(time.monotonic() - self.started_at, 1e-9) / 3600
+            return {
+                "probes": self.probes,
+                "irq_wakeups": self.irq_wakeups,
+                "cards": self.cards,
+                "errors": self.errors,
+                "read_latency_ms_avg": round(self.read_latency_total / self.cards * 1000, 2) if self.cards else None,
+                "read_latency_ms_max": round(self.read_latency_max * 1000, 2),
+                "cpu_seconds_per_hour": round(self.cpu_seconds / hours, 1),
+                "probes_per_hour": round(self.probes / hours),
+            }
+
+
+class CardWatcher(threading.Thread):
+    """Watches the reader and puts a CardEvent on `events` for every card read.
+
+    With `irq_pin` wired to the MFRC522 IRQ output, each probe is a REQA
+    sent without waiting, and the thread sleeps until the pin falls or the
+    probe interval passes. Without it the reader is polled. In both modes
+    the interval is `min_interval` while cards keep coming and doubles up to
+    `max_interval` once the reader has been idle for `idle_after` seconds.
+
+    A reader error (e.g. a garbled SPI transfer) is logged and the watcher
+    retries after a backoff of up to `error_backoff_max` seconds, so a
+    transient fault never stops card reading for good.
+    """
+
+    def __init__(self, rfid, events, irq_pin=None, min_interval=0.02, max_interval=0.1, idle_after=5.0,
+                 error_backoff_max=2.0):
+        super().__init__(daemon=True, name="card-watcher")
+        self.rfid = rfid
+        self.events = events
+        self.irq_pin = irq_pin
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_after = idle_after
+        self.error_backoff_max = error_backoff_max
+        self.failures = 0  # consecutive probes that raised
+        self.metrics = ReaderMetrics()
+        self.irq = threading.Event()
+        self.stopped = threading.Event()
+        self.interval = min_interval
+        self.last_card_at = time.monotonic()
+
+        if self.irq_pin is not None:
+            GPIO.setup(self.irq_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            GPIO.add_event_detect(self.irq_pin, GPIO.FALLING, callback=self._on_irq)
+
+    @property
+    def mode(self):
+        return "polling" if self.irq_pin is None else "irq"
+
+    def _on_irq(self, channel):
+        self.irq.set()
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.irq.set()
+        self.join(timeout)
+        if self.irq_pin is not None:
+            GPIO.remove_event_detect(self.irq_pin)
+
+    def snapshot(self):
+        return {"mode": self.mode, **self.metrics.snapshot()}
+
+    def next_interval(self, now):
+        if now - self.last_card_at < self.idle_after:
+            return self.min_interval
+        return min(self.max_interval, self.interval * 2)
+
+    def run(self):
+        cpu_started = time.thread_time()
+        while not self.stopped.is_set():
+            try:
+                if self.irq_pin is None:
+                    self.poll()
+                else:
+                    self.wait_for_irq()
+            except Exception as e:
+                self.on_error(e)
+            else:
+                if self.failures:
+                    print(f"rfid reader recovered after {self.failures} failed probes")
+                    self.failures = 0
+            self.metrics.cpu_seconds = time.thread_time() - cpu_started
+
+    def on_error(self, error):
+        self.failures += 1
+        self.metrics.errors += 1
+        backoff = min(self.error_backoff_max, self.min_interval * 2 ** self.failures)
+        if self.failures == 1 or backoff == self.error_backoff_max and self.failures % 10 == 0:
+            print(f"exception occurred while watching the rfid reader (retrying in {backoff:.2f} s): {error}")
+        self.stopped.wait(backoff)
+
+    def poll(self):
+        detected_at = time.monotonic()
+        self.metrics.probes += 1
+        uid = self.rfid.read_card_uid()
+        if uid is not None:
+            self.publish(uid, detected_at)
+        self.interval = self.next_interval(time.monotonic())
+        self.stopped.wait(self.interval)
+
+    def wait_for_irq(self):
+        self.irq.clear()
+        self.metrics.probes += 1
+        self.rfid.arm_irq()
+        if not self.irq.wait(self.interval) or self.stopped.is_set():
+            self.interval = self.next_interval(time.monotonic())
+            return
+        detected_at = time.monotonic()
+        self.metrics.irq_wakeups += 1
+        # A card answered the REQA; read it with a regular request
+        uid = self.rfid.read_card_uid()
+        if uid is not None:
+            self.publish(uid, detected_at)
+        self.interval = self.next_interval(time.monotonic())
+        # Keep a card that stays on the reader from being re-read in a tight loop
+        self.stopped.wait(self.min_interval)
+
+    def publish(self, uid, detected_at):
+        now = time.monotonic()
+        self.last_card_at = now
+        event = CardEvent(uid, detected_at, now, datetime.now())
+        self.metrics.record_card(event)
+        self.events.put(event)
@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+
+
+class RosterCache:
+    """RFID cards allowed at this checkpoint, synced from the backend and kept on disk.
+
+    Scans are validated against it locally, so the runner gets the right
+    green/red feedback even while the backend is unreachable. The set is
+    replaced, never mutated, so `check` needs no lock.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()  # serializes apply/save
+        self.version = None
+        self.uids = frozenset()
+        self.load()
+
+    def check(self, uid):
+        """True if the card is on the roster, False if not, None while no roster was ever fetched."""
+        if self.version is None:
+            return None
+        return uid in self.uids
+
+    def apply(self, roster):
+        """Apply a roster response: a full list, or cards added/removed since our version."""
+        with self.lock:
+            if roster["full"]:
+                uids = frozenset(roster["rfid_uids"])
+            else:
+                uids = (self.uids | frozenset(roster["added"])) - frozenset(roster["removed"])
+            changed = uids != self.uids or roster["version"] != self.version
+            self.uids = uids
+            self.version = roster["version"]
+            if changed:
+                self.save()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.uids = frozenset(data["rfid_uids"])
+            self.version = data["version"]
+        except Exception as e:
+            print(f"exception occurred while roster file reading: {e}")
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"version": self.version, "rfid_uids": sorted(self.uids)}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"exception occurred while roster file writing: {e}")
+
+
+class RosterSync(threading.Thread):
+    """Fetches roster changes every `interval` seconds; only deltas after the first sync."""
+
+    def __init__(self, roster, backend, checkpoint_id, interval):
+        super().__init__(daemon=True, name="roster-sync")
+        self.roster = roster
+        self.backend = backend
+        self.checkpoint_id = checkpoint_id
+        self.interval = interval
+        self.syncs = 0
+        self.stopped = threading.Event()
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.join(timeout)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sync()
+            self.stopped.wait(self.interval)
+
+    def sync(self):
+        roster = self.backend.get_roster(self.checkpoint_id, since=self.roster.version)
+        if roster is None:
+            return False
+        try:
+            self.roster.apply(roster)
+        except (KeyError, TypeError) as e:
+            print(f"exception occurred while applying roster: {e}")
+            return False
+        self.syncs += 1
+        return True
@@ -0,0 +1,234 @@
+import sqlite3
+import threading
+import time
+
+PENDING = "pending"
+SENT = "sent"
+REJECTED = "rejected"  # the backend refused the scan for good (e.g. malformed)
+PARKED = "parked"  # the backend kept refusing the scan (e.g. unknown card); no longer retried
+
+
+class ScanJournal:
+    """Durable append-only log of checkpoint scans.
+
+    Every scan is committed to SQLite before the runner gets feedback, so a
+    punch survives Wi-Fi outages, backend restarts and power loss. Rows stay
+    pending until the uploader gets them accepted by the backend.
+    """
+
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                checkpoint_id TEXT NOT NULL,
+                rfid_uid INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                last_error TEXT
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_scans_pending ON scans (status, next_attempt)")
+
+    def append(self, checkpoint_id, rfid_uid, timestamp):
+        """Record a scan; returns its journal id once it is on disk."""
+        with self.lock:
+            cursor = self.conn.execute(
+                "INSERT INTO scans (checkpoint_id, rfid_uid, timestamp) VALUES (?, ?, ?)",
+                (checkpoint_id, rfid_uid, timestamp),
+            )
+            return cursor.lastrowid
+
+    def due(self, limit=50, now=None):
+        """Pending scans whose backoff has expired, oldest first."""
+        now = time.time() if now is None else now
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, checkpoint_id, rfid_uid, timestamp, attempts FROM scans "
+                "WHERE status = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+
+    def next_due_in(self, now=None):
+        """Seconds until the next pending scan is due, None when nothing is pending."""
+        now = time.time() if now is None else now
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT MIN(next_attempt) FROM scans WHERE status = ?", (PENDING,)
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - now)
+
+    def mark_sent(self, scan_ids):
+        self._set_status(scan_ids, SENT)
+
+    def mark_rejected(self, scan_id, error):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE scans SET status = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (REJECTED, error, scan_id),
+            )
+
+    def mark_failed(self, scan_id, retry_in, error):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE scans SET attempts = attempts + 1, next_attempt = ?, last_error = ? WHERE id = ?",
+                (time.time() + retry_in, error, scan_id),
+            )
+
+    def mark_deferred(self, scan_ids, retry_in, error):
+        """Retry later without counting an attempt, e.g. when the backend was unreachable."""
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE scans SET next_attempt = ?, last_error = ? WHERE id = ?",
+                [(time.time() + retry_in, error, scan_id) for scan_id in scan_ids],
+            )
+
+    def mark_parked(self, scan_id, error):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE scans SET status = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (PARKED, error, scan_id),
+            )
+
+    def counts(self):
+        """Number of scans per status."""
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM scans GROUP BY status").fetchall()
+        counts = {PENDING: 0, SENT: 0, REJECTED: 0, PARKED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _set_status(self, scan_ids, status):
+        if not scan_ids:
+            return
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE scans SET status = ?, attempts = attempts + 1 WHERE id = ?",
+                [(status, scan_id) for scan_id in scan_ids],
+            )
+
+
+class JournalUploader(threading.Thread):
+    """Background thread draining the scan journal to the backend.
+
+    Network errors, server errors and "not found" answers (e.g. the race is
+    not active yet, or the runner is registered later) are retried with
+    exponential backoff; scans the backend can never accept are marked
+    rejected, and those it refused with another 4xx on `max_refusals`
+    attempts are parked, so the pending count can drain to 0. Only answers
+    count as attempts, not an unreachable backend. Nothing is ever deleted
+    from the journal.
+    """
+
+    def __init__(self, journal, backend, backoff_initial, backoff_max, idle_interval, batch_size=200, on_status=None,
+                 report_stats=None, report_interval=600, max_refusals=60):
+        super().__init__(daemon=True, name="journal-uploader")
+        self.journal = journal
+        self.backend = backend
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.idle_interval = idle_interval
+        self.batch_size = batch_size
+        self.max_refusals = max_refusals
+        self.offline_failures = 0  # consecutive drains that could not reach the backend
+        self.on_status = on_status  # called with pending=<int>, online=<bool> after each drain
+        self.report_stats = report_stats  # called every report_interval while online, on this thread
+        self.report_interval = report_interval
+        self.last_report = time.monotonic()
+        self.wakeup = threading.Event()
+        self.stopped = threading.Event()
+
+    def notify(self):
+        """Wake the uploader, e.g. right after a new scan was journaled."""
+        self.wakeup.set()
+
+    def stop(self, timeout=None):
+        self.stopped.set()
+        self.wakeup.set()
+        self.join(timeout)
+
+    def backoff(self, failures):
+        return min(self.backoff_max, self.backoff_initial * 2 ** max(0, failures - 1))
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.drain()
+            self.report_status()
+            self.maybe_report_stats()
+            if self.offline_failures:
+                # A new scan must not cut an outage backoff short
+                self.stopped.wait(self.backoff(self.offline_failures))
+                continue
+            wait = self.journal.next_due_in()
+            self.wakeup.wait(self.idle_interval if wait is None else min(wait, self.idle_interval))
+            self.wakeup.clear()
+
+    def report_status(self):
+        if self.on_status is None:
+            return
+        try:
+            self.on_status(pending=self.journal.counts()[PENDING], online=self.offline_failures == 0)
+        except Exception as e:
+            print(f"exception occurred while reporting upload status: {e}")
+
+    def maybe_report_stats(self):
+        if self.report_stats is None or self.offline_failures:
+            return
+        if time.monotonic() - self.last_report < self.report_interval:
+            return
+        self.last_report = time.monotonic()
+        try:
+            self.report_stats()
+        except Exception as e:
+            print(f"exception occurred while reporting stats: {e}")
+
+    def drain(self):
+        """Send due scans, a batch at a time; returns how many were accepted.
+
+        A single live scan goes to POST /api/events, where the backend's ingest
+        queue groups it with other checkpoints' scans; a backlog goes to
+        POST /api/events/batch. Neither stores a scan twice, so re-sending
+        after a lost response is safe.
+        """
+        accepted = 0
+        while not self.stopped.is_set():
+            due = self.journal.due(limit=self.batch_size)
+            if not due:
+                break
+
+            if len(due) == 1:
+                status = self.backend.post_checkpoint_data(*due[0][1:4])
+                statuses = None if status is None else [status]
+            else:
+                statuses = self.backend.post_checkpoint_batch([scan[1:4] for scan in due])
+
+            if statuses is None:
+                self.offline_failures += 1
+                self.journal.mark_deferred([scan[0] for scan in due], 0, "network error")
+                break  # backend unreachable; back off before the next try
+            self.offline_failures = 0
+
+            sent = []
+            for (scan_id, _, _, _, attempts), status in zip(due, statuses):
+                if 200 <= status < 300:
+                    sent.append(scan_id)
+                elif status in (400, 422):
+                    self.journal.mark_rejected(scan_id, f"HTTP {status}")
+                elif 400 <= status < 500 and attempts + 1 >= self.max_refusals:
+                    self.journal.mark_parked(scan_id, f"HTTP {status}")
+                else:
+                    self.journal.mark_failed(scan_id, self.backoff(attempts + 1), f"HTTP {status}")
+            self.journal.mark_sent(sent)
+            accepted += len(sent)
+        return accepted
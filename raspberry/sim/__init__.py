@@ -0,0 +1,6 @@
+"""Run the checkpoint software without a Raspberry Pi.
+
+`sim.fakes.install()` registers stand-ins for the Pi-only modules; the other
+modules here are measurements and load generators built on top of them.
+Run them from the raspberry/ directory, e.g. `python -m sim.feedback_throughput`.
+"""
@@ -0,0 +1,75 @@
+"""Cooldown bookkeeping for 100k distinct cards: the old dict vs CooldownCache.
+
+  python -m sim.cooldown_cache --cards 100000
+
+Cards arrive every `--spacing` simulated seconds (a multi-day event with
+each runner seen once per checkpoint), and every scan does the check and
+the insert the scanner does. Time is simulated, so this measures the data
+structure only.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from app_config import COOLDOWN_CAPACITY, COOLDOWN_TIME
+from cooldown import CooldownCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_dict(cards, spacing, clock):
+    last_scanned_cards = {}
+    for uid in range(cards):
+        clock.now += spacing
+        if uid in last_scanned_cards and clock() - last_scanned_cards[uid] < COOLDOWN_TIME:
+            continue
+        last_scanned_cards[uid] = clock()
+    return last_scanned_cards
+
+
+def run_cache(cards, spacing, clock):
+    cache = CooldownCache(COOLDOWN_TIME, COOLDOWN_CAPACITY, clock=clock)
+    for uid in range(cards):
+        clock.now += spacing
+        if uid in cache:
+            continue
+        cache.add(uid)
+    return cache
+
+
+def measure(cards, spacing, run):
+    run(cards, spacing, Clock())  # warm up
+
+    tracemalloc.start()
+    structure = run(cards, spacing, Clock())
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del structure
+
+    started = time.perf_counter()
+    structure = run(cards, spacing, Clock())
+    elapsed = time.perf_counter() - started
+    return {
+        "cards": cards,
+        "entries_kept": len(structure),
+        "retained_kib": round(retained / 1024),
+        "ns_per_scan": round(elapsed / cards * 1e9),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=100_000)
+    parser.add_argument("--spacing", type=float, default=0.5, help="simulated seconds between scans")
+    args = parser.parse_args()
+    print(json.dumps({
+        "dict": measure(args.cards, args.spacing, run_dict),
+        "cooldown_cache": measure(args.cards, args.spacing, run_cache),
+    }, indent=2))
@@ -0,0 +1,119 @@
+"""Cost of refreshing the checkpoint OLED: full redraw vs DisplayCompositor.
+
+  python -m sim.display_refresh --refreshes 200 --font /path/to/Font.ttf
+
+"redraw" is the old display_checkpoint_id approach (load both fonts from
+disk, draw the whole screen, send it) extended with the status line;
+"compositor" re-renders only the status area from cached text tiles. Both
+use the same SSD1331 driver on a fake SPI device. Font.ttf ships with the
+Waveshare demo, not this repo; without it both fall back to PIL's default
+font.
+"""
+import argparse
+import json
+import os
+import time
+
+from sim import fakes
+
+fakes.install()
+
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+import display  # noqa: E402
+import lib.oled.SSD1331 as SSD1331  # noqa: E402
+from lib.oled import config  # noqa: E402
+
+CHECKPOINT_ID = "3f2a9c1e-5b7d-4c1a-9e2f-0123456789ab"
+
+
+def load_font(path, size):
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def redraw(oled, font_file, status):
+    image = Image.new("RGB", (oled.width, oled.height), "BLACK")
+    draw = ImageDraw.Draw(image)
+    font_small = load_font(font_file, 13)
+    font_large = load_font(font_file, 20)
+    font_status = load_font(font_file, display.STATUS_FONT_SIZE)
+    draw.text((8, 3), "Checkpoint:", font=font_small, fill="WHITE")
+    draw.text((8, 18), CHECKPOINT_ID[:8], font=font_large, fill="GREEN")
+    draw.text((8, display.STATUS_Y), f"{status['mode']}  Q:{status['queue']}", font=font_status, fill="WHITE")
+    draw.text((8, display.STATUS_Y + display.STATUS_ROW_HEIGHT), status["last_scan"], font=font_status, fill="GREEN")
+    oled.ShowImage(image, 0, 0)
+
+
+def statuses(count):
+    return [{"mode": "CP", "queue": i % 7, "last_scan": f"{0x4F2A00 + i:X}", "last_ok": True, "online": True} for i in range(count)]
+
+
+def measure(refreshes, font_file, compositor):
+    oled = SSD1331.SSD1331()
+    config.module_init()
+    states = statuses(refreshes + 1)
+
+    if compositor:
+        screen = display.DisplayCompositor(oled)
+        screen.show_checkpoint(CHECKPOINT_ID)
+        screen.update(**states[0])
+        screen.render()
+    else:
+        redraw(oled, font_file, states[0])
+
+    config.spi.reset_stats()
+    update_seconds = 0.0
+    started = time.perf_counter()
+    for status in states[1:]:
+        if compositor:
+            before = time.perf_counter()
+            screen.update(**status)  # what the scan loop pays
+            update_seconds += time.perf_counter() - before
+            screen.render()  # on the display thread in the checkpoint
+        else:
+            redraw(oled, font_file, status)
+    elapsed = time.perf_counter() - started
+
+    spi = config.spi
+    result = {
+        "refreshes": refreshes,
+        "refresh_ms": round(elapsed / refreshes * 1000, 3),
+        "refreshes_per_second": round(refreshes / (elapsed + spi.modeled_seconds)),
+        "bytes_per_refresh": round(spi.bytes / refreshes),
+    }
+    if compositor:
+        result["update_call_us"] = round(update_seconds / refreshes * 1e6, 2)
+    return result
+
+
+def measure_threaded(seconds, updates_per_second):
+    """Hammer update() from the caller while the display thread caps redraws."""
+    oled = SSD1331.SSD1331()
+    config.module_init()
+    screen = display.DisplayCompositor(oled, max_fps=10)
+    screen.show_checkpoint(CHECKPOINT_ID)
+    screen.start()
+    states = statuses(int(seconds * updates_per_second))
+    for status in states:
+        screen.update(**status)
+        time.sleep(1.0 / updates_per_second)
+    screen.stop(timeout=1)
+    return {"updates": len(states), "frames_drawn": screen.frames, "seconds": seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--refreshes", type=int, default=200)
+    parser.add_argument("--font", default=display.FONT_FILE)
+    args = parser.parse_args()
+    if not os.path.exists(args.font):
+        print(f"{args.font} not found, using PIL's default font")
+    display.FONT_FILE = args.font
+    print(json.dumps({
+        "redraw": measure(args.refreshes, args.font, compositor=False),
+        "compositor": measure(args.refreshes, args.font, compositor=True),
+        "compositor_thread": measure_threaded(2, 200),
+    }, indent=2))
@@ -0,0 +1,357 @@
+"""Stand-ins for RPi.GPIO, board, neopixel, mfrc522 and spidev, plus fake devices and a fake backend.
+
+Call `install()` before importing main, hardware or rfid_reader:
+
+    from sim import fakes
+    fakes.install()
+    import main
+"""
+import sys
+import threading
+import time
+import types
+from collections import deque
+
+from backend_client import LatencyStats
+
+# Rough timings of the real parts, used to keep simulated loops honest
+NEOPIXEL_BIT_TIME = 1.25e-6  # sec, WS2812 data rate is 800 kHz
+NEOPIXEL_LATCH_TIME = 50e-6  # sec
+NEOPIXEL_INIT_TIME = 0.005  # sec, rpi_ws281x mapping the DMA/PWM registers and allocating buffers
+RFID_REQUEST_TIME = 0.002  # sec, one REQA round trip with the MFRC522 when a card answers
+RFID_EMPTY_REQUEST_TIME = 0.015  # sec, MFRC522_Request busy-polling CommIrqReg until its timer expires
+RFID_IRQ_DELAY = 0.001  # sec, REQA sent to the IRQ pin falling when a card answers
+SPI_CALL_OVERHEAD = 40e-6  # sec, one spidev ioctl from Python
+
+
+class CardField:
+    """Cards in front of the fake RFID reader; each tapped card is read once."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cards = deque()
+        self.reads = 0
+
+    def tap(self, uid):
+        with self.lock:
+            self.cards.append(uid)
+
+    def peek(self):
+        with self.lock:
+            return self.cards[0] if self.cards else None
+
+    def take(self):
+        with self.lock:
+            if not self.cards:
+                return None
+            self.reads += 1
+            return self.cards.popleft()
+
+
+card_field = CardField()
+
+
+class FakeMFRC522:
+    PICC_REQIDL = 0x26
+    MI_OK = 0
+    MI_NOTAGERR = 1
+    MI_ERR = 2
+    PCD_TRANSCEIVE = 0x0C
+    CommandReg = 0x01
+    CommIEnReg = 0x02
+    CommIrqReg = 0x04
+    FIFODataReg = 0x09
+    BitFramingReg = 0x0D
+
+    irq_pin = None  # GPIO pin the fake IRQ output is wired to
+
+    def __init__(self, *args, **kwargs):
+        self.command = None
+
+    @staticmethod
+    def _busy(seconds):
+        # The real library spins on SPI reads while it waits for the card
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+    def MFRC522_Request(self, mode):
+        if card_field.peek() is None:
+            self._busy(RFID_EMPTY_REQUEST_TIME)
+            return self.MI_NOTAGERR, None
+        self._busy(RFID_REQUEST_TIME)
+        return self.MI_OK, 0x10
+
+    def MFRC522_Anticoll(self):
+        uid = card_field.take()
+        if uid is None:
+            return self.MI_ERR, []
+        # Little-endian bytes, so RFIDReader.read_card_uid rebuilds the same number
+        return self.MI_OK, list(uid.to_bytes(5, "little"))
+
+    def Write_MFRC522(self, addr, val):
+        if addr == self.CommandReg:
+            self.command = val
+        elif addr == self.BitFramingReg and val & 0x80 and self.command == self.PCD_TRANSCEIVE:
+            # REQA on air: only a card in the field right now answers it
+            if card_field.peek() is not None and self.irq_pin is not None:
+                gpio = sys.modules["RPi.GPIO"]
+                threading.Timer(RFID_IRQ_DELAY, gpio.trigger, (self.irq_pin,)).start()
+
+    def Read_MFRC522(self, addr):
+        return 0
+
+
+class FakeNeoPixel(list):
+    instances = 0
+    shows = 0
+
+    def __init__(self, pin, n, brightness=1.0, auto_write=True, pixel_order=None):
+        super().__init__([(0, 0, 0)] * n)
+        self.brightness = brightness
+        self.auto_write = auto_write
+        FakeNeoPixel.instances += 1
+        time.sleep(NEOPIXEL_INIT_TIME)
+
+    def fill(self, color):
+        self[:] = [tuple(color)] * len(self)
+        if self.auto_write:
+            self.show()
+
+    def show(self):
+        FakeNeoPixel.shows += 1
+        time.sleep(len(self) * 24 * NEOPIXEL_BIT_TIME + NEOPIXEL_LATCH_TIME)
+
+    def deinit(self):
+        pass
+
+
+class FakeSpiDev:
+    """Counts SPI traffic and models its wire time instead of sleeping."""
+
+    def __init__(self, bus=None, device=None):
+        self.max_speed_hz = 500000
+        self.mode = 0
+        self.calls = 0
+        self.bytes = 0
+        self.modeled_seconds = 0.0
+
+    def open(self, bus, device):
+        pass
+
+    def close(self):
+        pass
+
+    def _transfer(self, data):
+        count = len(data) if isinstance(data, list) else memoryview(data).nbytes
+        self.calls += 1
+        self.bytes += count
+        self.modeled_seconds += SPI_CALL_OVERHEAD + count * 8 / self.max_speed_hz
+
+    def writebytes(self, data):
+        if len(data) > 4096:
+            raise OverflowError("spidev.writebytes is limited to 4096 bytes")
+        self._transfer(data)
+
+    def writebytes2(self, data):
+        self._transfer(data)
+
+    def xfer2(self, data):
+        self._transfer(data)
+        return [0] * len(data)
+
+    def reset_stats(self):
+        self.calls = 0
+        self.bytes = 0
+        self.modeled_seconds = 0.0
+
+
+def _gpio_module():
+    gpio = types.ModuleType("RPi.GPIO")
+    gpio.BCM, gpio.BOARD = 11, 10
+    gpio.OUT, gpio.IN = 0, 1
+    gpio.LOW, gpio.HIGH = 0, 1
+    gpio.PUD_UP, gpio.PUD_DOWN, gpio.PUD_OFF = 22, 21, 20
+    gpio.FALLING, gpio.RISING, gpio.BOTH = 32, 31, 33
+    gpio.pins = {}
+    gpio.callbacks = {}
+
+    gpio.setmode = lambda mode: None
+    gpio.setwarnings = lambda flag: None
+    gpio.setup = lambda pin, direction, pull_up_down=None, initial=None: gpio.pins.setdefault(pin, gpio.HIGH)
+    gpio.output = lambda pin, value: gpio.pins.__setitem__(pin, value)
+    gpio.input = lambda pin: gpio.pins.get(pin, gpio.HIGH)
+    gpio.cleanup = lambda *args: gpio.callbacks.clear()
+    gpio.remove_event_detect = lambda pin: gpio.callbacks.pop(pin, None)
+
+    def add_event_detect(pin, edge, callback=None, bouncetime=None):
+        gpio.callbacks[pin] = (edge, callback)
+
+    def trigger(pin):
+        """Simulate an edge on `pin`, e.g. a button press."""
+        _, callback = gpio.callbacks.get(pin, (None, None))
+        if callback is not None:
+            callback(pin)
+
+    gpio.add_event_detect = add_event_detect
+    gpio.trigger = trigger
+    return gpio
+
+
+def install():
+    """Register the fake modules; idempotent."""
+    if "RPi.GPIO" in sys.modules and getattr(sys.modules["RPi.GPIO"], "trigger", None):
+        return
+
+    gpio = _gpio_module()
+    rpi = types.ModuleType("RPi")
+    rpi.GPIO = gpio
+
+    board = types.ModuleType("board")
+    for pin in range(28):
+        setattr(board, f"D{pin}", pin)
+
+    neopixel = types.ModuleType("neopixel")
+    neopixel.NeoPixel = FakeNeoPixel
+    neopixel.GRB = "GRB"
+
+    mfrc522 = types.ModuleType("mfrc522")
+    mfrc522.MFRC522 = FakeMFRC522
+
+    spidev = types.ModuleType("spidev")
+    spidev.SpiDev = FakeSpiDev
+
+    sys.modules.update({
+        "RPi": rpi,
+        "RPi.GPIO": gpio,
+        "board": board,
+        "neopixel": neopixel,
+        "mfrc522": mfrc522,
+        "spidev": spidev,
+    })
+
+
+class FakeReader:
+    """Drop-in for RFIDReader with a card field of its own.
+
+    It sleeps instead of spinning like FakeMFRC522, so dozens of virtual
+    checkpoints can poll in one process without starving each other.
+    """
+
+    def __init__(self):
+        self.field = CardField()
+
+    def read_card_uid(self):
+        if self.field.peek() is None:
+            time.sleep(RFID_EMPTY_REQUEST_TIME)
+            return None
+        time.sleep(RFID_REQUEST_TIME)
+        return self.field.take()
+
+    def arm_irq(self):
+        pass
+
+
+class FakeHardware:
+    """Drop-in for HardwareController without feedback, LED or display threads; counts signals."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.signals = {"success_checkpoint": 0, "success_register_runner": 0, "error": 0, "mode": 0}
+        self.status = {}
+
+    def _count(self, signal):
+        with self.lock:
+            self.signals[signal] += 1
+
+    def signal_success_checkpoint(self):
+        self._count("success_checkpoint")
+
+    def signal_success_register_runner(self):
+        self._count("success_register_runner")
+
+    def signal_error(self):
+        self._count("error")
+
+    def signal_mode(self, color):
+        self._count("mode")
+
+    def display_checkpoint_id(self, checkpoint_id):
+        pass
+
+    def display_status(self, **fields):
+        self.status.update(fields)
+
+    def cleanup(self):
+        pass
+
+
+class FakeBackend:
+    """Drop-in for BackendClient that accepts scans in memory."""
+
+    def __init__(self, latency=0.0, online=True):
+        self.latency = latency
+        self.online = online
+        self.scans = []
+        self.seen = set()
+        self.runners = set()
+        self.reports = []
+        self.roster = None  # set of valid uids, or None for a backend without rosters
+        self.roster_version = 0
+        self.roster_requests = 0
+        self.stats = LatencyStats()
+        self.lock = threading.Lock()
+
+    def post_checkpoint_data(self, checkpoint_id, rfid_uid, timestamp):
+        statuses = self._accept("event", [(checkpoint_id, rfid_uid, timestamp)])
+        return None if statuses is None else statuses[0]
+
+    def send_checkpoint_data(self, checkpoint_id, rfid_uid, timestamp):
+        return self.post_checkpoint_data(checkpoint_id, rfid_uid, timestamp) in (200, 201)
+
+    def post_checkpoint_batch(self, scans):
+        return self._accept("event_batch", scans)
+
+    def _accept(self, endpoint, scans):
+        time.sleep(self.latency)
+        self.stats.record(endpoint, self.latency, self.online)
+        if not self.online:
+            return None
+        statuses = []
+        with self.lock:
+            for scan in scans:
+                scan = tuple(scan)
+                if scan in self.seen:
+                    statuses.append(200)
+                    continue
+                self.seen.add(scan)
+                self.scans.append(scan)
+                statuses.append(201)
+        return statuses
+
+    def report_stats(self, checkpoint_id, stats):
+        if not self.online:
+            return False
+        self.reports.append((checkpoint_id, stats))
+        return True
+
+    def create_runner(self, rfid_uid):
+        time.sleep(self.latency)
+        if not self.online:
+            return False
+        with self.lock:
+            self.runners.add(rfid_uid)
+        return True
+
+    def set_roster(self, uids):
+        with self.lock:
+            self.roster = set(uids)
+            self.roster_version += 1
+
+    def get_roster(self, checkpoint_id, since=None):
+        time.sleep(self.latency)
+        self.roster_requests += 1
+        if not self.online or self.roster is None:
+            return None
+        with self.lock:
+            return {"version": str(self.roster_version), "full": True, "rfid_uids": sorted(self.roster), "added": [], "removed": []}
@@ -0,0 +1,98 @@
+"""Cards per minute one checkpoint accepts with a queue of runners at the reader.
+
+  python -m sim.feedback_throughput --seconds 10
+
+Each runner taps as soon as the previous one was read (a saturated queue).
+"blocking" plays feedback on the scanning thread, as the checkpoint used to;
+"worker" hands it to the FeedbackWorker thread.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from sim import fakes
+
+fakes.install()
+
+import main  # noqa: E402  (needs the fakes)
+from hardware import HardwareController  # noqa: E402
+
+
+class InlineFeedback:
+    """The old behaviour: patterns play, and sleep, on the caller's thread."""
+
+    played = 0
+    coalesced = 0
+
+    def submit(self, pattern):
+        pattern()
+        self.played += 1
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+        return True
+
+    def stop(self, timeout=None):
+        pass
+
+
+def measure(seconds, blocking):
+    hardware = HardwareController()
+    if blocking:
+        hardware.feedback.stop()
+        hardware.feedback = InlineFeedback()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scanner = main.CheckpointScanner(
+            "sim-checkpoint",
+            hardware=hardware,
+            backend=fakes.FakeBackend(),
+            journal_path=os.path.join(tmp, "journal.db"),
+            roster_path=os.path.join(tmp, "roster.json"),
+        )
+
+        stop_feeding = threading.Event()
+
+        def runners_queue():
+            uid = 1
+            while not stop_feeding.is_set():
+                if fakes.card_field.peek() is None:
+                    fakes.card_field.tap(uid)
+                    uid += 1
+                time.sleep(0.001)
+
+        # Count punches the scanner gets through; cards read but still queued do not count
+        processed = []
+        process_card = scanner.process_card
+        scanner.process_card = lambda uid, scanned_at=None: processed.append(uid) or process_card(uid, scanned_at)
+
+        feeder = threading.Thread(target=runners_queue, daemon=True)
+        feeder.start()
+        runner = threading.Thread(target=scanner.run, daemon=True)
+        runner.start()
+        time.sleep(seconds)
+        scanner.stop()
+        runner.join()
+        stop_feeding.set()
+        feeder.join()
+        fakes.card_field.take()  # clear a card left waiting
+
+        return {
+            "cards": len(processed),
+            "cards_per_minute": round(len(processed) * 60 / seconds),
+            "feedback_played": hardware.feedback.played,
+            "feedback_coalesced": hardware.feedback.coalesced,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    print(json.dumps({
+        "blocking": measure(args.seconds, blocking=True),
+        "worker": measure(args.seconds, blocking=False),
+    }, indent=2))
@@ -0,0 +1,251 @@
+"""Load generator: a fleet of virtual checkpoints punching against a running backend.
+
+  python -m sim.fleet --backend http://127.0.0.1:8000 --checkpoints 20 --runners 300 --schedule mass
+
+Every virtual checkpoint is a real CheckpointScanner with its own
+BackendClient session, scan journal, uploader and roster sync; it registers
+through checkpoint_id_manager like a device on first boot. Only the reader
+and the hardware are fakes (sim.fakes.FakeReader and FakeHardware), so the
+requests the backend sees are the ones a fleet of Pis would send.
+
+The runners and a race holding every checkpoint are created over the API
+first. Schedules, all in wall clock seconds:
+
+  mass       everyone punches the start control within a few seconds
+  staggered  one runner starts every --stagger seconds
+  relay      teams of --legs runners; checkpoint 0 is the exchange, where
+             the incoming runner's finish and the next runner's start
+             punch land within seconds of each other
+
+Reported per endpoint: request count, error rate (connection failures and
+5xx) and latency percentiles, plus what the checkpoints' journals hold.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import requests
+
+from sim import fakes
+
+fakes.install()
+
+import main  # noqa: E402
+from app_config import BACKEND_IP  # noqa: E402
+from backend_client import BackendClient, LatencyStats, create_session  # noqa: E402
+from checkpoint_id_manager import get_or_create_checkpoint_id  # noqa: E402
+
+START_DELAY = 2.0  # sec, lets every scanner finish its first roster sync
+
+
+class FleetStats(LatencyStats):
+    """LatencyStats shared by the whole fleet that also keeps every sample, for exact percentiles."""
+
+    def __init__(self):
+        super().__init__()
+        self.samples = defaultdict(list)
+
+    def record(self, endpoint, seconds, ok):
+        super().record(endpoint, seconds, ok)
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+
+    def report(self):
+        report = {}
+        with self.lock:
+            for endpoint, samples in sorted(self.samples.items()):
+                samples = sorted(samples)
+                entry = self.endpoints[endpoint]
+
+                def percentile(q):
+                    return round(samples[int(q * (len(samples) - 1))] * 1000, 1)
+
+                report[endpoint] = {
+                    "requests": entry["count"],
+                    "errors": entry["errors"],
+                    "error_rate": round(entry["errors"] / entry["count"], 4),
+                    "p50_ms": percentile(0.50),
+                    "p95_ms": percentile(0.95),
+                    "p99_ms": percentile(0.99),
+                    "max_ms": round(samples[-1] * 1000, 1),
+                }
+        return report
+
+
+def fleet_client(base_url, stats):
+    """A BackendClient with a session of its own, talking to `base_url` instead of BACKEND_IP."""
+    client = BackendClient(session=create_session(), stats=stats)
+    default = f"http://{BACKEND_IP}"
+    for name, url in list(vars(client).items()):
+        if name.endswith("_url"):
+            setattr(client, name, base_url.rstrip("/") + url[len(default):])
+    return client
+
+
+def mass_start(rng, runners, checkpoints, leg, spread, **kwargs):
+    taps = []
+    for uid in runners:
+        pace = max(0.5, rng.gauss(1.0, spread))
+        start = rng.uniform(0, 3)
+        taps.extend((start + c * leg * pace, c, uid) for c in range(checkpoints))
+    return taps
+
+
+def staggered_start(rng, runners, checkpoints, leg, spread, stagger, **kwargs):
+    taps = []
+    for i, uid in enumerate(runners):
+        pace = max(0.5, rng.gauss(1.0, spread))
+        taps.extend((i * stagger + c * leg * pace, c, uid) for c in range(checkpoints))
+    return taps
+
+
+def relay(rng, runners, checkpoints, leg, spread, legs, **kwargs):
+    taps = []
+    for first in range(0, len(runners) - legs + 1, legs):
+        handover = rng.uniform(0, 3)
+        for uid in runners[first:first + legs]:
+            pace = max(0.5, rng.gauss(1.0, spread))
+            taps.extend((handover + c * leg * pace, c, uid) for c in range(checkpoints))
+            # Back at the exchange; the next runner of the team starts moments later
+            finish = handover + checkpoints * leg * pace
+            taps.append((finish, 0, uid))
+            handover = finish + rng.uniform(0.5, 2)
+    return taps
+
+
+SCHEDULES = {"mass": mass_start, "staggered": staggered_start, "relay": relay}
+
+
+def setup_race(base_url, checkpoint_ids, rfid_uids):
+    """Create an active race with every virtual checkpoint and runner in it."""
+    api = f"{base_url.rstrip('/')}/api"
+    with requests.Session() as s:
+        response = s.post(f"{api}/races/", json={
+            "name": f"fleet {datetime.now():%H:%M:%S}",
+            "date": datetime.now().isoformat(),
+            "is_active": True,
+            "location": "sim",
+        })
+        response.raise_for_status()
+        race_id = response.json()["id"]
+
+        ids = {c["uuid"]: c["id"] for c in s.get(f"{api}/checkpoints/", params={"limit": 100000}).json()}
+        for checkpoint_id in checkpoint_ids:
+            s.post(f"{api}/races/{race_id}/checkpoints/{ids[checkpoint_id]}").raise_for_status()
+
+        for rfid_uid in rfid_uids:
+            response = s.post(f"{api}/runners/", json={"rfid_uid": rfid_uid})
+            response.raise_for_status()
+            s.post(f"{api}/races/{race_id}/runners/{response.json()['id']}").raise_for_status()
+    return race_id
+
+
+def feed(readers, taps, started):
+    for offset, checkpoint, uid in taps:
+        time.sleep(max(0.0, started + offset - time.monotonic()))
+        readers[checkpoint].field.tap(uid)
+
+
+def drain(scanners, readers, timeout):
+    """Wait until every tapped card is read and every journal uploaded; returns the seconds it took."""
+    started = time.monotonic()
+    while time.monotonic() - started < timeout:
+        if all(reader.field.peek() is None for reader in readers) and all(
+            scanner.cards.empty() and scanner.journal.counts()["pending"] == 0 for scanner in scanners
+        ):
+            break
+        time.sleep(0.2)
+    return round(time.monotonic() - started, 2)
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    stats = FleetStats()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint_ids = []
+        clients = []
+        for i in range(args.checkpoints):
+            client = fleet_client(args.backend, stats)
+            clients.append(client)
+            checkpoint_ids.append(get_or_create_checkpoint_id(os.path.join(tmp, f"cp{i}.conf"), client))
+
+        # Fresh cards every run, so repeated runs against one backend do not collide
+        cards = random.SystemRandom()
+        rfid_uids = [cards.randrange(1 << 24, 1 << 40) for _ in range(args.runners)]
+        setup_race(args.backend, checkpoint_ids, rfid_uids)
+
+        readers = [fakes.FakeReader() for _ in checkpoint_ids]
+        scanners = [
+            main.CheckpointScanner(
+                checkpoint_id,
+                hardware=fakes.FakeHardware(),
+                rfid=reader,
+                backend=client,
+                journal_path=os.path.join(tmp, f"journal{i}.db"),
+                roster_path=os.path.join(tmp, f"roster{i}.json"),
+                rfid_irq_pin=None,
+            )
+            for i, (checkpoint_id, reader, client) in enumerate(zip(checkpoint_ids, readers, clients))
+        ]
+        threads = [threading.Thread(target=scanner.run, daemon=True) for scanner in scanners]
+        for thread in threads:
+            thread.start()
+
+        taps = sorted(SCHEDULES[args.schedule](
+            rng, rfid_uids, args.checkpoints,
+            leg=args.leg_seconds, spread=args.spread, stagger=args.stagger, legs=args.legs,
+        ))
+        time.sleep(START_DELAY)
+        started = time.monotonic()
+        feed(readers, taps, started)
+        schedule_seconds = round(time.monotonic() - started, 2)
+        drain_seconds = drain(scanners, readers, args.drain_timeout)
+
+        journals = defaultdict(int)
+        signals = defaultdict(int)
+        for scanner in scanners:
+            for status, count in scanner.journal.counts().items():
+                journals[status] += count
+            for signal, count in scanner.hardware.signals.items():
+                signals[signal] += count
+
+        for scanner in scanners:
+            scanner.stop()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    return {
+        "schedule": args.schedule,
+        "checkpoints": args.checkpoints,
+        "runners": args.runners,
+        "taps": len(taps),
+        "reads": sum(reader.field.reads for reader in readers),
+        "schedule_seconds": schedule_seconds,
+        "drain_seconds": drain_seconds,
+        "journal": dict(journals),
+        "feedback": dict(signals),
+        "endpoints": stats.report(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", default="http://127.0.0.1:8000", help="base URL of the backend under test")
+    parser.add_argument("--checkpoints", type=int, default=20)
+    parser.add_argument("--runners", type=int, default=300)
+    parser.add_argument("--schedule", choices=sorted(SCHEDULES), default="mass")
+    parser.add_argument("--leg-seconds", type=float, default=5.0, help="mean time between consecutive controls")
+    parser.add_argument("--spread", type=float, default=0.15, help="relative stdev of runner pace")
+    parser.add_argument("--stagger", type=float, default=0.5, help="seconds between starts (staggered)")
+    parser.add_argument("--legs", type=int, default=4, help="runners per relay team")
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
@@ -0,0 +1,93 @@
+"""Per-scan POST latency: a fresh requests.post per call vs the pooled BackendClient session.
+
+  python -m sim.http_session --requests 200 --rtt 0.03
+
+A local HTTP/1.1 server stands in for the backend. It emulates a field link
+by waiting one round trip `--rtt` when a TCP connection is opened (the
+handshake) and one per request. DNS lookups, which a fresh connection to a
+host name also pays, are not modeled.
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from backend_client import BackendClient, LatencyStats, create_session
+
+
+class LinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1  # headers and body in one write, or Nagle + delayed ACKs stall keep-alive replies
+    rtt = 0.0
+    connections = 0
+
+    def setup(self):
+        LinkHandler.connections += 1
+        time.sleep(self.rtt)  # TCP handshake
+        super().setup()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.rtt)
+        body = b'{"id": 1}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def post_fresh(url, data):
+    # What every BackendClient method used to do
+    return requests.post(url, json=data, headers={"Content-Type": "application/json"}, timeout=5).status_code
+
+
+def measure(url, count, pooled):
+    LinkHandler.connections = 0
+    client = BackendClient(session=create_session(), stats=LatencyStats())
+    client.checkpoint_url = url
+    latencies = []
+    for i in range(count):
+        started = time.perf_counter()
+        if pooled:
+            status = client.post_checkpoint_data("sim-checkpoint", i, "2026-01-01T09:00:00")
+        else:
+            status = post_fresh(url, {"checkpoint_id": "sim-checkpoint", "rfid_uid": i, "timestamp": "2026-01-01T09:00:00"})
+        assert status == 201
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    result = {
+        "requests": count,
+        "tcp_connections": LinkHandler.connections,
+        "latency_ms_median": round(statistics.median(latencies) * 1000, 2),
+        "latency_ms_p95": round(latencies[int(count * 0.95) - 1] * 1000, 2),
+    }
+    if pooled:
+        result["device_stats"] = client.stats.snapshot()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--rtt", type=float, default=0.03, help="emulated round trip time, seconds")
+    args = parser.parse_args()
+
+    LinkHandler.rtt = args.rtt
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LinkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/events"
+    try:
+        print(json.dumps({
+            "fresh_connection": measure(url, args.requests, pooled=False),
+            "pooled_session": measure(url, args.requests, pooled=True),
+        }, indent=2))
+    finally:
+        server.shutdown()
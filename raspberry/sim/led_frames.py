@@ -0,0 +1,96 @@
+"""LED pattern timing: re-creating the NeoPixel per animation vs one LedStrip.
+
+  python -m sim.led_frames --animations 200
+
+Hold times are skipped, so the numbers are the driver cost a pattern adds on
+top of its designed timing. "legacy" is the old led_animation: a new
+NeoPixel (DMA/PWM setup) for every animation and a push for every step.
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sim import fakes
+
+fakes.install()
+
+from led_strip import GREEN, LED_BRIGHTNESS, LED_COUNT, PATTERNS, RED, LedStrip, mode_pattern  # noqa: E402
+
+# (color, blinks, duration, pause) as the old signals passed them
+LEGACY_SIGNALS = [
+    (GREEN, 2, 0.3, 0.1),
+    (RED, 2, 0.2, 0.1),
+    ((0, 0, 255), 1, 0.1, 0.3),
+]
+SIGNALS = [PATTERNS["success"], PATTERNS["error"], mode_pattern((0, 0, 255))]
+
+
+class TimedNeoPixel(fakes.FakeNeoPixel):
+    shown_at = []
+
+    def show(self):
+        super().show()
+        TimedNeoPixel.shown_at.append(time.perf_counter())
+
+
+def no_hold(seconds):
+    return True
+
+
+def legacy_animation(color, blinks, duration, pause):
+    pixels = TimedNeoPixel(0, LED_COUNT, brightness=LED_BRIGHTNESS, auto_write=False)
+    for _ in range(blinks):
+        pixels.fill(color)
+        pixels.show()
+        no_hold(duration)
+        pixels.fill((0, 0, 0))
+        pixels.show()
+        if blinks > 1:
+            no_hold(pause)
+
+
+def _summary(first_frame, totals, shows, instances):
+    return {
+        "animations": len(totals),
+        "first_frame_ms_median": round(statistics.median(first_frame) * 1000, 3),
+        "animation_ms_median": round(statistics.median(totals) * 1000, 3),
+        "animation_ms_max": round(max(totals) * 1000, 3),
+        "frames_pushed": shows,
+        "driver_inits": instances,
+    }
+
+
+def measure(animations, legacy):
+    fakes.FakeNeoPixel.instances = 0
+    fakes.FakeNeoPixel.shows = 0
+    first_frame, totals = [], []
+
+    strip = None
+    if not legacy:
+        strip = LedStrip(TimedNeoPixel(0, LED_COUNT, brightness=LED_BRIGHTNESS, auto_write=False), sleep=no_hold)
+
+    for i in range(animations):
+        TimedNeoPixel.shown_at = []
+        started = time.perf_counter()
+        if legacy:
+            legacy_animation(*LEGACY_SIGNALS[i % len(LEGACY_SIGNALS)])
+        else:
+            strip.play(SIGNALS[i % len(SIGNALS)])
+        totals.append(time.perf_counter() - started)
+        first_frame.append(TimedNeoPixel.shown_at[0] - started)
+
+    result = _summary(first_frame, totals, fakes.FakeNeoPixel.shows, fakes.FakeNeoPixel.instances)
+    if strip is not None:
+        result["frames_skipped"] = strip.skipped
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--animations", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps({
+        "legacy": measure(args.animations, legacy=True),
+        "led_strip": measure(args.animations, legacy=False),
+    }, indent=2))
@@ -0,0 +1,98 @@
+"""SSD1331 frames/second over a fake SPI device: byte-per-byte vs bulk + diffing.
+
+  python -m sim.oled_fps --frames 50
+
+The fake device does not sleep; it adds up the wire time each transfer would
+take at the driver's 2 MHz clock plus a fixed per-ioctl cost, and "fps" is
+frames / (CPU time + modeled SPI time). CPU time is this machine's, so a Pi
+Zero is several times slower in absolute terms for both drivers.
+
+Scenarios: "full" alternates two unrelated full-screen frames, "clock"
+redraws a status screen whose seconds counter changes, "static" sends the
+same frame again.
+"""
+import argparse
+import json
+import time
+
+from sim import fakes
+
+fakes.install()
+
+import numpy as np  # noqa: E402
+from PIL import Image, ImageDraw, ImageFont  # noqa: E402
+
+import lib.oled.SSD1331 as SSD1331  # noqa: E402
+from lib.oled import config  # noqa: E402
+
+
+def legacy_show_image(oled, image):
+    """The old ShowImage: flatten to a list and send it one byte per ioctl."""
+    img = np.asarray(image)
+    pix = np.zeros((oled.height, oled.width, 2), dtype=np.uint8)
+    pix[..., [0]] = np.add(np.bitwise_and(img[..., [0]], 0xF8), np.right_shift(img[..., [1]], 5))
+    pix[..., [1]] = np.add(np.bitwise_and(np.left_shift(img[..., [1]], 3), 0xE0), np.right_shift(img[..., [2]], 3))
+    pix = pix.flatten().tolist()
+    for cmd in (SSD1331.SET_COLUMN_ADDRESS, 0, oled.width - 1, SSD1331.SET_ROW_ADDRESS, 0, oled.height - 1):
+        oled.command(cmd)
+    for i in range(0, len(pix), 1):
+        config.spi_writebyte(pix[i:i + 1])
+
+
+def status_screen(text, color):
+    image = Image.new("RGB", (SSD1331.OLED_WIDTH, SSD1331.OLED_HEIGHT), "BLACK")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    draw.text((8, 5), "Checkpoint:", font=font, fill="WHITE")
+    draw.text((8, 30), text, font=font, fill=color)
+    return image
+
+
+def scenario_frames(name, frames):
+    if name == "full":
+        noise = np.random.default_rng(0).integers(0, 256, (2, SSD1331.OLED_HEIGHT, SSD1331.OLED_WIDTH, 3), dtype=np.uint8)
+        images = [Image.fromarray(n, "RGB") for n in noise]
+        return [images[i % 2] for i in range(frames)]
+    if name == "clock":
+        return [status_screen(f"09:41:{i % 60:02d}", "GREEN") for i in range(frames)]
+    return [status_screen("3f2a9c1e", "GREEN")] * frames
+
+
+def measure(name, frames, legacy):
+    oled = SSD1331.SSD1331()
+    config.module_init()
+    images = scenario_frames(name, frames)
+    oled.ShowImage(images[0], 0, 0)  # the display starts out showing something
+
+    config.spi.reset_stats()
+    started = time.process_time()
+    for image in images[1:]:
+        if legacy:
+            legacy_show_image(oled, image)
+        else:
+            oled.ShowImage(image, 0, 0)
+    cpu = time.process_time() - started
+
+    count = len(images) - 1
+    spi = config.spi
+    return {
+        "frames": count,
+        "fps": round(count / (cpu + spi.modeled_seconds), 1),
+        "cpu_ms_per_frame": round(cpu / count * 1000, 3),
+        "spi_ms_per_frame": round(spi.modeled_seconds / count * 1000, 3),
+        "spi_calls_per_frame": round(spi.calls / count, 1),
+        "bytes_per_frame": round(spi.bytes / count),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=50)
+    args = parser.parse_args()
+    print(json.dumps({
+        name: {
+            "legacy": measure(name, args.frames, legacy=True),
+            "bulk_diff": measure(name, args.frames, legacy=False),
+        }
+        for name in ("full", "clock", "static")
+    }, indent=2))
@@ -0,0 +1,108 @@
+"""Card detection latency and reader CPU: sleep-polling vs CardWatcher.
+
+  python -m sim.rfid_detection --seconds 30
+
+Runners arrive in packs (4 cards 0.5 s apart, every 15 s). "legacy" is the
+old loop, read_card_uid() then sleep(0.1); "polling" is CardWatcher
+without an IRQ pin; "irq" is CardWatcher on a fake IRQ line. The fake
+MFRC522 spins for as long as the real library busy-waits on the chip, so
+the CPU numbers are meaningful relative to each other. Latency is the time
+from a card entering the field until its UID is in the scanner's queue.
+"""
+import argparse
+import json
+import queue
+import random
+import statistics
+import threading
+import time
+
+from sim import fakes
+
+fakes.install()
+
+from rfid_reader import CardWatcher, RFIDReader  # noqa: E402
+
+IRQ_PIN = 25
+PACK_SIZE = 4
+PACK_SPACING = 0.5  # sec between runners of a pack
+PACK_INTERVAL = 15.0  # sec between packs
+MIN_SECONDS = 1.0 + PACK_SIZE * PACK_SPACING + 1.0  # room for the first pack
+
+
+def arrivals(seconds, seed=7):
+    rng = random.Random(seed)
+    times = []
+    start = 1.0
+    while start < seconds - PACK_SIZE * PACK_SPACING:
+        times.extend(start + i * PACK_SPACING + rng.uniform(0, 0.1) for i in range(PACK_SIZE))
+        start += PACK_INTERVAL
+    return times
+
+
+def legacy_reader(rfid, events, stopped, cpu):
+    started = time.thread_time()
+    while not stopped.is_set():
+        uid = rfid.read_card_uid()
+        if uid is not None:
+            events.put((uid, time.monotonic()))
+        time.sleep(0.1)
+    cpu.append(time.thread_time() - started)
+
+
+def measure(seconds, mode):
+    fakes.FakeMFRC522.irq_pin = IRQ_PIN if mode == "irq" else None
+    rfid = RFIDReader()
+    events = queue.Queue()
+    stopped = threading.Event()
+    cpu = []
+
+    if mode == "legacy":
+        reader = threading.Thread(target=legacy_reader, args=(rfid, events, stopped, cpu), daemon=True)
+    else:
+        reader = CardWatcher(rfid, events, irq_pin=IRQ_PIN if mode == "irq" else None, idle_after=2.0)
+
+    tapped_at = {}
+    started = time.monotonic()
+    reader.start()
+    for uid, offset in enumerate(arrivals(seconds), start=1):
+        time.sleep(max(0.0, started + offset - time.monotonic()))
+        tapped_at[uid] = time.monotonic()
+        fakes.card_field.tap(uid)
+    time.sleep(max(0.0, started + seconds - time.monotonic()))
+
+    if mode == "legacy":
+        stopped.set()
+        reader.join()
+        cpu_seconds = cpu[0]
+    else:
+        reader.stop(timeout=1)
+        cpu_seconds = reader.metrics.cpu_seconds
+    fakes.card_field.take()  # a card left unread
+
+    latencies = []
+    while not events.empty():
+        event = events.get()
+        uid, read_at = (event.uid, event.read_at) if mode != "legacy" else event
+        latencies.append(read_at - tapped_at[uid])
+
+    elapsed = time.monotonic() - started
+    result = {
+        "cards": len(tapped_at),
+        "detected": len(latencies),
+        "latency_ms_median": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "latency_ms_max": round(max(latencies) * 1000, 1) if latencies else None,
+        "cpu_seconds_per_hour": round(cpu_seconds / elapsed * 3600),
+    }
+    if mode != "legacy":
+        result["probes_per_hour"] = reader.snapshot()["probes_per_hour"]
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30)
+    args = parser.parse_args()
+    if args.seconds < MIN_SECONDS:
+        parser.error(f"--seconds must be at least {MIN_SECONDS:g} for a pack of runners to arrive")
+    print(json.dumps({mode: measure(args.seconds, mode) for mode in ("legacy", "polling", "irq")}, indent=2))
@@ -0,0 +1,80 @@
+"""Runner feedback from the local roster vs from the backend, with the link going up and down.
+
+  python -m sim.roster_validation --cards 2000 --unknown 0.1 --offline 0.3
+
+Cards are punched at one checkpoint; `--unknown` of them belong to no active
+race there, and the backend is unreachable for `--offline` of the punches.
+"backend" asks the backend per punch (the answer the checkpoint gives when
+the link is up; offline it can only accept). "roster" checks the card
+against a RosterCache synced before the race. Feedback is correct when
+known cards get green and unknown cards get red.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from sim import fakes
+
+fakes.install()
+
+from roster import RosterCache, RosterSync  # noqa: E402
+
+BACKEND_RTT = 0.03  # sec, one request over the field link
+
+
+def punches(cards, unknown, offline, seed=3):
+    rng = random.Random(seed)
+    return [
+        (uid, rng.random() < unknown, rng.random() < offline)
+        for uid in (rng.randrange(1, 2 ** 32) for _ in range(cards))
+    ]
+
+
+def measure(plan, mode, roster_path):
+    backend = fakes.FakeBackend()
+    backend.set_roster(uid for uid, is_unknown, _ in plan if not is_unknown)
+    roster = RosterCache(roster_path)
+    if mode == "roster":
+        RosterSync(roster, backend, "sim-checkpoint", interval=30).sync()
+
+    correct = 0
+    requests = backend.roster_requests
+    busy = 0.0
+    for uid, is_unknown, offline in plan:
+        started = time.perf_counter()
+        if mode == "roster":
+            accepted = roster.check(uid) is not False
+        else:
+            requests += 1
+            if offline:
+                accepted = True
+            else:
+                accepted = uid in backend.roster
+            busy += BACKEND_RTT
+        busy += time.perf_counter() - started
+        correct += accepted != is_unknown
+
+    return {
+        "punches": len(plan),
+        "correct_feedback": correct,
+        "backend_requests": requests,
+        "validation_us_avg": round(busy / len(plan) * 1e6, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cards", type=int, default=2000)
+    parser.add_argument("--unknown", type=float, default=0.1, help="share of cards not in any active race")
+    parser.add_argument("--offline", type=float, default=0.3, help="share of punches with the backend unreachable")
+    args = parser.parse_args()
+
+    plan = punches(args.cards, args.unknown, args.offline)
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps({
+            mode: measure(plan, mode, os.path.join(tmp, f"{mode}.json"))
+            for mode in ("backend", "roster")
+        }, indent=2))